@@ -1,7 +1,11 @@
 import json
 import requests
 import typing
+from collections import deque
 from intertable import *
+from stream import TableStream
+from cache import ExtractionCache, payload_fingerprint
+from schema import infer_table
 
 def get_api_paths(host: str = "127.0.0.1", port: str = "8000") -> list[str]:
     """
@@ -19,10 +23,14 @@ def get_api_paths(host: str = "127.0.0.1", port: str = "8000") -> list[str]:
             return [path for path in paths if paths[path].get("get", False)]
         return []
 
-def get_api_data(*paths: str, host: str = "127.0.0.1", port: str = "8000") -> dict[str, list[dict[str, typing.Any]]] | list[dict[str, typing.Any]]:
+def get_api_data(*paths: str, host: str = "127.0.0.1", port: str = "8000", cache: ExtractionCache | None = None) -> dict[str, list[dict[str, typing.Any]]] | list[dict[str, typing.Any]]:
     """
     Henter data fra en API ud fra en eller flere angivne paths, samt en serveradresse.
 
+    Hvis en cache angives, sendes den gemte ETag med, og svarer API'en, at intet er ændret,
+    bruges de gemte data uden at hente dem igen. Uden ETag genbruges de afkodede data,
+    så længe svarets indhold har samme hash.
+
     :param paths: En eller flere paths i API'en, som data skal hentes fra.
     :param host: Adressen på API'en.
         *Påkrævet*. Standardværdi: `"127.0.0.1"`
@@ -30,6 +38,9 @@ def get_api_data(*paths: str, host: str = "127.0.0.1", port: str = "8000") -> di
     :param port: Porten, der skal tilgås på adressen.
         *Upåkrævet*. Standardværdi: `"8000"`
     :type port: str, optional
+    :param cache: Cachen, som dataene gemmes i og hentes fra.
+        *Upåkrævet*. Standardværdi: `None`
+    :type cache: ExtractionCache | None, optional
     :return: En dict indeholdende de fundne datasæt, hver som en liste med en header- og data-del.
         Eller blot et enkelt datasæt.
     :rtype: dict[str, list[dict[str, typing.Any]]] | list[dict[str, typing.Any]]
@@ -38,9 +49,12 @@ def get_api_data(*paths: str, host: str = "127.0.0.1", port: str = "8000") -> di
     # Kører en request for hver path
     for path in paths:
         try:
-            response = requests.get(f"http://{host}:{port}{path}")
-            # Laver responsen om til en dict
-            response_dict = json.loads(response.json())
+            if cache is not None:
+                response_dict = _get_cached(f"http://{host}:{port}{path}", cache)
+            else:
+                response = requests.get(f"http://{host}:{port}{path}")
+                # Laver responsen om til en dict
+                response_dict = json.loads(response.json())
         except Exception as err:
             print("FEJL: Følgende fejl opstod:", err)
         else:
@@ -48,15 +62,99 @@ def get_api_data(*paths: str, host: str = "127.0.0.1", port: str = "8000") -> di
             raw_data[path[1:]] = response_dict
     return raw_data if len(paths) != 1 else raw_data[paths[0][1:]]
 
+def _get_cached(url: str, cache: ExtractionCache) -> list[dict[str, typing.Any]]:
+    source = f"api:{url}"
+    fingerprint = cache.fingerprint(source)
+    # Med en gemt ETag spørges API'en, om dataene er ændret
+    if fingerprint is not None and fingerprint.startswith("etag:"):
+        response = requests.get(url, headers={"If-None-Match": fingerprint[5:]})
+        if response.status_code == 304:
+            if (response_dict := cache.get(source, fingerprint)) is not None:
+                print(f"SUCCES: Hentede '{source}' fra cachen.")
+                return response_dict
+            # Elementet er fjernet fra cachen i mellemtiden, så dataene hentes på ny
+            response = requests.get(url)
+    else:
+        response = requests.get(url)
+    response.raise_for_status()
+    etag = response.headers.get("ETag")
+    fingerprint = f"etag:{etag}" if etag else payload_fingerprint(response.content)
+    return cache.fetch(source, fingerprint, lambda: json.loads(response.json()))
+
 def get_columns(row: dict[str, typing.Any] | list[dict[str, typing.Any]]) -> tuple[str]:
     if isinstance(row, list):
         row = row[0]
     return row.keys()
 
-def intertable(name: str, data: list[dict[str, typing.Any]]) -> InterTable:
+def intertable(name: str, data: list[dict[str, typing.Any]], storage: str = "rows", infer: bool = True) -> InterTable:
+    """
+    Omdanner et datasæt fra API'en til en InterTable.
+
+    Kolonnernes datatyper udledes af en stikprøve af rækkerne (se :func:`schema.infer_header`),
+    medmindre ``infer`` er `False`, hvor alle kolonner bliver tekst.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param data: Datasættets rækker, f.eks. fra :func:`get_api_data`.
+        *Påkrævet*.
+    :type data: list[dict[str, Any]]
+    :param storage: Lagringsformen for tabellen.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+    :param infer: Bestemmer, om datatyperne udledes af dataene.
+        *Upåkrævet*. Standardværdi: `True`
+    :type infer: bool
+
+    :rtype: InterTable
+    """
+    if infer and data:
+        return infer_table(name, data, storage=storage)
     header = {column: DataField(column, **STANDARD_FIELD) for column in get_columns(data)}
 
-    return InterTable(name, Header(header), Keys(), data)
+    return InterTable(name, Header(header), Keys(), data, storage=storage)
+
+def stream(name: str, path: str, host: str = "127.0.0.1", port: str = "8000", chunk_size: int = 10_000, storage: str = "rows") -> TableStream:
+    """
+    Opretter en TableStream ud fra en path i API'en.
+
+    API'en leverer hvert datasæt som ét samlet JSON-dokument, så det hentes og afkodes på én gang.
+    Rækkerne afleveres derefter i bidder og slippes, efterhånden som de er leveret,
+    så resten af processen (validering, transformation og indlæsning) kun holder én bid ad gangen.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param path: Pathen i API'en, som data skal hentes fra.
+        *Påkrævet*.
+    :type path: str
+    :param host: Adressen på API'en.
+        *Påkrævet*. Standardværdi: `"127.0.0.1"`
+    :type host: str
+    :param port: Porten, der skal tilgås på adressen.
+        *Upåkrævet*. Standardværdi: `"8000"`
+    :type port: str, optional
+    :param chunk_size: Det største antal rækker i hver bid.
+        *Upåkrævet*. Standardværdi: `10_000`
+    :type chunk_size: int
+    :param storage: Lagringsformen for hver bid.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+
+    :rtype: TableStream
+    """
+    data = get_api_data(path, host=host, port=port)
+    if not data:
+        return TableStream(name, Header(), Keys(), (), storage=storage)
+    header = {column: DataField(column, **STANDARD_FIELD) for column in get_columns(data)}
+    rows = deque(data)
+    del data
+
+    def chunks() -> typing.Iterator[list[dict[str, typing.Any]]]:
+        while rows:
+            yield [rows.popleft() for row in range(min(chunk_size, len(rows)))]
+
+    return TableStream(name, Header(header), Keys(), chunks(), storage=storage)
 
 if __name__ == "__main__":
     from config import API
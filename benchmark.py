@@ -0,0 +1,271 @@
+import gc
+import sys
+import json
+import typing
+import argparse
+import platform
+from pathlib import Path
+from time import perf_counter
+from intertable import *
+from datagen import generate
+
+# Antal rækker i order_items, som der som standard måles på
+BENCHMARK_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+# Hver måling gentages, og den hurtigste tid gemmes, da langsommere gentagelser skyldes forstyrrelser
+BENCHMARK_REPEAT = 3
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+# En måling, der er så meget langsommere eller hurtigere end baseline, markeres
+REGRESSION_RATIO = 1.2
+
+# Headerne fra main.py, som rådataene castes til
+ORDER_ITEMS_HEADER = Header({
+    "order_id": DataField("order_id", "mediumint unsigned", False),
+    "item_id": DataField("item_id", "tinyint unsigned", False),
+    "product_id": DataField("product_id", "mediumint unsigned", False),
+    "quantity": DataField("quantity", "smallint unsigned", False),
+    "list_price": DataField("list_price", "decimal(10,2)", False),
+    "discount": DataField("discount", "decimal(3,2)", False, default=Decimal(0.00)),
+})
+ORDERS_HEADER = Header({
+    "order_id": DataField("order_id", "mediumint unsigned", False, extra="auto"),
+    "customer_id": DataField("customer_id", "mediumint unsigned", False),
+    "order_status": DataField("order_status", "tinyint unsigned", False),
+    "order_date": DataField("order_date", "date", False),
+    "required_date": DataField("required_date", "date", False),
+    "shipped_date": DataField("shipped_date", "date"),
+    "store": DataField("store", "text"),
+    "staff_name": DataField("staff_name", "text")
+})
+STORES_HEADER = Header({
+    "name": DataField("name", "varchar(80)", False),
+    "phone": DataField("phone", "char(14)", False),
+    "email": DataField("email", "varchar(80)", False),
+    "street": DataField("street", "varchar(63)", False),
+    "city": DataField("city", "varchar(40)", False),
+    "state": DataField("state", "char(2)", False),
+    "zip_code": DataField("zip_code", "mediumint unsigned", False)
+})
+
+# En forberedelse modtager de genererede data og lagringsformen og returnerer den funktion, der måles
+Setup = typing.Callable[[dict[str, DataList], str], typing.Callable[[], typing.Any]]
+
+def _table(name: TableName, header: Header, rows: DataList, storage: str) -> InterTable:
+    # Rækkerne kopieres, da de castes på stedet
+    return InterTable(name, deepcopy(header), Keys(), [dict(row) for row in rows], storage=storage)
+
+def _text_header(header: Header) -> Header:
+    return Header({column: DataField(column, **STANDARD_FIELD) for column in header})
+
+def _construct(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    rows = [dict(row) for row in data["order_items"]]
+    header = deepcopy(ORDER_ITEMS_HEADER)
+    return lambda: InterTable("order_items", header, Keys(), rows, storage=storage)
+
+def _refresh(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    # Som i main.py: rådataene indlæses som tekst og castes, når headeren er defineret
+    table = _table("order_items", _text_header(ORDER_ITEMS_HEADER), data["order_items"], storage)
+    table.header = deepcopy(ORDER_ITEMS_HEADER)
+    return table.refresh
+
+def _lookup(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    orders = _table("orders", ORDERS_HEADER, data["orders"], storage)
+    stores = _table("stores", STORES_HEADER, data["stores"], "rows")
+    stores << DataField("store_id", "smallint unsigned", False, extra="auto")
+    return lambda: orders @ (DataField("store_id", "smallint unsigned", False), "store", stores, "name")
+
+def _remove_column(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    orders = _table("orders", ORDERS_HEADER, data["orders"], storage)
+    return lambda: orders.remove_column("store", "staff_name")
+
+def _auto_id(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    table = _table("order_items", ORDER_ITEMS_HEADER, data["order_items"], storage)
+    return lambda: table << DataField("row_id", "int unsigned", False, extra="auto")
+
+def _to_csv(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    return _table("order_items", ORDER_ITEMS_HEADER, data["order_items"], storage).to_csv
+
+def _to_json(data: dict[str, DataList], storage: str) -> typing.Callable[[], typing.Any]:
+    return _table("order_items", ORDER_ITEMS_HEADER, data["order_items"], storage).to_json
+
+# Målingerne og den tabel fra datagen.generate(), hvis antal rækker de måles på
+BENCHMARKS: dict[str, tuple[Setup, str]] = {
+    "construct": (_construct, "order_items"),
+    "refresh": (_refresh, "order_items"),
+    "lookup": (_lookup, "orders"),
+    "remove_column": (_remove_column, "orders"),
+    "auto_id": (_auto_id, "order_items"),
+    "to_csv": (_to_csv, "order_items"),
+    "to_json": (_to_json, "order_items"),
+}
+
+def measure(setup: Setup, data: dict[str, DataList], storage: str = "rows", repeat: int = BENCHMARK_REPEAT) -> float:
+    """
+    Måler den hurtigste tid for en funktion over flere gentagelser.
+
+    Funktionen forberedes på ny før hver gentagelse, så den altid måles på friske data,
+    og forberedelsen tæller ikke med. Garbage collection er slået fra under målingen ligesom i :mod:`timeit`.
+
+    :param setup: Forberedelsen, der returnerer funktionen, som måles.
+        *Påkrævet*.
+    :type setup: Callable[[dict[str, DataList], str], Callable[[], Any]]
+    :param data: De genererede data fra :func:`datagen.generate`.
+        *Påkrævet*.
+    :type data: dict[str, DataList]
+    :param storage: Lagringsformen for tabellerne.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+    :param repeat: Antallet af gentagelser.
+        *Upåkrævet*. Standardværdi: `3`
+    :type repeat: int
+
+    :return: Den hurtigste tid i sekunder.
+    :rtype: float
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        function = setup(data, storage)
+        gc.collect()
+        gc.disable()
+        try:
+            start = perf_counter()
+            function()
+            best = min(best, perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def run(
+    sizes: typing.Iterable[int] = BENCHMARK_SIZES,
+    storage: str = "rows",
+    repeat: int = BENCHMARK_REPEAT,
+    benchmarks: typing.Iterable[str] | None = None,
+    seed: int = 0
+) -> dict[str, dict[str, dict[str, float | int]]]:
+    """
+    Genererer data i hver størrelse og måler InterTables mest brugte operationer på dem.
+
+    :param sizes: Antallene af rækker i order_items, der måles på.
+        *Upåkrævet*. Standardværdi: `BENCHMARK_SIZES`
+    :type sizes: Iterable[int]
+    :param storage: Lagringsformen for tabellerne, `"rows"`, `"columns"` eller `"tuples"`.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+    :param repeat: Antallet af gentagelser af hver måling.
+        *Upåkrævet*. Standardværdi: `3`
+    :type repeat: int
+    :param benchmarks: Navnene på målingerne, der skal køres. Hvis `None`, køres alle.
+        *Upåkrævet*. Standardværdi: `None`
+    :type benchmarks: Iterable[str] | None
+    :param seed: Startværdien for datageneratoren.
+        *Upåkrævet*. Standardværdi: `0`
+    :type seed: int
+
+    :return: For hver størrelse og måling antallet af rækker og den hurtigste tid i sekunder.
+    :rtype: dict[str, dict[str, dict[str, float | int]]]
+    """
+    names = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise KeyError(f"Ukendt måling '{name}'. Vælg blandt {tuple(BENCHMARKS)}.")
+    results = {}
+    for size in sizes:
+        data = generate(size, seed)
+        results[str(size)] = {}
+        for name in names:
+            setup, table = BENCHMARKS[name]
+            results[str(size)][name] = {"rows": len(data[table]), "seconds": measure(setup, data, storage, repeat)}
+        del data
+    return results
+
+def load_baseline(path: str | Path = BASELINE_FILE) -> dict[str, typing.Any]:
+    """
+    Indlæser de gemte baseline-resultater.
+
+    :param path: Stien til filen.
+        *Upåkrævet*. Standardværdi: `BASELINE_FILE`
+    :type path: str | Path
+
+    :return: Resultaterne for hver lagringsform, eller en tom baseline, hvis filen ikke findes.
+    :rtype: dict[str, Any]
+    """
+    try:
+        with open(path, 'r', encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"results": {}}
+
+def save_baseline(results: dict[str, dict[str, dict[str, float | int]]], storage: str, path: str | Path = BASELINE_FILE) -> None:
+    """
+    Gemmer resultaterne som ny baseline for lagringsformen.
+    Resultater for andre størrelser og lagringsformer i filen bevares.
+
+    :param results: Resultaterne fra :func:`run`.
+        *Påkrævet*.
+    :type results: dict[str, dict[str, dict[str, float | int]]]
+    :param storage: Lagringsformen, resultaterne er målt med.
+        *Påkrævet*.
+    :type storage: str
+    :param path: Stien til filen.
+        *Upåkrævet*. Standardværdi: `BASELINE_FILE`
+    :type path: str | Path
+    """
+    baseline = load_baseline(path)
+    baseline["python"] = platform.python_version()
+    baseline["platform"] = platform.platform()
+    for size, measurements in results.items():
+        baseline["results"].setdefault(storage, {}).setdefault(size, {}).update(measurements)
+    with open(path, 'w', encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2)
+        file.write('\n')
+    print(f"SUCCES: Gemte baseline i '{path}'.")
+
+def report(results: dict[str, dict[str, dict[str, float | int]]], baseline: dict[str, dict[str, dict[str, float | int]]] | None = None) -> str:
+    """
+    Formaterer resultaterne som en tabel, evt. sammenlignet med en baseline.
+
+    Forholdet er den nye tid delt med baselinens tid, så et tal over 1 betyder, at målingen er blevet langsommere.
+    Målinger, der har ændret sig mere end ``REGRESSION_RATIO``, markeres.
+
+    :param results: Resultaterne fra :func:`run`.
+        *Påkrævet*.
+    :type results: dict[str, dict[str, dict[str, float | int]]]
+    :param baseline: Baselinens resultater for samme lagringsform.
+        *Upåkrævet*. Standardværdi: `None`
+    :type baseline: dict[str, dict[str, dict[str, float | int]]] | None
+
+    :rtype: str
+    """
+    lines = [f"{'Rækker':>10}  {'Måling':<14}{'Sekunder':>10}{'Rækker/s':>14}{'Baseline':>10}{'Forhold':>9}"]
+    for size, measurements in results.items():
+        for name, measurement in measurements.items():
+            seconds = measurement["seconds"]
+            line = f"{size:>10}  {name:<14}{seconds:>10.4f}{measurement['rows'] / seconds if seconds else 0:>14,.0f}"
+            old = (baseline or {}).get(size, {}).get(name)
+            if old is not None and old["seconds"]:
+                ratio = seconds / old["seconds"]
+                line += f"{old['seconds']:>10.4f}{ratio:>8.2f}x"
+                if ratio > REGRESSION_RATIO:
+                    line += "  LANGSOMMERE"
+                elif ratio < 1 / REGRESSION_RATIO:
+                    line += "  HURTIGERE"
+            lines.append(line)
+    return '\n'.join(lines)
+
+def main(arguments: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Måler InterTables mest brugte operationer på syntetiske BikeCorp-data.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=BENCHMARK_SIZES, help="antal rækker i order_items")
+    parser.add_argument("--storage", choices=STORAGE_TYPES, default="rows", help="lagringsformen for tabellerne")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT, help="antal gentagelser af hver måling")
+    parser.add_argument("--only", nargs='+', choices=tuple(BENCHMARKS), help="kør kun disse målinger")
+    parser.add_argument("--seed", type=int, default=0, help="startværdien for datageneratoren")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="filen med baseline-resultater")
+    parser.add_argument("--save", action="store_true", help="gem resultaterne som ny baseline")
+    args = parser.parse_args(arguments)
+
+    results = run(args.sizes, args.storage, args.repeat, args.only, args.seed)
+    print(report(results, load_baseline(args.baseline)["results"].get(args.storage)))
+    if args.save:
+        save_baseline(results, args.storage, args.baseline)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
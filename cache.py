@@ -0,0 +1,277 @@
+import os
+import json
+import time
+import pickle
+import typing
+import hashlib
+import threading
+from pathlib import Path
+from intertable import InterTable
+
+# Standardmappen til cachen, placeret ved siden af modulerne
+CACHE_DIR = Path(__file__).parent / ".cache"
+# Standardgrænserne for cachen, før de mindst brugte elementer fjernes
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+class ExtractionCache:
+    """
+    En lokal cache over udtrukne kildedata, så uændrede kilder ikke hentes og parses igen.
+
+    Hvert element gemmes under en kilde (f.eks. en path i API'en, en fil eller en tabel i databasen)
+    sammen med et fingeraftryk af kildens indhold. Et element bruges kun, hvis fingeraftrykket
+    stadig er det samme, og ellers hentes kilden igen og erstatter det gamle element.
+    InterTables gemmes som binære snapshots (se :mod:`snapshot`), mens øvrige data gemmes som pickles.
+
+    Når cachen har flere end ``max_entries`` elementer eller fylder mere end ``max_bytes``,
+    fjernes de mindst nyligt brugte elementer (LRU).
+    Cachen indeholder pickles og må derfor kun bruges med en mappe, man stoler på.
+    Den kan bruges fra flere tråde på én gang (se :mod:`pipeline`), men ikke fra flere processer.
+
+    :param directory: Mappen, som cachen gemmes i. Oprettes, hvis den ikke findes.
+        *Upåkrævet*. Standardværdi: `CACHE_DIR`
+    :type directory: str | Path
+    :param max_entries: Det største antal elementer i cachen.
+        *Upåkrævet*. Standardværdi: `64`
+    :type max_entries: int
+    :param max_bytes: Den største samlede størrelse af cachen i bytes.
+        *Upåkrævet*. Standardværdi: `2 GiB`
+    :type max_bytes: int
+    """
+    def __init__(self,
+        directory: str | Path = CACHE_DIR,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES
+    ) -> None:
+        self.directory: Path = Path(directory)
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path: Path = self.directory / "index.json"
+        self._index: dict[str, dict[str, typing.Any]] = self._read_index()
+        # Beskytter indekset og filerne, når flere tråde henter og gemmer samtidigt
+        self._lock: threading.RLock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"ExtractionCache(directory={repr(str(self.directory))}, max_entries={self.max_entries}, max_bytes={self.max_bytes})"
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._index
+
+    @property
+    def size(self) -> int:
+        """
+        Den samlede størrelse af cachens elementer i bytes.
+        """
+        return sum(entry["size"] for entry in self._index.values())
+
+    def fingerprint(self, source: str) -> str | None:
+        """
+        Finder fingeraftrykket for det element, der er gemt for en kilde.
+
+        Bruges f.eks. til at sende en API's ETag med, så serveren kan svare, at intet er ændret.
+
+        :param source: Kilden.
+            *Påkrævet*.
+        :type source: str
+
+        :return: Fingeraftrykket, eller `None`, hvis kilden ikke er i cachen.
+        :rtype: str | None
+        """
+        entry = self._index.get(source)
+        return entry["fingerprint"] if entry is not None else None
+
+    def get(self, source: str, fingerprint: str) -> typing.Any:
+        """
+        Henter det gemte element for en kilde, hvis fingeraftrykket stemmer.
+
+        :param source: Kilden.
+            *Påkrævet*.
+        :type source: str
+        :param fingerprint: Kildens nuværende fingeraftryk.
+            *Påkrævet*.
+        :type fingerprint: str
+
+        :return: Det gemte element, eller `None`, hvis kilden ikke er i cachen eller er ændret.
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._index.get(source)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                return None
+            path = self.directory / entry["file"]
+            try:
+                if entry["format"] == "snapshot":
+                    from snapshot import load
+                    value = load(path)
+                else:
+                    with open(path, "rb") as file:
+                        value = pickle.load(file)
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+                # Et element, der ikke kan læses, behandles som manglende og fjernes
+                self._remove(source)
+                self._write_index()
+                return None
+            entry["used"] = time.time()
+            self._write_index()
+            return value
+
+    def put(self, source: str, fingerprint: str, value: typing.Any) -> None:
+        """
+        Gemmer et element for en kilde og erstatter et evt. tidligere element.
+
+        :param source: Kilden.
+            *Påkrævet*.
+        :type source: str
+        :param fingerprint: Kildens fingeraftryk.
+            *Påkrævet*.
+        :type fingerprint: str
+        :param value: Elementet, der skal gemmes. En InterTable gemmes som snapshot.
+            *Påkrævet*.
+        :type value: Any
+        """
+        with self._lock:
+            self._remove(source)
+            name = hashlib.sha256(f"{source}\0{fingerprint}".encode()).hexdigest()[:32]
+            if isinstance(value, InterTable):
+                from snapshot import save
+                file, entry_format = f"{name}.snap", "snapshot"
+                save(value, self.directory / file)
+            else:
+                file, entry_format = f"{name}.pickle", "pickle"
+                with open(self.directory / file, "wb") as opened:
+                    pickle.dump(value, opened, pickle.HIGHEST_PROTOCOL)
+            self._index[source] = {
+                "fingerprint": fingerprint,
+                "file": file,
+                "format": entry_format,
+                "size": (self.directory / file).stat().st_size,
+                "used": time.time()
+            }
+            self._evict(keep=source)
+            self._write_index()
+
+    def fetch(self, source: str, fingerprint: str | None, function: typing.Callable[[], typing.Any]) -> typing.Any:
+        """
+        Henter elementet for en kilde fra cachen eller kalder ``function`` og gemmer resultatet.
+
+        Hvis fingeraftrykket er `None`, kan kilden ikke genkendes, og ``function`` kaldes uden cache.
+        Resultater, der er `None`, gemmes ikke, da de betyder, at udtrækket fejlede.
+
+        :param source: Kilden.
+            *Påkrævet*.
+        :type source: str
+        :param fingerprint: Kildens nuværende fingeraftryk.
+            *Påkrævet*.
+        :type fingerprint: str | None
+        :param function: Funktionen, der henter og parser kilden.
+            *Påkrævet*.
+        :type function: Callable[[], Any]
+
+        :rtype: Any
+        """
+        if fingerprint is None:
+            return function()
+        value = self.get(source, fingerprint)
+        if value is None:
+            value = function()
+            if value is not None:
+                self.put(source, fingerprint, value)
+        else:
+            print(f"SUCCES: Hentede '{source}' fra cachen.")
+        return value
+
+    def invalidate(self, source: str) -> None:
+        """
+        Fjerner elementet for en kilde fra cachen.
+
+        :param source: Kilden.
+            *Påkrævet*.
+        :type source: str
+        """
+        with self._lock:
+            self._remove(source)
+            self._write_index()
+
+    def clear(self) -> None:
+        """
+        Fjerner alle elementer fra cachen.
+        """
+        with self._lock:
+            for source in list(self._index):
+                self._remove(source)
+            self._write_index()
+
+    def _evict(self, keep: str) -> None:
+        # De mindst nyligt brugte elementer fjernes, til cachen er inden for grænserne
+        # Det netop gemte element fjernes aldrig, selvom det alene er større end grænsen
+        size = self.size
+        for source in sorted(self._index, key=lambda source: self._index[source]["used"]):
+            if len(self._index) <= self.max_entries and size <= self.max_bytes:
+                break
+            if source != keep:
+                size -= self._index[source]["size"]
+                self._remove(source)
+
+    def _remove(self, source: str) -> None:
+        entry = self._index.pop(source, None)
+        if entry is not None:
+            try:
+                os.remove(self.directory / entry["file"])
+            except FileNotFoundError:
+                pass
+
+    def _read_index(self) -> dict[str, dict[str, typing.Any]]:
+        try:
+            with open(self._index_path, 'r', encoding="utf-8") as file:
+                index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Elementer, hvis filer er slettet udefra, glemmes
+        return {source: entry for source, entry in index.items() if (self.directory / entry["file"]).exists()}
+
+    def _write_index(self) -> None:
+        # Skrives til en midlertidig fil først, så indekset ikke ødelægges af en afbrudt kørsel
+        temporary = self._index_path.with_suffix(".tmp")
+        with open(temporary, 'w', encoding="utf-8") as file:
+            json.dump(self._index, file)
+        os.replace(temporary, self._index_path)
+
+def file_fingerprint(path: str | Path, content: bool = False) -> str | None:
+    """
+    Danner et fingeraftryk af en fil.
+
+    :param path: Stien til filen.
+        *Påkrævet*.
+    :type path: str | Path
+    :param content: Bestemmer, om fingeraftrykket dannes ud fra filens indhold (SHA-256)
+        i stedet for dens størrelse og ændringstidspunkt.
+        *Upåkrævet*. Standardværdi: `False`
+    :type content: bool
+
+    :return: Fingeraftrykket, eller `None`, hvis filen ikke findes.
+    :rtype: str | None
+    """
+    try:
+        if content:
+            with open(path, "rb") as file:
+                return f"sha256:{hashlib.file_digest(file, "sha256").hexdigest()}"
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"stat:{stat.st_size}:{stat.st_mtime_ns}"
+
+def payload_fingerprint(payload: bytes) -> str:
+    """
+    Danner et fingeraftryk af rådata, f.eks. et svar fra en API uden ETag.
+
+    :param payload: Rådataene.
+        *Påkrævet*.
+    :type payload: bytes
+
+    :rtype: str
+    """
+    return f"sha256:{hashlib.sha256(payload).hexdigest()}"
@@ -1,22 +1,34 @@
+import typing
+from itertools import chain
 from pathlib import Path
 from intertable import *
+from stream import TableStream, chunked
+from cache import ExtractionCache, file_fingerprint
+from schema import infer_table
 
 # TODO: Validerer ikke .csv-filens struktur endnu
-def read_csv(filename: str, data_dir: str | Path) -> list[str]:
+def read_csv(filename: str, data_dir: str | Path, cache: ExtractionCache | None = None) -> list[str]:
     """
     Indlæser en *.csv*-fil og omdanner den til rådata, der kan behandles.
 
+    Hvis en cache angives, genbruges rådataene fra cachen, så længe filens størrelse og ændringstidspunkt er uændret.
+
     :param filename: Filnavnet på filen, der skal indlæses.
         *Påkrævet*.
     :type filename: str
     :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
-        *Påkrævet*. Standardværdi: ``"data"``
+        *Påkrævet*. Standardværdi: `"data"`
     :type data_dir: str
+    :param cache: Cachen, som rådataene gemmes i og hentes fra.
+        *Upåkrævet*. Standardværdi: `None`
+    :type cache: ExtractionCache | None
 
     :return: Den indlæste fil med hver række som en tekststreng i en liste.
     :rtype: list[str]
     """
     data_file = Path(data_dir, filename)
+    if cache is not None:
+        return cache.fetch(f"csv:{data_file.resolve()}", file_fingerprint(data_file), lambda: read_csv(filename, data_dir))
     try:
         with open(data_file, 'r', encoding="utf-8") as file:
             raw_data = file.readlines()
@@ -28,6 +40,34 @@ def read_csv(filename: str, data_dir: str | Path) -> list[str]:
         print(f"SUCCES: Indlæste filen '{filename}'.")
         return raw_data
 
+def read_csv_chunks(filename: str, data_dir: str | Path, chunk_size: int = 10_000) -> typing.Iterator[list[str]]:
+    """
+    Indlæser en *.csv*-fil i bidder af rækker i stedet for hele filen på én gang.
+
+    :param filename: Filnavnet på filen, der skal indlæses.
+        *Påkrævet*.
+    :type filename: str
+    :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+        *Påkrævet*.
+    :type data_dir: str
+    :param chunk_size: Det største antal rækker i hver bid. Headeren er med i den første bid.
+        *Upåkrævet*. Standardværdi: `10_000`
+    :type chunk_size: int
+
+    :return: Filens rækker som tekststrenge i lister med højst ``chunk_size`` rækker.
+    :rtype: Iterator[list[str]]
+    """
+    data_file = Path(data_dir, filename)
+    try:
+        with open(data_file, 'r', encoding="utf-8") as file:
+            yield from chunked(file, chunk_size)
+    except FileNotFoundError:
+        print(f"FEJL: Filen '{data_file}' eksisterer ikke.")
+    except Exception as err:
+        print(f"FEJL: Kunne ikke læse filen '{filename}'. Følgende fejl opstod:\n    {err}")
+    else:
+        print(f"SUCCES: Indlæste filen '{filename}'.")
+
 def get_name(path: str | Path) -> str:
     """
     Finder navnet på en tabel ud fra navnet på den angivne fil.
@@ -45,14 +85,75 @@ def get_name(path: str | Path) -> str:
     """
     return Path(path).stem
 
-def intertable(name: str, raw_data: list[str]) -> InterTable:
+def intertable(name: str, raw_data: list[str], storage: str = "rows", infer: bool = True) -> InterTable:
+    """
+    Omdanner rådata fra en *.csv*-fil til en InterTable.
+
+    Kolonnernes datatyper udledes af en stikprøve af rækkerne (se :func:`schema.infer_header`),
+    medmindre ``infer`` er `False`, hvor alle kolonner bliver tekst.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param raw_data: Filens rækker som tekststrenge, f.eks. fra :func:`read_csv`.
+        *Påkrævet*.
+    :type raw_data: list[str]
+    :param storage: Lagringsformen for tabellen.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+    :param infer: Bestemmer, om datatyperne udledes af dataene.
+        *Upåkrævet*. Standardværdi: `True`
+    :type infer: bool
+
+    :rtype: InterTable
+    """
     columns, *rows = raw_data
 
     header = {column: DataField(column, **STANDARD_FIELD) for column in columns.strip('\n').split(',')}
 
     data = [dict(zip(header.keys(), row.strip('\n').split(','))) for row in rows]
 
-    return InterTable(name, Header(header), Keys(), data)
+    if infer and data:
+        return infer_table(name, data, storage=storage)
+    return InterTable(name, Header(header), Keys(), data, storage=storage)
+
+def stream(name: str, filename: str, data_dir: str | Path, chunk_size: int = 10_000, storage: str = "rows") -> TableStream:
+    """
+    Opretter en TableStream, der læser en *.csv*-fil i bidder.
+
+    Filens header læses med det samme, mens resten af filen først læses, når strømmen gennemløbes.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param filename: Filnavnet på filen, der skal indlæses.
+        *Påkrævet*.
+    :type filename: str
+    :param data_dir: Mappen/kataloget, hvori .csv-filen er placeret.
+        *Påkrævet*.
+    :type data_dir: str
+    :param chunk_size: Det største antal rækker i hver bid.
+        *Upåkrævet*. Standardværdi: `10_000`
+    :type chunk_size: int
+    :param storage: Lagringsformen for hver bid.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+
+    :rtype: TableStream
+    """
+    raw_chunks = read_csv_chunks(filename, data_dir, chunk_size)
+    first_chunk = next(raw_chunks, [])
+    if not first_chunk:
+        return TableStream(name, Header(), Keys(), (), storage=storage)
+    columns, *first_rows = first_chunk
+    header = {column: DataField(column, **STANDARD_FIELD) for column in columns.strip('\n').split(',')}
+
+    def chunks() -> typing.Iterator[DataList]:
+        # Den første bid er allerede læst sammen med headeren
+        for rows in chain([first_rows], raw_chunks):
+            yield [dict(zip(header.keys(), row.strip('\n').split(','))) for row in rows]
+
+    return TableStream(name, Header(header), Keys(), chunks(), storage=storage)
 
 if __name__ == "__main__":
     from config import CSV
@@ -0,0 +1,79 @@
+from db.database import Database
+from intertable import *
+from config import DB
+
+# Tjekker indlæsningen i en MySQL-database; tabellerne oprettes og slettes igen i TEST_DATABASE
+TEST_DATABASE = "intertable_test"
+
+def check(description: str, passed: bool) -> bool:
+    print(f"{"SUCCES" if passed else "FEJL"}: {description}")
+    return passed
+
+def staff() -> InterTable:
+    # Medarbejder 1 og 2 henviser til ledere, der kommer senere i tabellen
+    header = Header({
+        "staff_id": DataField("staff_id", "smallint unsigned", False),
+        "name": DataField("name", "varchar(40)", False),
+        "manager_id": DataField("manager_id", "smallint unsigned")
+    })
+    rows = [
+        {"staff_id": 1, "name": "Ida", "manager_id": 3},
+        {"staff_id": 2, "name": "Bo", "manager_id": 1},
+        {"staff_id": 3, "name": "Eva", "manager_id": None},
+        {"staff_id": 4, "name": "Ole", "manager_id": 3}
+    ]
+    return InterTable("staff", header, Keys(primary="staff_id", foreign={"manager_id": ("staff", "staff_id")}), rows)
+
+def brands(rows: DataList) -> InterTable:
+    header = Header({
+        "brand_id": DataField("brand_id", "smallint unsigned", False),
+        "brand_name": DataField("brand_name", "varchar(40)", False)
+    })
+    return InterTable("brands", header, Keys(primary="brand_id"), rows)
+
+def products() -> InterTable:
+    header = Header({
+        "product_id": DataField("product_id", "smallint unsigned", False),
+        "brand_id": DataField("brand_id", "smallint unsigned", False)
+    })
+    return InterTable("products", header, Keys(primary="product_id", foreign={"brand_id": ("brands", "brand_id")}), [{"product_id": 1, "brand_id": 1}])
+
+def names(db: Database) -> dict[int, str]:
+    return {row["brand_id"]: row["brand_name"] for row in db.read("brands")}
+
+def parents_first(db: Database) -> None:
+    rows = db._parents_first([dict(entry) for entry in staff()], "manager_id", "staff_id")
+    check("Ledere ordnes før deres medarbejdere", [row["staff_id"] for row in rows] == [3, 1, 4, 2])
+    db.load(staff())
+    check("En tabel med en foreign key til sig selv kan indlæses", len(db.read("staff")) == 4)
+
+def load_order(db: Database) -> None:
+    # Tabellerne angives i omvendt rækkefølge af deres foreign keys
+    db.load(products(), brands([{"brand_id": 1, "brand_name": "Trek"}, {"brand_id": 2, "brand_name": "Surly"}]))
+    check("Tabellerne indlæses efter deres foreign keys", len(db.read("products")) == 1)
+
+def insert_modes(db: Database) -> None:
+    changed = [{"brand_id": 1, "brand_name": "Electra"}, {"brand_id": 3, "brand_name": "Haro"}]
+    db.load(brands(changed), mode="skip")
+    check("\"skip\" beholder eksisterende rækker og indsætter nye", names(db) == {1: "Trek", 2: "Surly", 3: "Haro"})
+    db.load(brands(changed), mode="overwrite")
+    check("\"overwrite\" opdaterer eksisterende rækker", names(db) == {1: "Electra", 2: "Surly", 3: "Haro"})
+    # products henviser til brand 1, så REPLACE (der sletter rækken først) bruges på brand 2 og 3
+    db.load(brands([{"brand_id": 2, "brand_name": "Ritchey"}, {"brand_id": 3, "brand_name": "Pure"}]), mode={"brands": "replace"})
+    check("\"replace\" erstatter eksisterende rækker", names(db) == {1: "Electra", 2: "Ritchey", 3: "Pure"})
+
+def clean(db: Database) -> None:
+    for table_name in ("products", "brands", "staff"):
+        if table_name in db.info():
+            db.drop(table_name, force=True)
+
+if __name__ == "__main__":
+    db = Database(DB.username, DB.password, TEST_DATABASE, DB.host, DB.port, preview=False, pool_size=2)
+    clean(db)
+    try:
+        parents_first(db)
+        load_order(db)
+        insert_modes(db)
+    finally:
+        clean(db)
+        db.logout()
@@ -0,0 +1,316 @@
+import csv
+import math
+import random
+import typing
+from pathlib import Path
+from datetime import date, timedelta
+from intertable import DataList
+
+# Filerne med de oprindelige data, som de genererede data efterligner
+TEMPLATE_FILES = {
+    "orders": Path(__file__).parent / "data_api" / "data" / "orders.csv",
+    "customers": Path(__file__).parent / "data_api" / "data" / "customers.csv",
+    "brands": Path(__file__).parent / "data_db" / "brands.csv",
+    "categories": Path(__file__).parent / "data_db" / "categories.csv",
+    "products": Path(__file__).parent / "data_db" / "products.csv",
+    "staffs": Path(__file__).parent / "data_csv" / "staffs.csv",
+    "stores": Path(__file__).parent / "data_csv" / "stores.csv",
+}
+# Antal rækker i order_items i de oprindelige data, som de øvrige tabeller skaleres efter
+TEMPLATE_SIZE = 4_722
+# Fordelingerne i de oprindelige data
+ORDER_STATUS_WEIGHTS = {"1": 62, "2": 63, "3": 45, "4": 1445}
+ITEMS_PER_ORDER_WEIGHTS = {1: 288, 2: 375, 3: 371, 4: 334, 5: 247}
+ORDERS_PER_CUSTOMER_WEIGHTS = {1: 1314, 2: 92, 3: 39}
+MODEL_YEAR_WEIGHTS = {"2016": 26, "2017": 85, "2018": 204, "2019": 6}
+DISCOUNTS = ("0.05", "0.07", "0.1", "0.2")
+PHONE_RATIO = 178 / 1445
+STOCK_RATIO = 939 / 963
+FIRST_ORDER_DATE = date(2016, 1, 1)
+LAST_ORDER_DATE = date(2018, 12, 28)
+# Eksponenterne for Zipf-fordelingerne; butikkernes passer med 1093/348/174 ordrer i de oprindelige data
+STORE_SKEW = 1.6
+PRODUCT_SKEW = 1.0
+
+def generate(size: int, seed: int = 0) -> dict[str, DataList]:
+    """
+    Genererer syntetiske BikeCorp-data i samme format som kilderne, dvs. rækker med tekstværdier,
+    datoer som ``dd/mm/yyyy`` og manglende værdier som ``NULL``.
+
+    ``size`` er antallet af rækker i order_items, og de øvrige tabeller skaleres efter de oprindelige data:
+    ordrer og kunder lineært, produkter med kvadratroden og butikker med kubikroden af skalaen.
+    Fremmednøglerne følger fordelingerne i de oprindelige data: de fleste ordrer går til den største butik,
+    nogle produkter er langt mere populære end andre (Zipf), de fleste kunder har én ordre,
+    og hver ordre har 1-5 varelinjer. Alle navne, der slås op på (butikker, medarbejdere), og e-mails er unikke.
+
+    Samme ``size`` og ``seed`` giver altid de samme data.
+
+    :param size: Antallet af rækker i order_items.
+        *Påkrævet*.
+    :type size: int
+    :param seed: Startværdien for tilfældighedsgeneratoren.
+        *Upåkrævet*. Standardværdi: `0`
+    :type seed: int
+
+    :return: Rækkerne for hver tabel under navnet på kildens fil uden endelse.
+    :rtype: dict[str, DataList]
+    """
+    if size < 1:
+        raise ValueError(f"Antallet af rækker skal være mindst 1, ikke {size}.")
+    rng = random.Random(seed)
+    templates = {name: _read_template(path) for name, path in TEMPLATE_FILES.items()}
+    scale = size / TEMPLATE_SIZE
+
+    stores = _stores(rng, templates, max(3, round(3 * scale ** (1 / 3))))
+    staffs, sellers = _staffs(rng, templates, stores)
+    products = _products(rng, templates, max(len(templates["products"]), round(len(templates["products"]) * math.sqrt(scale))))
+    stocks = _stocks(rng, stores, products)
+    order_items, item_counts = _order_items(rng, products, size)
+    customers = _customers(rng, templates, max(1, round(len(item_counts) / _mean(ORDERS_PER_CUSTOMER_WEIGHTS))))
+    orders = _orders(rng, templates, stores, sellers, customers, len(item_counts))
+
+    return {
+        "orders": orders,
+        "order_items": order_items,
+        "customers": customers,
+        "brands": templates["brands"],
+        "categories": templates["categories"],
+        "products": products,
+        "stocks": stocks,
+        "staffs": staffs,
+        "stores": stores,
+    }
+
+def write_csv(directory: str | Path, tables: dict[str, DataList]) -> None:
+    """
+    Skriver genererede tabeller til *.csv*-filer med samme navne og format som kildernes filer,
+    så de kan læses med f.eks. :func:`csvr.read_csv`.
+
+    :param directory: Mappen, som filerne skrives i. Oprettes, hvis den ikke findes.
+        *Påkrævet*.
+    :type directory: str | Path
+    :param tables: Tabellerne fra :func:`generate`.
+        *Påkrævet*.
+    :type tables: dict[str, DataList]
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, rows in tables.items():
+        with open(directory / f"{name}.csv", 'w', encoding="utf-8", newline='') as file:
+            writer = csv.DictWriter(file, rows[0].keys(), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+    print(f"SUCCES: Skrev {len(tables)} tabeller til '{directory}'.")
+
+def _read_template(path: Path) -> DataList:
+    with open(path, 'r', encoding="utf-8", newline='') as file:
+        return list(csv.DictReader(file))
+
+def _mean(weights: dict[int, int]) -> float:
+    return sum(value * weight for value, weight in weights.items()) / sum(weights.values())
+
+def _zipf(count: int, skew: float) -> list[float]:
+    # Kumulerede vægte, hvor element nr. r vægtes med 1 / r^skew
+    return list(_accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+def _accumulate(weights: typing.Iterable[float]) -> typing.Iterator[float]:
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
+
+def _unique(name: str, seen: set[str]) -> str:
+    # Tilføjer et løbenummer, når et navn allerede er brugt
+    candidate, number = name, 1
+    while candidate in seen:
+        number += 1
+        candidate = f"{name} {number}"
+    seen.add(candidate)
+    return candidate
+
+def _phone(rng: random.Random) -> str:
+    return f"({rng.randrange(200, 1000)}) {rng.randrange(200, 1000)}-{rng.randrange(10_000):04}"
+
+def _house(rng: random.Random, street: str) -> str:
+    # Udskifter husnummeret på en af de oprindelige adresser
+    return f"{rng.randrange(1, 10_000)} {street.split(' ', 1)[-1]}"
+
+def _stores(rng: random.Random, templates: dict[str, DataList], count: int) -> DataList:
+    stores = [dict(store) for store in templates["stores"]]
+    seen = {store["name"] for store in stores}
+    addresses = templates["customers"]
+    while len(stores) < count:
+        address = rng.choice(addresses)
+        name = _unique(f"{address['city']} Bikes", seen)
+        stores.append({
+            "name": name,
+            "phone": _phone(rng),
+            "email": f"{name.lower().replace(' ', '')}@bikes.shop",
+            "street": _house(rng, address["street"].strip()),
+            "city": address["city"],
+            "state": address["state"],
+            "zip_code": address["zip_code"]
+        })
+    return stores
+
+def _staffs(rng: random.Random, templates: dict[str, DataList], stores: DataList) -> tuple[DataList, dict[str, list[str]]]:
+    # De oprindelige medarbejdere beholdes sammen med dem, der står på de oprindelige ordrer
+    staffs = [dict(staff) for staff in templates["staffs"]]
+    sellers = {}
+    for order in templates["orders"]:
+        if order["staff_name"] not in sellers.setdefault(order["store"], []):
+            sellers[order["store"]].append(order["staff_name"])
+
+    # Hver ny butik får en leder under direktøren og 2-3 sælgere under lederen
+    # Fornavnene skal være unikke, da ordrerne slår medarbejderne op ud fra dem
+    seen = {staff["name"] for staff in staffs}
+    first_names = [customer["first_name"] for customer in templates["customers"]]
+    last_names = [customer["last_name"] for customer in templates["customers"]]
+    for store in stores[len(templates["stores"]):]:
+        manager_id = "1"
+        for role in range(1 + rng.randint(2, 3)):
+            name = _unique(rng.choice(first_names), seen)
+            last_name = rng.choice(last_names)
+            staffs.append({
+                "name": name,
+                "last_name": last_name,
+                "email": f"{name.lower().replace(' ', '')}.{last_name.lower()}@bikes.shop",
+                "phone": _phone(rng),
+                "active": "1",
+                "store_name": store["name"],
+                "street": store["street"],
+                "manager_id": manager_id
+            })
+            if role == 0:
+                manager_id = str(len(staffs))
+            else:
+                sellers.setdefault(store["name"], []).append(name)
+    return staffs, sellers
+
+def _products(rng: random.Random, templates: dict[str, DataList], count: int) -> DataList:
+    # De oprindelige produkter beholdes, og nye produkter er varianter af dem med en anden årgang og pris
+    products = [dict(product) for product in templates["products"]]
+    seen = {product["product_name"] for product in products}
+    years = rng.choices(list(MODEL_YEAR_WEIGHTS), list(MODEL_YEAR_WEIGHTS.values()), k=count)
+    for product_id in range(len(products) + 1, count + 1):
+        base = rng.choice(templates["products"])
+        year = years[product_id - 1]
+        model, number = base["product_name"].rsplit(" - ", 1)[0], 1
+        while (name := f"{model}{f' {number}' if number > 1 else ''} - {year}") in seen:
+            number += 1
+        seen.add(name)
+        products.append({
+            "product_id": str(product_id),
+            "product_name": name,
+            "brand_id": base["brand_id"],
+            "category_id": base["category_id"],
+            "model_year": year,
+            "list_price": f"{float(base['list_price']) * rng.uniform(0.9, 1.1):.2f}"
+        })
+    return products
+
+def _stocks(rng: random.Random, stores: DataList, products: DataList) -> DataList:
+    return [
+        {"store_name": store["name"], "product_id": product["product_id"], "quantity": str(rng.randint(0, 30))}
+        for store in stores
+        for product in products
+        if rng.random() < STOCK_RATIO
+    ]
+
+def _order_items(rng: random.Random, products: DataList, size: int) -> tuple[DataList, list[int]]:
+    # Antallet af varelinjer for hver ordre; den sidste ordre afkortes, så der er præcis size rækker
+    counts, total = [], 0
+    item_weights = list(_accumulate(ITEMS_PER_ORDER_WEIGHTS.values()))
+    while total < size:
+        count = min(rng.choices(list(ITEMS_PER_ORDER_WEIGHTS), cum_weights=item_weights)[0], size - total)
+        counts.append(count)
+        total += count
+
+    # Produkternes popularitet fordeles tilfældigt, så de populære ikke blot er de første id'er
+    ranked = list(products)
+    rng.shuffle(ranked)
+    chosen = rng.choices(ranked, cum_weights=_zipf(len(ranked), PRODUCT_SKEW), k=size)
+    quantities = rng.choices(("1", "2"), k=size)
+    discounts = rng.choices(DISCOUNTS, k=size)
+
+    rows, position = [], 0
+    for order_id, count in enumerate(counts, 1):
+        for item_id in range(1, count + 1):
+            product = chosen[position]
+            rows.append({
+                "order_id": str(order_id),
+                "item_id": str(item_id),
+                "product_id": product["product_id"],
+                "quantity": quantities[position],
+                "list_price": product["list_price"],
+                "discount": discounts[position]
+            })
+            position += 1
+    return rows, counts
+
+def _customers(rng: random.Random, templates: dict[str, DataList], count: int) -> DataList:
+    originals = templates["customers"]
+    customers = [dict(customer) for customer in originals[:count]]
+    seen = {customer["email"] for customer in customers}
+    for customer_id in range(len(customers) + 1, count + 1):
+        first_name = rng.choice(originals)["first_name"]
+        last_name = rng.choice(originals)["last_name"]
+        address = rng.choice(originals)
+        domain = address["email"].rsplit('@', 1)[-1]
+        email = f"{first_name.lower()}.{last_name.lower()}@{domain}"
+        if email in seen:
+            email = f"{first_name.lower()}.{last_name.lower()}{customer_id}@{domain}"
+        seen.add(email)
+        customers.append({
+            "customer_id": str(customer_id),
+            "first_name": first_name,
+            "last_name": last_name,
+            "phone": _phone(rng) if rng.random() < PHONE_RATIO else "NULL",
+            "email": email,
+            "street": _house(rng, address["street"]),
+            "city": address["city"],
+            "state": address["state"],
+            "zip_code": address["zip_code"]
+        })
+    return customers
+
+def _orders(rng: random.Random, templates: dict[str, DataList], stores: DataList, sellers: dict[str, list[str]], customers: DataList, count: int) -> DataList:
+    # Kunderne får 1-3 ordrer hver og fordeles tilfældigt over ordrerne
+    customer_ids = []
+    repeats = rng.choices(list(ORDERS_PER_CUSTOMER_WEIGHTS), list(ORDERS_PER_CUSTOMER_WEIGHTS.values()), k=len(customers))
+    while len(customer_ids) < count:
+        for customer, repeat in zip(customers, repeats):
+            customer_ids.extend([customer["customer_id"]] * repeat)
+    customer_ids = customer_ids[:count]
+    rng.shuffle(customer_ids)
+
+    # Butikkerne vægtes efter deres rang; de oprindelige butikker rangeres efter deres antal ordrer
+    popularity = {}
+    for order in templates["orders"]:
+        popularity[order["store"]] = popularity.get(order["store"], 0) + 1
+    ranked = sorted(stores, key=lambda store: -popularity.get(store["name"], 0))
+    chosen_stores = rng.choices(ranked, cum_weights=_zipf(len(ranked), STORE_SKEW), k=count)
+    statuses = rng.choices(list(ORDER_STATUS_WEIGHTS), list(ORDER_STATUS_WEIGHTS.values()), k=count)
+    # Ordrerne er sorteret efter dato ligesom i de oprindelige data
+    days = sorted(rng.choices(range((LAST_ORDER_DATE - FIRST_ORDER_DATE).days + 1), k=count))
+
+    rows = []
+    for order_id, (customer_id, store, status, day) in enumerate(zip(customer_ids, chosen_stores, statuses, days), 1):
+        order_date = FIRST_ORDER_DATE + timedelta(days=day)
+        # Kun gennemførte ordrer er afsendt; de øvrige skal bruges samme dag
+        if status == "4":
+            required_date = order_date + timedelta(days=rng.randint(1, 3))
+            shipped_date = (order_date + timedelta(days=rng.randint(1, 3))).strftime("%d/%m/%Y")
+        else:
+            required_date, shipped_date = order_date, "NULL"
+        rows.append({
+            "order_id": str(order_id),
+            "customer_id": customer_id,
+            "order_status": status,
+            "order_date": order_date.strftime("%d/%m/%Y"),
+            "required_date": required_date.strftime("%d/%m/%Y"),
+            "shipped_date": shipped_date,
+            "store": store["name"],
+            "staff_name": rng.choice(sellers[store["name"]])
+        })
+    return rows
@@ -25,6 +25,9 @@ class DatabaseConnector:
         Hvis tom, bruges MySQL-standarden ``"3306"``.
         *Upåkrævet*. Standardværdi: ``''``
     :type port: str
+    :param pool_size: Antallet af ekstra forbindelser til databasen, så flere tabeller kan indlæses samtidigt.
+        *Upåkrævet*. Standardværdi: ``0``
+    :type pool_size: int
     """
 
     def __init__(self,
@@ -32,7 +35,9 @@ class DatabaseConnector:
         password: str = '',
         database: str = '',
         host: str = '',
-        port: str = ''
+        port: str = '',
+        *,
+        pool_size: int = 0
     ) -> None:
         """
         Konstruktøren af connector-objektet.
@@ -57,6 +62,9 @@ class DatabaseConnector:
             Hvis tom, bruges MySQL-standarden ``"3306"``.
             *Upåkrævet*. Standardværdi: ``''``
         :type port: str
+        :param pool_size: Antallet af ekstra forbindelser til databasen, så flere tabeller kan indlæses samtidigt.
+            *Upåkrævet*. Standardværdi: ``0``
+        :type pool_size: int
         """
         if not username:
             self.username = input("Indtast brugernavn: ").strip()
@@ -81,6 +89,7 @@ class DatabaseConnector:
         # Anden adresse end standarden '127.0.0.1:3306' kan defineres
         self.host = host
         self.port = port
+        self.pool_size = pool_size
 
         # Forsøger at oprette forbindelser
         self._full_login(password)
@@ -144,6 +153,9 @@ class DatabaseConnector:
             *Påkrævet*.
         :type password: str
         """
+        # Ekstra forbindelser til databasen; oprettes her, da adgangskoden ikke gemmes
+        self.pool: list[mysql.connector.MySQLConnection] = []
+
         # Forbinder direkte... (skal bruges til oprettelse eller nulstilling)
         self.direct_connection = self._login(password, db=False)
         while not self.direct_connection:
@@ -168,6 +180,14 @@ class DatabaseConnector:
                     return
             print(f"SUCCES: Forbundet til databasen '{self.database}'.")
 
+            # ...og evt. med flere forbindelser til samme database (se Database.load())
+            for _ in range(self.pool_size):
+                if not (connection := self._login(password, db=True)):
+                    break
+                self.pool.append(connection)
+            if self.pool:
+                print(f"SUCCES: Oprettede {len(self.pool)} ekstra forbindelser til databasen '{self.database}'.")
+
     def login(self) -> None:
         """
         Genåbner forbindelserne til server og database,
@@ -177,6 +197,8 @@ class DatabaseConnector:
         try:
             self.direct_connection.connect()
             self.connection.connect()
+            for connection in self.pool:
+                connection.connect()
         except Exception as err:
             self._error("Kunne ikke genoprette forbindelsen.", err)
         else:
@@ -187,6 +209,8 @@ class DatabaseConnector:
         Lukker forbindelserne til database og server.
         """
         try:
+            for connection in self.pool:
+                connection.close()
             self.connection.close()
             print(f"SUCCES: Lukkede forbindelsen til databasen '{self.database}'.")
             self.direct_connection.close()
@@ -1,7 +1,21 @@
+import queue
 import getpass
 import typing
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from .connector import DatabaseConnector
 from intertable import *
+from stream import TableStream
+from cache import ExtractionCache
+from metrics import Metrics
+
+# Måderne, hvorpå rækker indsættes, hvis de har samme primary eller unique key som en række i tabellen (se Database.insert())
+INSERT_MODES = ("insert", "skip", "overwrite", "replace")
+# Standardstørrelsen af hver bid rækker, der indsættes og committes for sig (se Database.insert())
+INSERT_BATCH_ROWS = 1_000
+INSERT_BATCH_BYTES = 4 * 1024 * 1024
+# Andelen af serverens max_allowed_packet, som en bid højst må fylde, da størrelsen kun er et skøn
+PACKET_MARGIN = 0.9
 
 class Database(DatabaseConnector):
     """
@@ -32,6 +46,25 @@ class Database(DatabaseConnector):
     :param preview: Bestemmer, om queries skal forhåndsvises inden eksekvering.
         *Upåkrævet*. Standardværdi: `True`
     :type preview: bool
+    :param metrics: Målingerne, som indlæsningen af ``init_load`` registreres i.
+        *Upåkrævet*. Standardværdi: `None`
+    :type metrics: Metrics | None
+    :param pool_size: Antallet af ekstra forbindelser til databasen, som uafhængige tabeller indlæses samtidigt over.
+        *Upåkrævet*. Standardværdi: `0`
+    :type pool_size: int
+    :param load_mode: Måden, hvorpå ``init_load`` indsættes. Se :meth:`load`.
+        *Upåkrævet*. Standardværdi: `"insert"`
+    :type load_mode: str | dict[str, str]
+    :param batch_rows: Det største antal rækker i hver bid, der indsættes og committes for sig.
+        *Upåkrævet*. Standardværdi: `INSERT_BATCH_ROWS`
+    :type batch_rows: int
+    :param batch_bytes: Den største (anslåede) størrelse i bytes af hver bid, dog højst serverens ``max_allowed_packet``.
+        *Upåkrævet*. Standardværdi: `INSERT_BATCH_BYTES`
+    :type batch_bytes: int
+    :param bulk: Bestemmer, om foreign key- og unique-tjek slås fra under indsættelser.
+        Hurtigere for store indlæsninger, men MySQL opdager så ikke ugyldige rækker.
+        *Upåkrævet*. Standardværdi: `False`
+    :type bulk: bool
     """
     def __init__(self,
         username: str = '',
@@ -41,7 +74,13 @@ class Database(DatabaseConnector):
         port: str = '',
         *,
         preview: bool = True,
-        init_load: list[InterTable] = []
+        init_load: list[InterTable] = [],
+        metrics: Metrics | None = None,
+        pool_size: int = 0,
+        load_mode: str | dict[TableName, str] = "insert",
+        batch_rows: int = INSERT_BATCH_ROWS,
+        batch_bytes: int = INSERT_BATCH_BYTES,
+        bulk: bool = False
     ) -> None:
         """
         Konstruktøren af database-objektet.
@@ -70,11 +109,35 @@ class Database(DatabaseConnector):
         :param preview: Bestemmer, om queries skal forhåndsvises inden eksekvering.
             *Upåkrævet*. Standardværdi: `True`
         :type preview: bool
+        :param metrics: Målingerne, som indlæsningen af ``init_load`` registreres i.
+            *Upåkrævet*. Standardværdi: `None`
+        :type metrics: Metrics | None
+        :param pool_size: Antallet af ekstra forbindelser til databasen, som uafhængige tabeller indlæses samtidigt over.
+            *Upåkrævet*. Standardværdi: `0`
+        :type pool_size: int
+        :param load_mode: Måden, hvorpå ``init_load`` indsættes. Se :meth:`load`.
+            *Upåkrævet*. Standardværdi: `"insert"`
+        :type load_mode: str | dict[str, str]
+        :param batch_rows: Det største antal rækker i hver bid, der indsættes og committes for sig.
+            *Upåkrævet*. Standardværdi: `INSERT_BATCH_ROWS`
+        :type batch_rows: int
+        :param batch_bytes: Den største (anslåede) størrelse i bytes af hver bid, dog højst serverens ``max_allowed_packet``.
+            *Upåkrævet*. Standardværdi: `INSERT_BATCH_BYTES`
+        :type batch_bytes: int
+        :param bulk: Bestemmer, om foreign key- og unique-tjek slås fra under indsættelser.
+            Hurtigere for store indlæsninger, men MySQL opdager så ikke ugyldige rækker.
+            *Upåkrævet*. Standardværdi: `False`
+        :type bulk: bool
         """
         # Konfiguration
         self.preview = preview
+        self.batch_rows = batch_rows
+        self.batch_bytes = batch_bytes
+        self.bulk = bulk
+        # Serverens max_allowed_packet, hentes ved første indsættelse (se _max_packet())
+        self._packet: int | None = None
         # Initialiserer connectoren
-        super().__init__(username, password, database, host, port)
+        super().__init__(username, password, database, host, port, pool_size=pool_size)
 
         if self.database:
             # Hvis forbindelsen ikke kan skabes (f.eks. fordi det angivne databasenavn ikke eksisterer),
@@ -87,7 +150,7 @@ class Database(DatabaseConnector):
                     self._full_login(getpass.getpass("Indtast adgangskode igen: "))
             # Loader tabeller til databasen fra start, hvis nogen oplyses
             if self.connection and init_load:
-                self.load(*init_load)
+                self.load(*init_load, metrics=metrics, mode=load_mode)
 
     def _execute(self,
         query: str,
@@ -95,7 +158,9 @@ class Database(DatabaseConnector):
         /, *,
         db: bool = True,
         read: bool = False,
-        select: bool = False
+        select: bool = False,
+        connection: typing.Any = None,
+        interactive: bool = True
     ) -> bool | list[tuple]:
         """
         Eksekverer et SQL-query.
@@ -118,6 +183,13 @@ class Database(DatabaseConnector):
             så data kan læses og fetches fra databasen.
             *Upåkrævet*. Standardværdi: `False`
         :type read: bool
+        :param connection: En anden forbindelse til databasen end standardforbindelsen, f.eks. fra ``pool``.
+            *Upåkrævet*. Standardværdi: `None`
+        :type connection: MySQLConnection | None
+        :param interactive: Bestemmer, om brugeren spørges, om kørslen skal fortsætte, hvis queriet fejler.
+            Hvis `False`, udløses fejlen i stedet, f.eks. i tråde, der ikke må læse fra terminalen (se :meth:`_load_parallel`).
+            *Upåkrævet*. Standardværdi: `True`
+        :type interactive: bool
 
         :return: Queriet kunne eksekveres, og handlingen blev gennemført.
         :rtype: bool: `True`
@@ -126,7 +198,8 @@ class Database(DatabaseConnector):
         :return: Den læste data fra databasen, hvis en READ-operation kunne gennemføres.
         :rtype: list[tuple]
         """
-        connection = self.connection if db else self.direct_connection
+        if connection is None:
+            connection = self.connection if db else self.direct_connection
         if not connection:
             self._error(f"Kan ikke udføre nogen handlinger uden en forbindelse til {"databasen" if db else "serveren"}.")
             quit()
@@ -149,6 +222,8 @@ class Database(DatabaseConnector):
                 return cursor.fetchall()
         except Exception as err:
             self._error("Kunne ikke eksekvere queriet.", err)
+            if not interactive:
+                raise
             force = input("Fortsæt kørsel af programmet alligevel? (j/N): ")
             if force.lower() in ['j', 'y']:
                 return False
@@ -156,6 +231,38 @@ class Database(DatabaseConnector):
         else:
             return True
 
+    def _execute_chunks(self, query: str, params: Parameter = {}, chunk_size: int = 10_000) -> typing.Iterator[DataList]:
+        """
+        Eksekverer et SELECT-query og henter resultatet i bidder i stedet for på én gang.
+
+        Der bruges en unbuffered cursor, så kun én bid ad gangen holdes i hukommelsen.
+        Forbindelsen kan derfor ikke bruges til andre queries, før alle bidder er hentet.
+
+        :param query: Queriet, der skal eksekveres. Skal skrives i SQL.
+            *Påkrævet*.
+        :type query: str
+        :param params: En dict indeholdende parameteriserede værdier til queriet.
+            *Upåkrævet*. Standardværdi: `{}`
+        :type params: dict[str, Any]
+        :param chunk_size: Det største antal rækker i hver bid.
+            *Upåkrævet*. Standardværdi: `10_000`
+        :type chunk_size: int
+
+        :return: Resultatet i lister med højst ``chunk_size`` rækker.
+        :rtype: Iterator[list[dict[str, Any]]]
+        """
+        if not self.connection:
+            self._error("Kan ikke udføre nogen handlinger uden en forbindelse til databasen.")
+            quit()
+
+        try:
+            with self.connection.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(chunk_size):
+                    yield rows
+        except Exception as err:
+            self._error("Kunne ikke eksekvere queriet.", err)
+
     def _preview(self, query: str) -> None:
         """
         Viser et preview at queriet, der skal til at køres.
@@ -213,7 +320,7 @@ class Database(DatabaseConnector):
         if self._execute(database_query, db=False):
             print(f"SUCCES: Databasen '{database_name}' blev oprettet.")
 
-    def create(self, table: InterTable) -> None:
+    def create(self, table: InterTable, *, exists_ok: bool = False, connection: typing.Any = None, interactive: bool = True) -> None:
         """
         Opretter en ny tabel ud fra de angivne oplysninger.
 
@@ -225,12 +332,21 @@ class Database(DatabaseConnector):
         :type primary_key: str, optional
         :param foreign_key: _description_, defaults to {}
         :type foreign_key: dict, optional
+        :param exists_ok: Bestemmer, om en eksisterende tabel med samme navn beholdes i stedet for at give en fejl.
+            *Upåkrævet*. Standardværdi: `False`
+        :type exists_ok: bool
+        :param connection: Forbindelsen, tabellen oprettes over (se :meth:`_execute`).
+            *Upåkrævet*. Standardværdi: `None`
+        :type connection: MySQLConnection | None
+        :param interactive: Bestemmer, om brugeren spørges, hvis oprettelsen fejler (se :meth:`_execute`).
+            *Upåkrævet*. Standardværdi: `True`
+        :type interactive: bool
         """
         table_name = table.name
         columns = table.header
         keys = table.keys
 
-        create_query = f"CREATE TABLE `{table_name}` ("
+        create_query = f"CREATE TABLE {"IF NOT EXISTS " if exists_ok else ''}`{table_name}` ("
 
         column_queries = []
         column_params = {}
@@ -256,7 +372,7 @@ class Database(DatabaseConnector):
 
         self._preview(create_query)
 
-        if self._execute(create_query, column_params):
+        if self._execute(create_query, column_params, connection=connection, interactive=interactive):
             print(f"SUCCES: Oprettede tabellen '{table_name}'.")
 
     def _create_keys(self, keys: Keys, table_name: TableName) -> str:
@@ -280,14 +396,30 @@ class Database(DatabaseConnector):
             keylist.append(unique_key)
         return ", ".join(keylist)
 
-    # TODO: Implementér et system til at skippe eller overwrite, hvis et felt i en række i datasættet
-    # har samme værdi som ditto i tabellen. Hvis altså kolonnen har PRIMARY KEY eller UNIQUE som constraint.
-
     # None eller ikke-eksisterende keys -> default value hvis DEFAULT -> NULL hvis nullable -> fejl
-    def insert(self, data: InterTable) -> None:
+    def insert(self, data: InterTable, presort: bool = True, mode: str = "insert", *, connection: typing.Any = None, interactive: bool = True) -> None:
         """
         Indsætter en eller flere rækker data i en tabel.
 
+        Rækkerne indsættes sorteret efter primary key, da InnoDB gemmer rækkerne i den rækkefølge,
+        og indsættelse i rækkefølge derfor undgår, at indekset skal omarrangeres undervejs.
+        Har tabellen en foreign key til sig selv (f.eks. ``staff.manager_id``),
+        indsættes de rækker, der henvises til, dog før rækkerne, der henviser til dem.
+
+        Har en række samme primary eller unique key som en række i tabellen, afhænger resultatet af ``mode``:
+
+        * `"insert"`: Indsættelsen fejler (``INSERT``).
+        * `"skip"`: Rækken springes over, og den eksisterende række beholdes (``INSERT IGNORE``).
+        * `"overwrite"`: Den eksisterende række opdateres med rækkens værdier (``ON DUPLICATE KEY UPDATE``).
+          Kun rækker, hvor en værdi er ændret, skrives, så en gentaget indlæsning rører kun de ændrede rækker.
+        * `"replace"`: Den eksisterende række slettes, og rækken indsættes i stedet (``REPLACE``).
+          Sletningen fejler, hvis andre tabeller henviser til rækken med en foreign key.
+
+        Rækkerne indsættes i bidder med ét INSERT-query med flere rækker pr. bid, og hver bid committes for sig,
+        så en fejl kun ruller den igangværende bid tilbage. Bidderne er højst ``batch_rows`` rækker
+        og ``batch_bytes`` bytes og aldrig større end serverens ``max_allowed_packet``.
+        Er ``bulk`` slået til, slås foreign key- og unique-tjek fra for forbindelsen under indsættelsen.
+
         :param data: Dataene, der ønskes indsat i tabellen.
             *Påkrævet*.
         :type data: list[str]
@@ -299,39 +431,375 @@ class Database(DatabaseConnector):
             Hvis `True` forsøges dataen desuden at matches med den angivne tabels kolonnenavne.
             *Upåkrævet*. Standardværdi: `True`
         :type header: bool
+        :param presort: Bestemmer, om rækkerne sorteres efter primary key før indsættelsen.
+            Tabellen selv ændres ikke.
+            *Upåkrævet*. Standardværdi: `True`
+        :type presort: bool
+        :param mode: Måden, hvorpå rækker med samme primary eller unique key som en eksisterende række indsættes.
+            Skal være en af `"insert"`, `"skip"`, `"overwrite"` og `"replace"`.
+            *Upåkrævet*. Standardværdi: `"insert"`
+        :type mode: str
+        :param connection: Forbindelsen, rækkerne indsættes over (se :meth:`_execute`).
+            *Upåkrævet*. Standardværdi: `None`
+        :type connection: MySQLConnection | None
+        :param interactive: Bestemmer, om brugeren spørges, hvis indsættelsen fejler (se :meth:`_execute`).
+            *Upåkrævet*. Standardværdi: `True`
+        :type interactive: bool
 
         :return: Hvis tabellen ikke findes, eller hvis dataene ikke har samme antal kolonner som tabellen.
         :rtype: None
         """
+        if mode not in INSERT_MODES:
+            raise ValueError(f"Ukendt indsættelsesmåde '{mode}'. Vælg en af {INSERT_MODES}.")
         table_name = data.name
         header = data.header
 
+        names = [header[column].name for column in header]
+
         # Danner query
-        insert_query = f"INSERT INTO `{table_name}` ("
+        insert_query = {"insert": "INSERT INTO", "skip": "INSERT IGNORE INTO", "overwrite": "INSERT INTO", "replace": "REPLACE INTO"}[mode]
+        insert_query += f" `{table_name}` ("
         # Kolonnenavne (med backticks, fordi navnene er taget fra tabellen)
-        insert_query += ", ".join([f"`{header[column].name}`" for column in header]) + ") VALUES ("
-        # Kolonneværdier (med %()s, fordi det er værdier oplyst af brugeren, der skal tjekkes)
-        insert_query += ", ".join([f"%({header[column].name})s" for column in header]) + ')'
+        insert_query += ", ".join([f"`{name}`" for name in names]) + ") VALUES "
+        # Kolonneværdier (med %s, fordi det er værdier oplyst af brugeren, der skal tjekkes)
+        # Gentages for hver række i bidden
+        row_query = '(' + ", ".join(["%s"] * len(names)) + ')'
+        end_query = self._on_duplicate(data) if mode == "overwrite" else ''
 
         # Danner liste af dicts over parametre til indsættelse af data
-        # mysql.connector kan 
-        insert_params = list(data.data)
+        insert_params = list(data.data) if data.storage == "rows" else [dict(entry) for entry in data]
+        primary = data.keys.primary
+        if presort and primary and all(column in header for column in ([primary] if isinstance(primary, str) else primary)):
+            insert_params = [insert_params[row] for row in data.sort_order()]
+        for column, (reference_table, reference) in (data.keys.foreign or {}).items():
+            if reference_table == table_name and column in header and reference in header:
+                insert_params = self._parents_first(insert_params, column, reference)
+
+        self._preview(insert_query + row_query + ", ..." + end_query)
+
+        rows = [tuple(row[name] for name in names) for row in insert_params]
+        batches = self._batches(rows, len(insert_query) + len(end_query), len(row_query) + 2, connection, interactive)
+        if self._execute_batches(insert_query, row_query, end_query, batches, connection=connection, interactive=interactive):
+            print(f"SUCCES: DataList indsat i tabellen '{table_name}'.")
 
-        self._preview(insert_query)
+    def _max_packet(self, connection: typing.Any = None, interactive: bool = True) -> int:
+        """
+        Henter serverens ``max_allowed_packet``, den største tilladte størrelse af et query i bytes.
 
-        if self._execute(insert_query, insert_params):
-            print(f"SUCCES: DataList indsat i tabellen '{table_name}'.")
+        Værdien hentes kun én gang og gemmes. Kan den ikke hentes, bruges ``batch_bytes``.
+
+        :rtype: int
+        """
+        if self._packet is None:
+            result = self._execute("SELECT @@max_allowed_packet", read=True, connection=connection, interactive=interactive)
+            self._packet = int(result[0][0]) if result else self.batch_bytes
+        return self._packet
+
+    def _batches(self, rows: list[tuple], query_size: int, row_size: int, connection: typing.Any = None, interactive: bool = True) -> typing.Iterator[list[tuple]]:
+        """
+        Deler rækkerne op i bidder efter ``batch_rows`` og ``batch_bytes``.
+
+        Størrelsen af en række anslås ud fra længden af dens værdier som tekst plus pladsen til citationstegn,
+        kommaer og parenteser. En enkelt række større end grænsen bliver sin egen bid.
+
+        :param rows: Rækkerne, der skal indsættes, med værdierne i samme rækkefølge som kolonnerne i queriet.
+            *Påkrævet*.
+        :type rows: list[tuple]
+        :param query_size: Længden af queriet uden rækkerne.
+            *Påkrævet*.
+        :type query_size: int
+        :param row_size: Længden af en række i queriet uden værdierne.
+            *Påkrævet*.
+        :type row_size: int
+
+        :return: Bidderne i rækkefølge.
+        :rtype: Iterator[list[tuple]]
+        """
+        limit = min(self.batch_bytes, int(self._max_packet(connection, interactive) * PACKET_MARGIN)) - query_size
+        batch = []
+        size = 0
+        for row in rows:
+            # Værdierne kan fylde mere efter escaping, derfor de to ekstra bytes pr. værdi ud over citationstegnene
+            row_bytes = row_size + sum(len(str(value).encode()) + 4 for value in row)
+            if batch and (len(batch) >= self.batch_rows or size + row_bytes > limit):
+                yield batch
+                batch = []
+                size = 0
+            batch.append(row)
+            size += row_bytes
+        if batch:
+            yield batch
+
+    def _execute_batches(self,
+        query: str,
+        row_query: str,
+        end_query: str,
+        batches: typing.Iterable[list[tuple]],
+        *,
+        connection: typing.Any = None,
+        interactive: bool = True
+    ) -> bool:
+        """
+        Eksekverer et INSERT-query med flere rækker for hver bid og committer efter hver bid.
+
+        Fejler en bid, rulles kun den tilbage, mens de tidligere bidder forbliver i tabellen.
 
-    def load(self, *tables: InterTable) -> None:
+        :param query: Queriet op til og med ``VALUES``.
+            *Påkrævet*.
+        :type query: str
+        :param row_query: Pladsholderne for én række, f.eks. ``(%s, %s)``.
+            *Påkrævet*.
+        :type row_query: str
+        :param end_query: Resten af queriet efter rækkerne, f.eks. ``ON DUPLICATE KEY UPDATE``.
+            *Påkrævet*.
+        :type end_query: str
+        :param batches: Bidderne af rækker.
+            *Påkrævet*.
+        :type batches: Iterable[list[tuple]]
+        :param connection: En anden forbindelse til databasen end standardforbindelsen, f.eks. fra ``pool``.
+            *Upåkrævet*. Standardværdi: `None`
+        :type connection: MySQLConnection | None
+        :param interactive: Bestemmer, om brugeren spørges, om kørslen skal fortsætte, hvis en bid fejler (se :meth:`_execute`).
+            *Upåkrævet*. Standardværdi: `True`
+        :type interactive: bool
+
+        :return: Alle bidder blev indsat.
+        :rtype: bool
+        """
+        if connection is None:
+            connection = self.connection
+        if not connection:
+            self._error("Kan ikke udføre nogen handlinger uden en forbindelse til databasen.")
+            quit()
+
+        committed = 0
+        try:
+            with connection.cursor() as cursor:
+                if self.bulk:
+                    # Tjekkene sættes tilbage til deres tidligere værdi, da de kan være slået fra af load()
+                    cursor.execute("SET @foreign_key_checks = @@foreign_key_checks, @unique_checks = @@unique_checks")
+                    cursor.execute("SET foreign_key_checks = 0, unique_checks = 0")
+                try:
+                    for batch in batches:
+                        cursor.execute(query + ", ".join([row_query] * len(batch)) + end_query, [value for row in batch for value in row])
+                        connection.commit()
+                        committed += len(batch)
+                finally:
+                    if self.bulk:
+                        cursor.execute("SET foreign_key_checks = @foreign_key_checks, unique_checks = @unique_checks")
+        except Exception as err:
+            connection.rollback()
+            self._error(f"Kunne ikke eksekvere queriet. {committed} rækker blev indsat før fejlen.", err)
+            if not interactive:
+                raise
+            force = input("Fortsæt kørsel af programmet alligevel? (j/N): ")
+            if force.lower() in ['j', 'y']:
+                return False
+            quit()
+        else:
+            return True
+
+    def _on_duplicate(self, data: InterTable) -> str:
+        """
+        Danner den del af et INSERT-query, der opdaterer en eksisterende række med samme primary eller unique key.
+
+        Kolonnerne i tabellens primary key opdateres ikke. Består tabellen kun af dem,
+        sættes den første kolonne til sin egen værdi, så rækken blot springes over.
+
+        :param data: Tabellen, der indsættes.
+            *Påkrævet*.
+        :type data: InterTable
+
+        :rtype: str
+        """
+        primary = data.keys.primary
+        primary = [primary] if isinstance(primary, str) else (primary or [])
+        columns = [data.header[column].name for column in data.header if data.header[column].name not in primary]
+        if not columns:
+            first = data.header[next(iter(data.header))].name
+            return f" ON DUPLICATE KEY UPDATE `{first}` = `{first}`"
+        # Rækkens nye værdier hentes via aliaset 'new' (MySQL 8.0.19+), da VALUES() er forældet
+        return " AS new ON DUPLICATE KEY UPDATE " + ", ".join(f"`{column}` = new.`{column}`" for column in columns)
+
+    def _parents_first(self, rows: list[dict[str, typing.Any]], column: ColumnName, reference: ColumnName) -> list[dict[str, typing.Any]]:
+        """
+        Ordner rækkerne i en tabel med en foreign key til sig selv,
+        så hver række kommer efter rækken, som den henviser til.
+
+        Rækkerne ordnes efter deres afstand fra en række uden henvisning (f.eks. medarbejdere uden leder),
+        og ellers bevares rækkefølgen. Rækker, der henviser til sig selv eller indgår i en ring,
+        kommer til sidst, men kan kun indsættes, hvis foreign key-tjek er slået fra.
+
+        :param rows: Rækkerne, som de skal indsættes.
+            *Påkrævet*.
+        :type rows: list[dict[str, Any]]
+        :param column: Kolonnen med foreign key'en.
+            *Påkrævet*.
+        :type column: str
+        :param reference: Kolonnen, der henvises til.
+            *Påkrævet*.
+        :type reference: str
+
+        :return: Rækkerne i den nye rækkefølge.
+        :rtype: list[dict[str, Any]]
+        """
+        parents = {row[reference]: row[column] for row in rows}
+        depths = {}
+        for key in parents:
+            # Følger henvisningerne op, indtil en række uden (kendt) henvisning eller en allerede målt række nås
+            path = []
+            seen = set()
+            while key in parents and key not in depths and key not in seen:
+                seen.add(key)
+                path.append(key)
+                key = parents[key]
+            if key in seen:
+                # Ring eller henvisning til sig selv
+                depth = len(rows)
+            else:
+                depth = depths.get(key, -1)
+            for node in reversed(path):
+                depth = min(depth + 1, len(rows))
+                depths[node] = depth
+        return sorted(rows, key=lambda row: depths[row[reference]])
+
+    def _load_order(self, tables: typing.Sequence[InterTable | TableStream]) -> tuple[list[list[InterTable | TableStream]], list[InterTable | TableStream]]:
+        """
+        Inddeler tabellerne i niveauer efter deres foreign keys,
+        så hver tabel ligger i et senere niveau end tabellerne, den henviser til.
+
+        Tabeller i samme niveau afhænger ikke af hinanden og kan indlæses samtidigt.
+        Foreign keys til tabellen selv og til tabeller, der ikke indlæses, ignoreres.
+
+        :param tables: Tabellerne, der skal indlæses.
+            *Påkrævet*.
+        :type tables: Sequence[InterTable | TableStream]
+
+        :return: Niveauerne i rækkefølge og de tabeller, der indgår i en ring af foreign keys og ikke kan ordnes.
+        :rtype: tuple[list[list[InterTable | TableStream]], list[InterTable | TableStream]]
+        """
+        names = {table.name for table in tables}
+        if len(names) < len(tables):
+            raise ValueError("Tabellerne, der indlæses, skal have forskellige navne.")
+        references = {
+            table.name: {reference for reference, _ in (table.keys.foreign or {}).values() if reference in names and reference != table.name}
+            for table in tables
+        }
+        levels = []
+        remaining = list(tables)
+        loaded = set()
+        while remaining:
+            level = [table for table in remaining if references[table.name] <= loaded]
+            if not level:
+                break
+            levels.append(level)
+            loaded.update(table.name for table in level)
+            remaining = [table for table in remaining if table.name not in loaded]
+        return levels, remaining
+
+    def _load_table(self,
+        table: InterTable | TableStream,
+        presort: bool,
+        metrics: Metrics | None,
+        mode: str,
+        connection: typing.Any = None,
+        interactive: bool = True
+    ) -> None:
+        with metrics.stage("load", table.name) if metrics is not None else nullcontext() as record:
+            # Ved andre måder end "insert" genbruges en eksisterende tabel, så indlæsningen kan gentages
+            self.create(table, exists_ok=mode != "insert", connection=connection, interactive=interactive)
+            if isinstance(table, TableStream):
+                rows = 0
+                for chunk in table:
+                    self.insert(chunk, presort, mode, connection=connection, interactive=interactive)
+                    rows += len(chunk)
+            else:
+                self.insert(table, presort, mode, connection=connection, interactive=interactive)
+                rows = len(table)
+            if record is not None:
+                record.rows_in = record.rows_out = rows
+
+    def _load_parallel(self, level: list[InterTable | TableStream], presort: bool, metrics: Metrics | None, modes: dict[TableName, str]) -> None:
+        # Hver tabel lånes en forbindelse fra puljen, mens den indlæses
+        connections = queue.SimpleQueue()
+        for connection in self.pool:
+            connections.put(connection)
+
+        def load_table(table: InterTable | TableStream) -> None:
+            connection = connections.get()
+            try:
+                # Trådene må ikke spørge brugeren på samme tid, så fejl udløses og samles herunder
+                self._load_table(table, presort, metrics, modes[table.name], connection, interactive=False)
+            finally:
+                connections.put(connection)
+
+        if metrics is not None:
+            load_table = metrics.inherit(load_table)
+        with ThreadPoolExecutor(min(len(level), len(self.pool))) as executor:
+            futures = [executor.submit(load_table, table) for table in level]
+        failed = [table.name for table, future in zip(level, futures) if future.exception() is not None]
+
+        # Brugeren spørges kun én gang for hele niveauet, når alle tråde er færdige
+        if failed:
+            self._error(f"Kunne ikke indlæse tabellerne {failed}.", '')
+            force = input("Fortsæt kørsel af programmet alligevel? (j/N): ")
+            if force.lower() not in ['j', 'y']:
+                quit()
+
+    def load(self,
+        *tables: InterTable | TableStream,
+        presort: bool = True,
+        metrics: Metrics | None = None,
+        mode: str | dict[TableName, str] = "insert"
+    ) -> None:
         """
         Indlæser en eller flere tabeller i databasen.
 
+        Rækkefølgen bestemmes ud fra tabellernes foreign keys (se :meth:`_load_order`),
+        så en tabel altid oprettes efter tabellerne, den henviser til.
+        Tabellerne i samme niveau indlæses samtidigt over hver sin forbindelse fra ``pool``,
+        hvis der er mere end én, og forhåndsvisning er slået fra.
+        Tabeller, der indgår i en ring af foreign keys, indlæses til sidst med foreign key-tjek slået fra.
+
+        En TableStream indsættes bid for bid, efterhånden som bidderne hentes og transformeres.
+
         :param tables: En eller tabeller, der skal indlæses i databasen.
-        :type tables: InterTable
+        :type tables: InterTable | TableStream
+        :param presort: Bestemmer, om rækkerne sorteres efter primary key før indsættelsen.
+            For en TableStream gælder det inden for hver bid; brug :meth:`TableStream.sort` for hele strømmen.
+            *Upåkrævet*. Standardværdi: `True`
+        :type presort: bool
+        :param metrics: Målingerne, som indlæsningen af hver tabel registreres i som et trin.
+            *Upåkrævet*. Standardværdi: `None`
+        :type metrics: Metrics | None
+        :param mode: Måden, hvorpå rækkerne indsættes (se :meth:`insert`), enten for alle tabeller
+            eller pr. tabelnavn i en dict, hvor tabeller uden for dict'en indsættes med `"insert"`.
+            Ved andre måder end `"insert"` beholdes eksisterende tabeller, så en indlæsning kan gentages.
+            *Upåkrævet*. Standardværdi: `"insert"`
+        :type mode: str | dict[str, str]
         """
-        for table in tables:
-            self.create(table)
-            self.insert(table)
+        modes = mode if isinstance(mode, dict) else {table.name: mode for table in tables}
+        modes = {table.name: modes.get(table.name, "insert") for table in tables}
+        for table_mode in modes.values():
+            if table_mode not in INSERT_MODES:
+                raise ValueError(f"Ukendt indsættelsesmåde '{table_mode}'. Vælg en af {INSERT_MODES}.")
+
+        levels, cyclic = self._load_order(tables)
+        for level in levels:
+            if len(level) > 1 and len(self.pool) > 1 and not self.preview:
+                self._load_parallel(level, presort, metrics, modes)
+            else:
+                for table in level:
+                    self._load_table(table, presort, metrics, modes[table.name])
+
+        if cyclic:
+            print(f"ADVARSEL: Tabellerne {[table.name for table in cyclic]} henviser til hinanden i ring og indlæses uden foreign key-tjek.")
+            self._execute("SET foreign_key_checks = 0")
+            try:
+                for table in cyclic:
+                    self._load_table(table, presort, metrics, modes[table.name])
+            finally:
+                self._execute("SET foreign_key_checks = 1")
 
     # READ-operationer
     # TODO: Tilføj en måde, hvorpå foreign keys kan bruges til at joine eller læse data fra andre tabeller
@@ -387,6 +855,59 @@ class Database(DatabaseConnector):
         :return: Hvis READ-operationen ikke kunne gennemføres.
         :rtype: None
         """
+        select_query, select_params = self._select(table_name, *column_name, joins=joins, order=order, direction=direction, limit=limit, offset=offset, **kwargs)
+
+        self._preview(select_query)
+
+        result = self._execute(select_query, select_params, read=True, select=True)
+        if result:
+            print(f"SUCCES: Dataene blev læst fra '{table_name}'.")
+            return result
+
+    def read_chunks(self,
+        table_name: TableName,
+        *column_name: ColumnName,
+        chunk_size: int = 10_000,
+        **kwargs
+    ) -> typing.Iterator[DataList]:
+        """
+        Læser data fra en tabel i bidder i stedet for på én gang.
+
+        Tager de samme parametre som :meth:`read`.
+
+        :param table_name: Navnet på den tabel, som data skal læses fra.
+            *Påkrævet*.
+        :type table_name: str
+        :param chunk_size: Det største antal rækker i hver bid.
+            *Upåkrævet*. Standardværdi: `10_000`
+        :type chunk_size: int
+
+        :return: Rækkerne i lister med højst ``chunk_size`` rækker.
+        :rtype: Iterator[list[dict[str, Any]]]
+        """
+        select_query, select_params = self._select(table_name, *column_name, **kwargs)
+
+        self._preview(select_query)
+
+        yield from self._execute_chunks(select_query, select_params, chunk_size)
+        print(f"SUCCES: Dataene blev læst fra '{table_name}'.")
+
+    def _select(self,
+        table_name: TableName,
+        *column_name: ColumnName,
+        joins: list[dict[str, TableName | ColumnName]] = [],
+        order: int | ColumnName = 0,
+        direction: str = 'a',
+        limit: int = 0,
+        offset: int = 0,
+        **kwargs
+    ) -> tuple[str, Parameter]:
+        """
+        Konstruerer et SELECT-query. Se :meth:`read` for parametrene.
+
+        :return: En tuple bestående af queriet og en dict med parametre til eksekveringen af det.
+        :rtype: tuple[str, dict[str, Any]]
+        """
         select_params = {}
 
         select_query = "SELECT "
@@ -423,12 +944,7 @@ class Database(DatabaseConnector):
             select_query += limit_query
             select_params.update(limit_params)
 
-        self._preview(select_query)
-
-        result = self._execute(select_query, select_params, read=True, select=True)
-        if result:
-            print(f"SUCCES: Dataene blev læst fra '{table_name}'.")
-            return result
+        return select_query, select_params
 
     def _where(self, **kwargs):
         # TODO: Tilføj OR osv.?
@@ -737,7 +1253,12 @@ class Database(DatabaseConnector):
 
         return keys
 
-    def get_table(self, table_name: TableName, new_name: TableName = '', *args, **kwargs) -> InterTable:
+    def get_table(self, table_name: TableName, new_name: TableName = '', *args, cache: ExtractionCache | None = None, **kwargs) -> InterTable:
+        # Hvis en cache angives, genbruges tabellen, så længe tabellens checksum eller ændringstidspunkt er uændret
+        if cache is not None:
+            source = f"db:{self.host}:{self.port}/{self.database}/{table_name}:{new_name}:{args}:{sorted(kwargs.items())}"
+            return cache.fetch(source, self.fingerprint(table_name), lambda: self.get_table(table_name, new_name, *args, **kwargs))
+
         # Finder grundlæggende info
         table_info = self.info(table_name)
 
@@ -753,6 +1274,63 @@ class Database(DatabaseConnector):
 
         return table
 
+    def fingerprint(self, table_name: TableName) -> str | None:
+        """
+        Danner et fingeraftryk af en tabels indhold, så en cache kan afgøre, om tabellen er ændret.
+
+        Bruger ``CHECKSUM TABLE`` og, hvis storage-motoren ikke understøtter det,
+        tabellens ændringstidspunkt og antal rækker fra ``INFORMATION_SCHEMA.TABLES``.
+
+        :param table_name: Navnet på tabellen i databasen.
+            *Påkrævet*.
+        :type table_name: str
+
+        :return: Fingeraftrykket, eller `None`, hvis det ikke kunne dannes.
+        :rtype: str | None
+        """
+        checksum_query = f"CHECKSUM TABLE `{table_name}`"
+        self._preview(checksum_query)
+        if (result := self._execute(checksum_query, read=True, select=True)) and result[0].get("Checksum") is not None:
+            return f"checksum:{result[0]["Checksum"]}"
+        update_query = "SELECT UPDATE_TIME, TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = %(schema)s AND TABLE_NAME = %(table)s"
+        self._preview(update_query)
+        if (result := self._execute(update_query, {"schema": self.database, "table": table_name}, read=True, select=True)) and result[0].get("UPDATE_TIME") is not None:
+            return f"updated:{result[0]["UPDATE_TIME"]}:{result[0]["TABLE_ROWS"]}"
+        return None
+
+    def stream_table(self, table_name: TableName, new_name: TableName = '', *args, chunk_size: int = 10_000, storage: str = "rows", **kwargs) -> TableStream:
+        """
+        Som :meth:`get_table`, men dataene læses i bidder, når den returnerede TableStream gennemløbes.
+
+        Strømmen skal gennemløbes, mens forbindelsen stadig er åben.
+
+        :param table_name: Navnet på tabellen i databasen.
+            *Påkrævet*.
+        :type table_name: str
+        :param new_name: Et nyt navn til tabellen.
+            *Upåkrævet*. Standardværdi: `''`
+        :type new_name: str
+        :param chunk_size: Det største antal rækker i hver bid.
+            *Upåkrævet*. Standardværdi: `10_000`
+        :type chunk_size: int
+        :param storage: Lagringsformen for hver bid.
+            *Upåkrævet*. Standardværdi: `"rows"`
+        :type storage: str
+
+        :rtype: TableStream
+        """
+        # Finder grundlæggende info
+        table_info = self.info(table_name)
+
+        # Finder header
+        header = self.get_header(table_info)
+        # Finder primary, foreign og unique keys
+        keys = self.get_keys(table_name, table_info)
+        # Dataene læses først, når strømmen gennemløbes
+        chunks = self.read_chunks(table_name, *args, chunk_size=chunk_size, **kwargs)
+
+        return TableStream(new_name if new_name else table_name, header, keys, chunks, storage=storage)
+
     # UPDATE-operationer
     def update(self,
         table_name: TableName,
@@ -1,6 +1,15 @@
 import re
+import io
+import csv
+import json
 import typing
-from decimal import Decimal
+from pathlib import Path
+import operator
+from functools import partial
+from itertools import compress, repeat, islice
+from bisect import bisect_right
+from collections import Counter
+from decimal import Decimal, localcontext, MAX_PREC
 from datetime import date, datetime, time
 from copy import deepcopy
 
@@ -58,7 +67,79 @@ PY_TYPES = {
 }
 STANDARD_FIELD = {"datatype": 'text', "nullable": True, "default": None, "extra": ''}
 
+def _parse_bool(value: typing.Any) -> bool:
+    return bool(int(value))
+
+def _parse_date(value: str) -> date:
+    # Datoer i kildedataene har formatet dd/mm/åååå
+    day, month, year = value.split('/')
+    return date(int(year), int(month), int(day))
+
+# Funktioner, der omdanner en værdi til en bestemt Python-type,
+# når typen ikke blot kan kaldes med værdien
+PARSERS: dict[type, typing.Callable[[typing.Any], typing.Any]] = {
+    bool: _parse_bool,
+    date: _parse_date
+}
+# Tæller op, hver gang PARSERS ændres, så allerede kompilerede konverteringer dannes igen
+_parsers_version: int = 0
+
+def _format_parser(ptype: type, fmt: str) -> typing.Callable[[str], typing.Any]:
+    # Et format som tekststreng kan kun bruges til datoer og tidspunkter
+    if ptype == date:
+        return lambda value: datetime.strptime(value, fmt).date()
+    if ptype == datetime:
+        return lambda value: datetime.strptime(value, fmt)
+    if ptype == time:
+        return lambda value: datetime.strptime(value, fmt).time()
+    raise TypeError(f"Et format som tekststreng ('{fmt}') kan kun bruges til datoer og tidspunkter.")
+
+def register_parser(ptype: type, parser: typing.Callable[[typing.Any], typing.Any] | str) -> None:
+    """
+    Registrerer en funktion eller et format, der bruges til at omdanne værdier til en bestemt Python-type.
+
+    Gælder for alle kolonner med typen, medmindre kolonnen selv har en ``parser``.
+
+    :param ptype: Python-typen, som værdierne skal omdannes til, f.eks. `date`.
+        *Påkrævet*.
+    :type ptype: type
+    :param parser: En funktion, der tager en værdi og returnerer den omdannede værdi,
+        eller et format til ``datetime.strptime``, f.eks. `"%Y-%m-%d"`, for datoer og tidspunkter.
+        *Påkrævet*.
+    :type parser: Callable[[Any], Any] | str
+    """
+    global _parsers_version
+    PARSERS[ptype] = _format_parser(ptype, parser) if isinstance(parser, str) else parser
+    _parsers_version += 1
+# Måder, hvorpå en InterTable kan gemme sine data
+STORAGE_TYPES = ("rows", "columns", "tuples")
+# Antal rækker, der skrives ad gangen ved eksport (se InterTable.write_csv og write_ndjson)
+WRITE_BATCH_SIZE = 10_000
+JOIN_TYPES = ("inner", "left", "semi")
+AGGREGATES = ("sum", "count", "min", "max", "mean", "count_distinct")
+# Hvad der sker med rækker, hvis værdi ikke findes i opslaget ved @ (se InterTable.lookup)
+MISSING_TYPES = ("fail", "null", "default", "reject")
+# Andelen af rækker markeret som slettet, før de fjernes fra tabellen (se InterTable.remove_row)
+TOMBSTONE_RATIO = 0.25
+# Samme stavemåder som ORDER BY i Database._sort
+ASCENDING = ('a', "asc", "ascending")
+DESCENDING = ('d', "desc", "descending")
+
+def _json_default(value: typing.Any) -> typing.Any:
+    # Værdier, som json ikke selv kan kode
+    # Decimal gemmes som tekst, så ingen decimaler går tabt
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Værdien ({value}) af typen {type(value).__name__} kan ikke gemmes som JSON.")
+
 class Keys:
+    # Uden __dict__ fylder hvert objekt mindre
+    __slots__ = ("_primary", "_foreign", "_unique")
+
     def __init__(self,
         primary: str | list[str] = '',
         foreign: dict[str, tuple[str, str]] = {},
@@ -199,19 +280,27 @@ class Keys:
         return k
 
 class DataField:
+    # Uden __dict__ fylder hvert objekt mindre
+    __slots__ = ("_name", "_datatype", "_nullable", "_default", "_extra", "_ptype", "_parser", "_converter", "_converter_version")
+
     def __init__(self,
         name: str,
         datatype: str = '',
         nullable: bool = True,
         *,
         default: typing.Any = None,
-        extra: str = ''
+        extra: str = '',
+        parser: typing.Callable[[typing.Any], typing.Any] | str | None = None
     ) -> None:
         self._datatype: str = ''
         self._nullable: bool = True
         self._default: typing.Any = None
         self._extra: str = ''
         self._ptype: type
+        self._parser: typing.Callable[[typing.Any], typing.Any] | None = None
+        # Den kompilerede konvertering dannes først, når den skal bruges
+        self._converter: typing.Callable[[typing.Any], typing.Any] | None = None
+        self._converter_version: int = -1
 
         self.name = name
         self.datatype = datatype
@@ -220,6 +309,8 @@ class DataField:
             self.default = default
         if extra:
             self.extra = extra
+        if parser is not None:
+            self.parser = parser
 
     def __bool__(self) -> bool:
         return bool(self.name) and bool(self.datatype)
@@ -286,12 +377,99 @@ class DataField:
                 return False
         return True
 
+    def _scale(self) -> int:
+        # Antallet af decimaler i f.eks. decimal(10,2)
+        scale = re.search(r"\(\d+\s*,\s*(\d+)\)", self.datatype)
+        return int(scale.group(1)) if scale is not None else 0
+
+    def _compile(self) -> typing.Callable[[typing.Any], typing.Any]:
+        # Alle opslag foretages én gang her, så konverteringen af hver værdi kun er ét funktionskald
+        col_name = self.name
+        col_type = self._ptype
+        datatype = self.datatype
+        default = self.default
+        nullable = self.nullable
+        if self._parser is not None:
+            parse = self._parser
+        elif col_type == Decimal:
+            scale = self._scale()
+            exponent = Decimal(1).scaleb(-scale)
+            float_format = f".{scale}f"
+
+            def parse(value: typing.Any) -> Decimal:
+                # Kommatal afrundes allerede i formateringen, hvilket er hurtigere end Decimal(float)
+                # Sammenligningen udelukker uendelig og NaN, som skal fejle i quantize() i stedet
+                if type(value) is float and -1e308 < value < 1e308:
+                    return Decimal(format(value, float_format))
+                return Decimal(value).quantize(exponent)
+        else:
+            parse = PARSERS.get(col_type, col_type)
+
+        def missing() -> typing.Any:
+            # Tjekker om standardværdi skal indsættes
+            # TODO: Tjek også for auto-increment her
+            if default is not None:
+                return default
+            # Tjekker om kolonne er nullable
+            if not nullable:
+                raise ValueError(f"Ingen værdi angivet for kolonnen '{col_name}', som ikke er nullable.")
+            return None
+
+        def convert(value: typing.Any) -> typing.Any:
+            # Tjekker om værdi mangler
+            if value is None:
+                return missing()
+            # Tjekker om datatypen matcher med definitionen i headeren
+            if type(value) is col_type:
+                return value
+            try:
+                return parse(value)
+            except Exception:
+                if isinstance(value, str) and value.lower() == "null":
+                    return missing()
+                raise TypeError(f"Værdien ({value}) passer ikke til datatypen for kolonnen '{col_name}' ({datatype}).") from None
+
+        return convert
+
+    @property
+    def converter(self) -> typing.Callable[[typing.Any], typing.Any]:
+        """
+        En funktion, der omdanner en værdi til kolonnens Python-type.
+
+        Funktionen kompileres én gang og dannes først igen,
+        når kolonnens definition eller de registrerede formater ændres.
+
+        :rtype: Callable[[Any], Any]
+        """
+        if self._converter is None or self._converter_version != _parsers_version:
+            self._converter = self._compile()
+            self._converter_version = _parsers_version
+        return self._converter
+
+    @property
+    def parser(self):
+        return self._parser
+
+    @parser.setter
+    def parser(self, parser: typing.Callable[[typing.Any], typing.Any] | str):
+        try:
+            self._parser = _format_parser(self._ptype, parser) if isinstance(parser, str) else parser
+        except TypeError as err:
+            print(f"Ugyldigt format for kolonnen '{self.name}'. {err}")
+        self._converter = None
+
+    @parser.deleter
+    def parser(self):
+        self._parser = None
+        self._converter = None
+
     @property
     def name(self):
         return self._name
 
     @name.setter
     def name(self, input_name: str):
+        self._converter = None
         if self._is_valid_string(input_name):
             self._name = input_name
         else:
@@ -306,6 +484,7 @@ class DataField:
 
     @datatype.setter
     def datatype(self, input_datatype: str):
+        self._converter = None
         if self._is_valid_datatype(input_datatype):
             self._datatype = input_datatype
         else:
@@ -317,6 +496,7 @@ class DataField:
 
     @nullable.setter
     def nullable(self, is_nullable: bool | typing.Any):
+        self._converter = None
         if is_nullable:
             self._nullable = True
         if not is_nullable:
@@ -324,6 +504,7 @@ class DataField:
 
     @nullable.deleter
     def nullable(self):
+        self._converter = None
         self._nullable = True
 
     @property
@@ -336,12 +517,14 @@ class DataField:
             print(f"En standardværdi ({input_default}) kan ikke defineres, da kolonnen '{self.name}' er indstillet som AUTO_INCREMENT.")
             return
         if self._is_valid_default(input_default):
+            self._converter = None
             self._default = self._ptype(input_default)
         else:
             print(f"Den angivne standardværdi ({input_default}) passer ikke til den oplyste datatype for kolonnen '{self.name}' ({self.datatype}).")
 
     @default.deleter
     def default(self):
+        self._converter = None
         self._default = None
 
     @property
@@ -358,28 +541,114 @@ class DataField:
 
     @extra.deleter
     def extra(self):
-        self.extra = ''
+        self._extra = ''
 
 class Header(dict[str, DataField]):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return f"Header({super().__repr__()})"
 
     def __str__(self) -> str:
         return f"{{{", ".join([f"'{k}': {v}" for k, v in self.items()])}}}"
 
+    def coercer(self) -> typing.Callable[[DataEntry], None]:
+        """
+        Danner en funktion, der omdanner alle værdier i en række til de datatyper, som headeren definerer.
+
+        Hver kolonnes konvertering slås op én gang, så rækken kun kræver ét funktionskald pr. værdi.
+
+        :return: En funktion, der ændrer en række på stedet.
+        :rtype: Callable[[DataEntry], None]
+        """
+        pipeline = tuple((field.name, field.converter) for field in self.values())
+
+        def coerce(entry: DataEntry) -> None:
+            get = entry.get
+            for name, convert in pipeline:
+                entry[name] = convert(get(name))
+
+        return coerce
+
 class InterTable:
     def __init__(self,
         name: TableName,
         header: Header,
         keys: Keys = Keys(),
-        data: DataList = []
+        data: DataList = [],
+        *,
+        storage: str = "rows",
+        workers: int = 1
     ):
         self.name: TableName = name
         self.header: Header = header
         self.keys: Keys = keys
-        self.data: DataList = []
-        for entry in data:
-            self.__iadd__(entry)
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Ukendt lagringsform '{storage}'. Vælg en af {STORAGE_TYPES}.")
+        if storage != "rows":
+            from storage import new_store
+            self.data: DataList = new_store(storage, header)
+        else:
+            self.data: DataList = []
+        # Hash-indekser over nøglekolonner, så dubletter kan findes i O(1)
+        # Nøglen er en tuple af kolonnenavne, værdien er en dict fra nøgleværdi til rækkens indeks
+        self._indexes: dict[tuple[ColumnName, ...], dict[typing.Any, int]] = {}
+        # Holder styr på, hvad der er ændret siden sidste refresh():
+        # kolonnernes definition ved sidste validering, kolonner med nye værdier
+        # og rækker, der er udleveret og derfor kan være ændret udefra
+        self._fields: dict[ColumnName, tuple] = {}
+        self._dirty_columns: set[ColumnName] = set()
+        self._dirty_rows: set[int] = set()
+        # Rækker og indekser, der deles med en anden tabel (se __add__),
+        # og som skal kopieres, før de ændres
+        self._shared_rows: bool = False
+        self._shared_indexes: bool = False
+        # Rækker, der er frasorteret, fordi deres værdi ikke fandtes i et opslag (se lookup())
+        self.rejected: DataList = []
+        # Antal processer, som store mængder rækker valideres og castes i (se parallel.py)
+        self.workers: int = workers
+        if data:
+            self.__iadd__(data if isinstance(data, list) else list(data))
+        self._fields = {column: self._field_signature(self.header[column]) for column in self.header}
+
+    @classmethod
+    def from_columns(cls,
+        name: TableName,
+        header: Header,
+        keys: Keys = Keys(),
+        columns: dict[ColumnName, typing.Sequence[typing.Any]] = {},
+        *,
+        storage: str = "rows"
+    ) -> typing.Self:
+        """
+        Opretter en tabel direkte ud fra kolonnernes værdier uden at validere dem.
+
+        Bruges til data, der allerede er valideret, f.eks. fra et snapshot (se ``snapshot.py``).
+        Værdierne valideres først, hvis kolonnerne ændres, eller ved ``refresh(full=True)``.
+
+        :param name: Navnet på tabellen.
+            *Påkrævet*.
+        :type name: str
+        :param header: Tabellens header.
+            *Påkrævet*.
+        :type header: Header
+        :param keys: Tabellens nøgler.
+            *Upåkrævet*. Standardværdi: `Keys()`
+        :type keys: Keys
+        :param columns: En dict fra kolonnenavn til kolonnens værdier med én kolonne pr. kolonne i headeren.
+            *Upåkrævet*. Standardværdi: `{}`
+        :type columns: dict[str, Sequence[Any]]
+        :param storage: Tabellens lagringsform.
+            *Upåkrævet*. Standardværdi: `"rows"`
+        :type storage: str
+
+        :rtype: InterTable
+        """
+        if set(columns) != set(header):
+            raise ValueError("Kolonnerne skal være de samme som i headeren.")
+        table = cls(name, header, keys, storage=storage)
+        table._fill({column: columns[column] for column in header})
+        return table
 
     def __repr__(self) -> str:
         return f"InterTable(name={repr(self.name)}, header={repr(self.header)}, keys={repr(self.keys)}, data={repr(self.data)})"
@@ -398,8 +667,22 @@ class InterTable:
         self.refresh()
 
     def __len__(self) -> int:
-        # Længden af objektet findes altid ud fra DataList
-        return len(self.data)
+        # Længden af objektet findes altid ud fra DataList uden rækkerne markeret som slettet,
+        # så de ikke skal fjernes, blot for at tabellen kan tælles
+        return len(self._data) - len(self._tombstones)
+
+    @property
+    def data(self) -> DataList:
+        # Rækker markeret som slettet fjernes, før dataene bruges med indeks
+        if self._tombstones:
+            self._compact()
+        return self._data
+
+    @data.setter
+    def data(self, data: DataList) -> None:
+        self._data = data
+        # Rækker i DataList, der er markeret som slettet, men endnu ikke fjernet (se remove_row())
+        self._tombstones: set[int] = set()
 
     @property
     def length(self) -> int:
@@ -421,8 +704,63 @@ class InterTable:
         return (self.width, self.length)
 
     def __iter__(self) -> typing.Iterator:
-        # Der itereres altid over DataList
-        return iter(self.data)
+        # Der itereres altid over DataList; rækker markeret som slettet springes over i stedet for at blive fjernet
+        data, tombstones = self._data, self._tombstones
+        if not tombstones:
+            return iter(data)
+        return (entry for row, entry in enumerate(data) if row not in tombstones)
+
+    @property
+    def storage(self) -> str:
+        # Lagringsformen findes ud fra typen af DataList
+        return "rows" if isinstance(self._data, list) else self._data.storage
+
+    def convert(self, storage: str) -> None:
+        """
+        Skifter tabellens lagringsform.
+
+        :param storage: Den nye lagringsform, enten `"rows"` (en liste af dicts),
+            `"columns"` (en kolonne pr. datafelt, hvor rækker først dannes ved opslag)
+            eller `"tuples"` (en tuple pr. række, hvor kolonnenavnene kun gemmes én gang).
+            *Påkrævet*.
+        :type storage: str
+        """
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Ukendt lagringsform '{storage}'. Vælg en af {STORAGE_TYPES}.")
+        if storage == self.storage:
+            return
+        if storage != "rows":
+            from storage import new_store
+            self.data = new_store(storage, self.header, self.data)
+        else:
+            self.data = [dict(entry) for entry in self.data]
+
+    def _column(self, column: ColumnName) -> typing.Sequence[typing.Any]:
+        # Alle værdier i en kolonne; i kolonneformat uden at danne rækker
+        if isinstance(self.data, list):
+            return [entry.get(column) for entry in self.data]
+        return self.data.column(column)
+
+    def _set_column(self, column: DataField, values: typing.Iterable[typing.Any], *, first: bool = False) -> None:
+        # Sætter alle værdier i en kolonne på én gang
+        # Værdierne er ikke valideret endnu, så kolonnen castes ved næste refresh()
+        self._dirty_columns.add(column.name)
+        self._drop_indexes(column.name)
+        if isinstance(self.data, list):
+            self._own_rows()
+            if first:
+                self.data = [{column.name: value, **entry} for value, entry in zip(values, self.data)]
+            else:
+                for value, entry in zip(values, self.data):
+                    entry[column.name] = value
+        else:
+            self.data.set_column(column.name, values, column, first=first)
+
+    def _tuples(self, columns: typing.Sequence[ColumnName]) -> typing.Iterator[tuple[typing.Any, ...]]:
+        # Rækkerne som tuples med værdierne i de angivne kolonner
+        if isinstance(self.data, list):
+            return (tuple(entry.get(column) for column in columns) for entry in self.data)
+        return zip(*(self.data.column(column) for column in columns))
 
     def __getitem__(self, loc: ColumnName | int | slice) -> DataEntry | list[DataEntry] | tuple[typing.Any]:
         # Tekststrenge indekserer kolonnenavne
@@ -431,15 +769,20 @@ class InterTable:
                 raise KeyError(f"Kolonnen '{loc}' findes ikke i tabellen '{self.name}'.")
             primary = self.keys.primary
             if primary and isinstance(primary, str):
-                return {val[primary]: val[loc] for val in self.data}
-            return tuple(val[loc] for val in self.data)
+                return dict(zip(self._column(primary), self._column(loc)))
+            return tuple(self._column(loc))
         # Heltalt indekserer en enkelt række
         elif isinstance(loc, int):
             if loc >= len(self.data) or loc < -len(self.data):
                 raise IndexError(f"Rækkeindekset (i={loc}) er uden for rækkevidde.")
+            # Rækken kan ændres af modtageren, så den valideres igen ved næste refresh()
+            self._own_rows()
+            self._dirty_rows.add(loc % len(self.data))
             return self.data[loc]
         # Slices indekserer flere rækker
         elif isinstance(loc, slice):
+            self._own_rows()
+            self._dirty_rows.update(range(len(self.data))[loc])
             return self.data[loc]
         else:
             raise LookupError("Denne værdi kan ikke bruges til indeksering. Brug kolonnenavne for kolonner og heltal (eller slices) for rækker.")
@@ -457,44 +800,682 @@ class InterTable:
             self.remove_row(loc)
 
     def __add__(self, other: DataEntry | DataList | typing.Self) -> typing.Self:
-        if isinstance(other, dict):
-            if self._validate_entry(other, new=True):
-                copy = deepcopy(self)
-                copy.data.append(other)
-                return copy
-        elif isinstance(other, (list, type(self))):
-            for entry in other:
-                if not self._validate_entry(entry, new=True):
-                    break
-            else:
-                copy = deepcopy(self)
-                copy.data.extend(other)
-                return copy
+        if isinstance(other, (dict, list, type(self))):
+            copy = self._share()
+            return copy.__iadd__(other)
+
+    def _share(self) -> typing.Self:
+        # Danner en ny tabel, der deler rækker og indekser med denne tabel,
+        # indtil en af de to tabeller ændrer dem (copy-on-write)
+        copy = object.__new__(type(self))
+        copy.name = self.name
+        # Header og Keys er små, så de kopieres med det samme
+        copy.header = deepcopy(self.header)
+        copy.keys = deepcopy(self.keys)
+        # Kun listen af rækker kopieres; selve rækkerne deles
+        copy.data = list(self.data) if isinstance(self.data, list) else self.data.copy()
+        copy._indexes = dict(self._indexes)
+        copy._fields = {
+            column: (copy.header[column], *signature[1:])
+            for column, signature in self._fields.items() if column in copy.header
+        }
+        copy._dirty_columns = set(self._dirty_columns)
+        copy._dirty_rows = set(self._dirty_rows)
+        copy.rejected = list(self.rejected)
+        copy.workers = self.workers
+        # Begge tabeller skal kopiere de delte dele, før de ændrer dem
+        self._shared_rows = copy._shared_rows = isinstance(self.data, list)
+        self._shared_indexes = copy._shared_indexes = True
+        return copy
+
+    def _own_rows(self) -> None:
+        # Kopierer delte rækker, inden de ændres
+        if self._shared_rows:
+            self.data = [dict(entry) for entry in self.data]
+            self._shared_rows = False
+
+    def _own_indexes(self) -> None:
+        # Kopierer delte indekser, inden de ændres
+        if self._shared_indexes:
+            self._indexes = {columns: dict(index) for columns, index in self._indexes.items()}
+            self._shared_indexes = False
 
     def __iadd__(self, other: DataEntry | DataList | typing.Self) -> typing.Self:
+        self._own_indexes()
         if isinstance(other, dict):
             if self._validate_entry(other, new=True):
+                self._index_entry(other, len(self.data))
                 self.data.append(other)
                 return self
         elif isinstance(other, (list, type(self))):
-            for entry in other:
-                if not self._validate_entry(entry, new=True):
-                    break
-            else:
-                self.data.extend(other)
+            if isinstance(other, type(self)):
+                # Rækkerne kopieres, så de to tabeller ikke deler (og validerer) de samme dicts
+                other = [dict(entry) for entry in other]
+            start = len(self.data)
+            indexed = []
+            # Store mængder rækker kan valideres og castes i flere processer på én gang,
+            # mens nøglerne stadig tjekkes samlet herunder
+            from parallel import available, validate_rows
+            validated = available(self.workers, len(other))
+            if validated:
+                validate_rows(self, other, self.workers)
+            # Headeren kompileres og nøgleindekserne findes én gang for hele listen
+            coerce = self.header.coercer()
+            key_indexes = self._key_indexes()
+            try:
+                for entry in other:
+                    if not validated and not self._validate_entry(entry, new=True, coerce=coerce):
+                        break
+                    # Rækkerne indekseres løbende, så dubletter internt i listen også opdages
+                    self._index_entry(entry, start + len(indexed), key_indexes)
+                    indexed.append(entry)
+            except Exception:
+                # Indekserne rulles tilbage, så de passer med DataList
+                self._unindex_entries(indexed, start)
+                raise
+            if len(indexed) == len(other):
+                self.data.extend(indexed)
                 return self
+            self._unindex_entries(indexed, start)
 
     def __lshift__(self, other: DataField) -> typing.Self:
         self.auto_id(other, start=1)
         return self
 
-    def __matmul__(self, other: tuple[DataField, str, dict[typing.Any, typing.Any]]) -> typing.Self:
-        column, reference, mapping = other
+    def __matmul__(self, other: tuple[DataField, str, dict[typing.Any, typing.Any] | typing.Self, *tuple[ColumnName, ...]]) -> typing.Self:
+        # x @ (kolonne, reference, dict) eller x @ (kolonne, reference, tabel, nøglekolonne[, værdikolonne])
+        column, reference, source, *columns = other
+        self.lookup(column, reference, source, *columns)
+        return self
+
+    def lookup(self,
+        column: DataField,
+        reference: ColumnName,
+        source: dict[typing.Any, typing.Any] | typing.Self,
+        key: ColumnName | None = None,
+        value: ColumnName | None = None,
+        *,
+        missing: str = "fail"
+    ) -> None:
+        """
+        Indsætter en ny kolonne, hvis værdier slås op ud fra værdierne i en anden kolonne.
+
+        Opslaget kan være en dict eller en anden tabel, f.eks. en dimensionstabel.
+        For en tabel bruges dens indeks over nøglekolonnen, så der ikke dannes en ny dict,
+        og indekset genbruges ved senere opslag i samme tabel.
+        Alle værdier slås op, før tabellen ændres, så tabellen er uændret, hvis opslaget fejler.
+
+        :param column: Definitionen af den nye kolonne.
+            *Påkrævet*.
+        :type column: DataField
+        :param reference: Kolonnen i denne tabel, hvis værdier slås op.
+            *Påkrævet*.
+        :type reference: str
+        :param source: Opslaget, enten en dict eller en tabel.
+            *Påkrævet*.
+        :type source: dict[Any, Any] | InterTable
+        :param key: Kolonnen i tabellen, som værdierne slås op i. Skal indeholde unikke værdier.
+            Hvis `None`, bruges tabellens primary key.
+            *Upåkrævet*. Standardværdi: `None`
+        :type key: str | None
+        :param value: Kolonnen i tabellen, hvis værdier indsættes. Hvis `None`, bruges den nye kolonnes navn.
+            *Upåkrævet*. Standardværdi: `None`
+        :type value: str | None
+        :param missing: Hvad der sker med rækker, hvis værdi ikke findes i opslaget.
+            `"fail"` udløser en KeyError, `"null"` indsætter NULL, `"default"` indsætter kolonnens standardværdi,
+            og `"reject"` fjerner rækkerne fra tabellen og gemmer dem i ``rejected``.
+            *Upåkrævet*. Standardværdi: `"fail"`
+        :type missing: str
+        """
+        if missing not in MISSING_TYPES:
+            raise ValueError(f"Ukendt håndtering af manglende værdier '{missing}'. Vælg en af {MISSING_TYPES}.")
+        if reference not in self.header:
+            raise KeyError(f"Kolonnen '{reference}' findes ikke i tabellen '{self.name}'.")
+        references = self._column(reference)
+        # Markerer værdier, der ikke findes i opslaget, så de kan skelnes fra opslag, der giver None
+        unmatched_value = object()
+        from storage import DictColumn
+        # En kodet kolonne slås op én gang pr. forskellig værdi i stedet for én gang pr. række
+        distinct = references.values if isinstance(references, DictColumn) else references
+        if isinstance(source, InterTable):
+            if key is None:
+                key = source.keys.primary
+                if not isinstance(key, str):
+                    raise ValueError(f"Angiv nøglekolonnen i tabellen '{source.name}', da den ikke har en primary key på én kolonne.")
+            value = value if value is not None else column.name
+            for name in (key, value):
+                if name not in source.header:
+                    raise KeyError(f"Kolonnen '{name}' findes ikke i tabellen '{source.name}'.")
+            index = source.index(key)
+            values = source._column(value)
+            mapped = [values[row] if row is not None else unmatched_value for row in map(index.get, distinct)]
+        else:
+            mapped = list(map(source.get, distinct, repeat(unmatched_value)))
+        if isinstance(references, DictColumn):
+            mapped = list(map(mapped.__getitem__, references.codes))
+
+        unmatched = [row for row, mapped_value in enumerate(mapped) if mapped_value is unmatched_value]
+        if unmatched:
+            if missing == "fail":
+                raise KeyError(f"Værdien ({references[unmatched[0]]}) i kolonnen '{reference}' findes ikke i opslaget. I alt {len(unmatched)} række(r) uden match.")
+            elif missing == "null":
+                if not column.nullable:
+                    raise ValueError(f"Rækker uden match kan ikke få NULL, da kolonnen '{column.name}' ikke er nullable.")
+                fill = None
+            elif missing == "default":
+                if column.default is None:
+                    raise ValueError(f"Rækker uden match kan ikke få en standardværdi, da kolonnen '{column.name}' ikke har nogen.")
+                fill = column.default
+            if missing == "reject":
+                # Rækkerne gemmes uden den nye kolonne og fjernes derefter fra tabellen
+                self.rejected.extend(dict(self.data[row]) for row in unmatched)
+                rejected = set(unmatched)
+                mapped = [mapped_value for row, mapped_value in enumerate(mapped) if row not in rejected]
+                self.remove_row(rejected)
+            else:
+                for row in unmatched:
+                    mapped[row] = fill
+
         self.header[column.name] = column
-        for entry in self.data:
-            entry[column.name] = mapping[entry[reference]]
+        self._set_column(column, mapped)
+
+    def __and__(self, other: typing.Self | tuple[typing.Self, ColumnName | list[ColumnName]]) -> typing.Self:
+        # x & y er en inner join; uden angivne kolonner joines der på y's primary key
+        if isinstance(other, tuple):
+            other, on = other
+        else:
+            on = self._join_columns(other)
+        return self.join(other, on)
+
+    def join(self,
+        other: typing.Self,
+        on: ColumnName | list[ColumnName],
+        how: str = "inner",
+        *,
+        right_on: ColumnName | list[ColumnName] | None = None
+    ) -> typing.Self:
+        """
+        Joiner denne tabel med en anden tabel og returnerer resultatet som en ny tabel.
+
+        Der bygges en hashtabel over den mindste af de to tabeller, mens den anden gennemløbes én gang.
+        Har den anden tabel et indeks over kolonnerne (f.eks. fordi de er dens primary key),
+        bruges indekset i stedet. Rækkefølgen af denne tabels rækker bevares.
+        NULL matcher aldrig (ligesom i SQL).
+
+        Den anden tabels join-kolonner kommer ikke med i resultatet.
+        Har en af dens øvrige kolonner samme navn som en kolonne i denne tabel,
+        får den tabellens navn som præfiks, f.eks. ``stores_name``.
+
+        :param other: Tabellen, der skal joines med.
+            *Påkrævet*.
+        :type other: InterTable
+        :param on: Kolonnen eller kolonnerne i denne tabel, der joines på.
+            *Påkrævet*.
+        :type on: str | list[str]
+        :param how: Typen af join. `"inner"` beholder kun rækker med et match,
+            `"left"` beholder alle rækker i denne tabel (med NULL, hvor der ikke er et match),
+            og `"semi"` beholder rækkerne i denne tabel, der har et match, uden at tilføje kolonner.
+            *Upåkrævet*. Standardværdi: `"inner"`
+        :type how: str
+        :param right_on: Kolonnen eller kolonnerne i den anden tabel, hvis de hedder noget andet.
+            *Upåkrævet*. Standardværdi: `None`
+        :type right_on: str | list[str] | None
+
+        :return: En ny tabel med resultatet af joinet.
+        :rtype: InterTable
+        """
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Ukendt join-type '{how}'. Vælg en af {JOIN_TYPES}.")
+        left_columns = self._key_columns(on)
+        right_columns = self._key_columns(right_on) if right_on else left_columns
+        if not left_columns or len(left_columns) != len(right_columns):
+            raise ValueError("Der skal joines på lige mange kolonner fra begge tabeller.")
+        for table, columns in ((self, left_columns), (other, right_columns)):
+            for column in columns:
+                if column not in table.header:
+                    raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{table.name}'.")
+
+        matches = self._match(other, left_columns, right_columns)
+        if how == "semi":
+            left_rows = [row for row, rows in enumerate(matches) if rows]
+            right_rows = None
+        else:
+            left_rows, right_rows = [], []
+            for row, rows in enumerate(matches):
+                if rows:
+                    left_rows.extend([row] * len(rows))
+                    right_rows.extend(rows)
+                elif how == "left":
+                    left_rows.append(row)
+                    right_rows.append(None)
+
+        header = deepcopy(self.header)
+        columns = {}
+        for column in self.header:
+            values = self._column(column)
+            columns[column] = [values[row] for row in left_rows]
+        if right_rows is not None:
+            for column in other.header:
+                if column in right_columns:
+                    continue
+                field = deepcopy(other.header[column])
+                if column in header:
+                    field.name = f"{other.name}_{column}"
+                # Uden et match er værdierne fra den anden tabel NULL
+                if how == "left":
+                    field.nullable = True
+                values = other._column(column)
+                header[field.name] = field
+                columns[field.name] = [values[row] if row is not None else None for row in right_rows]
+
+        # Matcher en række flere rækker, gentages den, og tabellens primary og unique key gælder ikke længere
+        if how == "semi" or all(len(rows) <= 1 for rows in matches):
+            keys = deepcopy(self.keys)
+        else:
+            keys = Keys(foreign=deepcopy(self.keys.foreign or {}))
+        table = type(self)(self.name, header, keys, storage=self.storage)
+        table._fill(columns)
+        return table
+
+    def _join_columns(self, other: typing.Self) -> tuple[ColumnName, ...]:
+        # Den anden tabels primary key, hvis den findes i denne tabel, og ellers de fælles kolonner
+        primary = self._key_columns(other.keys.primary)
+        if primary and all(column in self.header for column in primary):
+            return primary
+        common = tuple(column for column in other.header if column in self.header)
+        if not common:
+            raise ValueError(f"Tabellerne '{self.name}' og '{other.name}' har ingen fælles kolonner at joine på.")
+        return common
+
+    def _join_keys(self, columns: tuple[ColumnName, ...]) -> typing.Sequence[typing.Any]:
+        # Nøgleværdien for hver række; None, hvis en af værdierne er NULL
+        if len(columns) == 1:
+            return self._column(columns[0])
+        return [None if None in key else key for key in self._tuples(columns)]
+
+    def _key_index(self, columns: tuple[ColumnName, ...]) -> dict[typing.Any, int] | None:
+        # Et eksisterende indeks eller et indeks over en af tabellens nøgler (som gemmes til senere)
+        if columns in self._indexes or columns in self._unique_columns():
+            return self.index(*columns)
+        return None
+
+    def _hash(self, columns: tuple[ColumnName, ...]) -> dict[typing.Any, list[int]]:
+        # Hashtabel fra nøgleværdi til alle rækker med den værdi
+        buckets = {}
+        for row, key in enumerate(self._join_keys(columns)):
+            if key is not None:
+                buckets.setdefault(key, []).append(row)
+        return buckets
+
+    def _match(self, other: typing.Self, left_columns: tuple[ColumnName, ...], right_columns: tuple[ColumnName, ...]) -> list[list[int]]:
+        # For hver række i denne tabel: indekserne af de matchende rækker i den anden tabel
+        left_keys = self._join_keys(left_columns)
+        if (index := other._key_index(right_columns)) is not None:
+            return [[row] if (row := index.get(key)) is not None else [] for key in left_keys]
+        if len(other) <= len(self):
+            buckets = other._hash(right_columns)
+            return [buckets.get(key, []) for key in left_keys]
+        # Denne tabel er mindst, så hashtabellen bygges over den, og den anden tabel gennemløbes
+        matches = [[] for key in left_keys]
+        index = self._key_index(left_columns)
+        buckets = self._hash(left_columns) if index is None else {key: [row] for key, row in index.items()}
+        for right_row, key in enumerate(other._join_keys(right_columns)):
+            for left_row in buckets.get(key, ()):
+                matches[left_row].append(right_row)
+        return matches
+
+    def __or__(self, other: dict[str, tuple]) -> "TableView":
+        # x | {"eq": ("store_id", 1)} svarer til x.where(eq=("store_id", 1))
+        if isinstance(other, dict):
+            return self.where(**other)
+
+    def where(self, **kwargs) -> "TableView":
+        """
+        Finder de rækker, der opfylder alle betingelserne, og returnerer dem som en :class:`TableView`.
+
+        Betingelserne angives som i :meth:`Database.read`, hvor nøgleordet bestemmes ud fra starten af navnet,
+        så samme type betingelse kan bruges flere gange (f.eks. ``gt1=...`` og ``gt2=...``):
+        ``eq=(kolonne, værdi)``, ``lt``, ``gt``, ``le`` og ``ge`` på samme måde,
+        ``betw=(kolonne, lav, høj)``, ``in_=(kolonne, [værdier])`` og ``like=(kolonne, mønster)``,
+        hvor ``%`` og ``_`` bruges som i SQL.
+
+        Hver betingelse tjekkes kolonnevis på de rækker, der er tilbage efter de foregående.
+        ``eq`` og ``in`` slås op i et indeks, hvis kolonnen har et (f.eks. fordi den er en nøgle).
+        NULL opfylder aldrig en betingelse (ligesom i SQL).
+
+        :return: Et udsnit af tabellen med de rækker, der opfylder betingelserne.
+        :rtype: TableView
+        """
+        return TableView(self, self._filter(range(len(self.data)), kwargs))
+
+    def _filter(self, rows: typing.Sequence[int], predicates: dict[str, tuple]) -> list[int]:
+        from storage import DictColumn
+        conditions = [self._condition(key, value) for key, value in predicates.items()]
+        # Betingelser, der kan slås op i et indeks, tjekkes først, så de øvrige skal tjekke færre rækker
+        conditions.sort(key=lambda condition: condition[2] is None)
+        for column, test, lookup in conditions:
+            # Indekset kan kun bruges, så længe ingen rækker er frasorteret
+            index = self._key_index((column,)) if lookup is not None and isinstance(rows, range) else None
+            if index is not None:
+                rows = sorted({index[value] for value in lookup if value in index})
+                continue
+            if isinstance(rows, range):
+                values = self._column(column)
+            elif isinstance(self.data, list):
+                values = [self.data[row].get(column) for row in rows]
+            else:
+                values = self.data.column(column)
+                if not isinstance(values, DictColumn):
+                    values = [values[row] for row in rows]
+            if isinstance(values, DictColumn):
+                # Betingelsen tjekkes én gang pr. forskellig værdi i stedet for én gang pr. række
+                matches = [value is not None and test(value) for value in values.values]
+                codes = values.codes if isinstance(rows, range) else map(values.codes.__getitem__, rows)
+                rows = list(compress(rows, map(matches.__getitem__, codes)))
+                continue
+            if self.header[column].nullable:
+                rows = [row for row, value in zip(rows, values) if value is not None and test(value)]
+            else:
+                rows = list(compress(rows, map(test, values)))
+        return list(rows)
+
+    def _condition(self, key: str, value: tuple) -> tuple[ColumnName, typing.Callable[[typing.Any], bool], typing.Iterable[typing.Any] | None]:
+        # Omsætter en betingelse til kolonnen, en test af en enkelt værdi
+        # og de værdier, der kan slås op i et indeks (eller None)
+        column = value[0]
+        if column not in self.header:
+            raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{self.name}'.")
+        # Værdierne castes til kolonnens type, så f.eks. datoer kan angives som tekst
+        convert = self.header[column].converter
+        cast = lambda x: convert(x) if x is not None else None
+        name = key.lower()
+        # Testene er vendt om, så værdien i kolonnen kommer til sidst (f.eks. v < x == x > v)
+        if name.startswith(("like", "lk")):
+            pattern = "".join(".*" if char == '%' else '.' if char == '_' else re.escape(char) for char in value[1])
+            match = re.compile(pattern, re.IGNORECASE | re.DOTALL).fullmatch
+            return column, lambda v: match(str(v)) is not None, None
+        elif name.startswith("eq"):
+            x = cast(value[1])
+            return column, partial(operator.eq, x), (x,)
+        elif name.startswith(("betw", "btw")):
+            low, high = cast(value[1]), cast(value[2])
+            return column, lambda v: low <= v <= high, None
+        elif name.startswith("lt"):
+            return column, partial(operator.gt, cast(value[1])), None
+        elif name.startswith("gt"):
+            return column, partial(operator.lt, cast(value[1])), None
+        elif name.startswith("le"):
+            return column, partial(operator.ge, cast(value[1])), None
+        elif name.startswith("ge"):
+            return column, partial(operator.le, cast(value[1])), None
+        elif name.startswith("in"):
+            values = [cast(x) for x in value[1]]
+            try:
+                members = set(values)
+            except TypeError:
+                members = values
+            return column, members.__contains__, values
+        raise ValueError(f"Ukendt betingelse '{key}'. Brug en af eq, lt, gt, le, ge, betw, in eller like.")
+
+    def group_by(self, *columns: ColumnName, **aggregates: tuple[str, ColumnName] | tuple[str]) -> typing.Self:
+        """
+        Grupperer tabellens rækker efter en eller flere kolonner og beregner aggregater for hver gruppe.
+
+        Aggregaterne angives som ``navn=(funktion, kolonne)``, hvor funktionen er en af
+        `"sum"`, `"count"`, `"min"`, `"max"`, `"mean"` og `"count_distinct"`, f.eks.
+        ``orders.group_by("store_id", antal=("count",), kunder=("count_distinct", "customer_id"))``.
+        ``("count",)`` tæller rækker, mens de øvrige springer NULL over (ligesom i SQL).
+
+        Grupperne findes i ét gennemløb af nøglekolonnerne, hvorefter hvert aggregat
+        beregnes kolonnevis. Decimal-kolonner summeres eksakt uden afrunding undervejs,
+        og gennemsnittet får 4 ekstra decimaler (ligesom AVG() i MySQL).
+        Uden kolonner at gruppere efter beregnes aggregaterne for hele tabellen.
+
+        :param columns: Kolonnen eller kolonnerne, der grupperes efter.
+            *Upåkrævet*.
+        :type columns: str
+        :param aggregates: Aggregaterne, der skal beregnes, med navnet på den nye kolonne som nøgleord.
+            *Upåkrævet*.
+        :type aggregates: tuple[str, str]
+
+        :return: En ny tabel med én række pr. gruppe.
+        :rtype: InterTable
+        """
+        for column in columns:
+            if column not in self.header:
+                raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{self.name}'.")
+
+        # Hver gruppe får et løbenummer, som rækkerne derefter henvises til
+        if not columns:
+            groups = {(): 0}
+            group_ids = [0] * len(self.data)
+        else:
+            from storage import DictColumn
+            groups = {}
+            key_columns = [self._column(column) for column in columns]
+            # Kodede kolonner grupperes efter deres koder, som afkodes igen for hver gruppe til sidst
+            keys = [column.codes if isinstance(column, DictColumn) else column for column in key_columns]
+            keys = keys[0] if len(columns) == 1 else zip(*keys)
+            group_ids = [groups.setdefault(key, len(groups)) for key in keys]
+
+        header = Header({column: deepcopy(self.header[column]) for column in columns})
+        values = {}
+        if len(columns) == 1:
+            values[columns[0]] = list(groups)
+        else:
+            for position, column in enumerate(columns):
+                values[column] = [key[position] for key in groups]
+        for column, source in zip(columns, key_columns if columns else ()):
+            if isinstance(source, DictColumn):
+                values[column] = list(map(source.values.__getitem__, values[column]))
+        # Nøglekolonnerne må ikke længere autogenereres i den nye tabel
+        for field in header.values():
+            del field.extra
+
+        for name, (function, *source) in aggregates.items():
+            field, result = self._aggregate(name, function, source[0] if source else None, group_ids, len(groups))
+            header[name] = field
+            values[name] = result
+
+        keys = Keys(primary=columns[0] if len(columns) == 1 else list(columns)) if columns else Keys()
+        table = type(self)(self.name, header, keys, storage=self.storage)
+        table._fill(values)
+        return table
+
+    def _aggregate(self, name: ColumnName, function: str, column: ColumnName | None, group_ids: list[int], count: int) -> tuple[DataField, list[typing.Any]]:
+        # Beregner ét aggregat for alle grupper og finder datatypen for resultatet
+        if function not in AGGREGATES:
+            raise ValueError(f"Ukendt aggregat '{function}'. Vælg en af {AGGREGATES}.")
+        if column is None or column == '*':
+            if function != "count":
+                raise ValueError(f"Aggregatet '{function}' kræver en kolonne.")
+            counts = Counter(group_ids)
+            return DataField(name, "bigint unsigned", False), [counts[group] for group in range(count)]
+        if column not in self.header:
+            raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{self.name}'.")
+
+        field = self.header[column]
+        values = self._column(column)
+        # NULL springes over; i kolonner, der ikke er nullable, findes der ingen
+        pairs = zip(group_ids, values) if not field.nullable else [(group, value) for group, value in zip(group_ids, values) if value is not None]
+
+        if function == "count":
+            counts = Counter(group for group, value in pairs)
+            return DataField(name, "bigint unsigned", False), [counts[group] for group in range(count)]
+        if function == "count_distinct":
+            counts = Counter(group for group, value in set(pairs))
+            return DataField(name, "bigint unsigned", False), [counts[group] for group in range(count)]
+        if function in ("min", "max"):
+            better = operator.lt if function == "min" else operator.gt
+            result = [None] * count
+            for group, value in pairs:
+                current = result[group]
+                if current is None or better(value, current):
+                    result[group] = value
+            return DataField(name, field.datatype, field.nullable), result
+
+        # sum og mean
+        ptype = field._ptype
+        if ptype not in (int, float, Decimal):
+            raise TypeError(f"Kolonnen '{column}' ({field.datatype}) kan ikke summeres.")
+        scale = field._scale()
+        # Konteksten sættes én gang, så Decimal-summer er eksakte uanset antallet af rækker
+        with localcontext(prec=MAX_PREC):
+            sums = [None] * count
+            counts = [0] * count
+            for group, value in pairs:
+                current = sums[group]
+                sums[group] = value if current is None else current + value
+                counts[group] += 1
+        if function == "sum":
+            datatype = {int: "bigint", float: "double"}.get(ptype, f"decimal(65,{scale})")
+            return DataField(name, datatype, field.nullable), sums
+        if ptype is Decimal:
+            # Divisionen skal derimod have en begrænset præcision, der dog rækker til alle summer
+            exponent = Decimal(1).scaleb(-(scale + 4))
+            digits = max((total.adjusted() + 1 for total in sums if total is not None), default=0)
+            with localcontext(prec=max(digits + scale + 8, 28)):
+                means = [(total / n).quantize(exponent) if n else None for total, n in zip(sums, counts)]
+            return DataField(name, f"decimal(65,{scale + 4})", field.nullable), means
+        means = [total / n if n else None for total, n in zip(sums, counts)]
+        return DataField(name, "double", field.nullable), means
+
+    def _fill(self, columns: dict[ColumnName, list[typing.Any]]) -> None:
+        # Fylder en tom tabel med værdier, der allerede er valideret (f.eks. i en anden tabel)
+        if isinstance(self.data, list):
+            self.data = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        else:
+            # Tabellen er tom, så dens lager har allerede den rigtige type
+            self.data = type(self.data).from_columns(self.header, columns)
+
+    def __mul__(self, other: tuple[DataField, typing.Callable[..., typing.Any], *tuple[ColumnName, ...]]) -> typing.Self:
+        column, function, *columns = other
+        self.add_column(column, function, *columns)
         return self
 
+    def add_column(self, column: DataField, function: typing.Callable[..., typing.Any], *columns: ColumnName) -> None:
+        """
+        Tilføjer en kolonne, hvis værdier beregnes ud fra andre kolonner i samme række.
+
+        Funktionen kaldes med værdierne fra de angivne kolonner for hver række, f.eks.
+        ``table.add_column(DataField("month", "char(7)"), lambda d: d.strftime("%Y-%m"), "order_date")``.
+        Værdierne castes til kolonnens type ved næste refresh.
+
+        :param column: Definitionen af den nye kolonne.
+            *Påkrævet*.
+        :type column: DataField
+        :param function: Funktionen, der beregner kolonnens værdi.
+            *Påkrævet*.
+        :type function: Callable[..., Any]
+        :param columns: Kolonnerne, hvis værdier funktionen kaldes med.
+            *Påkrævet*.
+        :type columns: str
+        """
+        for name in columns:
+            if name not in self.header:
+                raise KeyError(f"Kolonnen '{name}' findes ikke i tabellen '{self.name}'.")
+        values = list(map(function, *(self._column(name) for name in columns)))
+        self.header[column.name] = column
+        self._set_column(column, values)
+
+    def __neg__(self) -> typing.Self:
+        # -x vender rækkefølgen efter primary key, eller rækkernes rækkefølge, hvis der ikke er nogen
+        table = self._share()
+        if table._key_columns(table.keys.primary):
+            table.sort(direction='d')
+        else:
+            table._reorder(range(len(table.data) - 1, -1, -1))
+        return table
+
+    def sort(self, *columns: ColumnName, direction: str | list[str] = 'a') -> None:
+        """
+        Sorterer tabellens rækker efter en eller flere kolonner.
+
+        Der sorteres én kolonne ad gangen, startende med den mindst betydende.
+        Da sorteringen er stabil, bevares rækkefølgen fra de tidligere kolonner ved lige værdier.
+        Hver kolonnes værdier bruges direkte som sorteringsnøgler, så der ikke dannes en nøgle pr. række.
+        NULL kommer først ved opadgående og sidst ved nedadgående rækkefølge (ligesom i MySQL).
+
+        Data, der ikke kan være i hukommelsen, kan sorteres som en :class:`TableStream`,
+        hvor sorterede bidder skrives til midlertidige filer og flettes.
+
+        :param columns: Kolonnerne, der sorteres efter, i prioriteret rækkefølge.
+            Hvis ingen angives, sorteres der efter primary key.
+            *Upåkrævet*.
+        :type columns: str
+        :param direction: Retningen, enten for alle kolonner eller én pr. kolonne.
+            `'a'`, `"asc"` eller `"ascending"` er opadgående rækkefølge, mens
+            `'d'`, `"desc"` eller `"descending"` er nedadgående rækkefølge.
+            *Upåkrævet*. Standardværdi: `'a'`
+        :type direction: str | list[str]
+        """
+        self._reorder(self.sort_order(*columns, direction=direction))
+
+    def sorted(self, *columns: ColumnName, direction: str | list[str] = 'a') -> typing.Self:
+        """
+        Som :meth:`sort`, men returnerer en sorteret kopi af tabellen.
+
+        :rtype: InterTable
+        """
+        table = self._share()
+        table.sort(*columns, direction=direction)
+        return table
+
+    def sort_order(self, *columns: ColumnName, direction: str | list[str] = 'a') -> list[int]:
+        """
+        Finder rækkefølgen, som rækkerne ville have efter :meth:`sort`, uden at ændre tabellen.
+
+        :return: Rækkernes nuværende indeks i sorteret rækkefølge.
+        :rtype: list[int]
+        """
+        columns = columns or self._key_columns(self.keys.primary)
+        if not columns:
+            raise ValueError(f"Der er ingen kolonner at sortere efter, og tabellen '{self.name}' har ingen primary key.")
+        for column in columns:
+            if column not in self.header:
+                raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{self.name}'.")
+        descending = self._descending(direction, len(columns))
+        order = list(range(len(self.data)))
+        for column, desc in reversed(list(zip(columns, descending))):
+            values = self._column(column)
+            # NULL kan ikke sammenlignes med andre værdier, så de sættes først eller sidst for sig
+            nulls = [row for row in order if values[row] is None] if self.header[column].nullable else []
+            if nulls:
+                order = [row for row in order if values[row] is not None]
+            # reverse=True bevarer også rækkefølgen af lige værdier
+            order.sort(key=values.__getitem__, reverse=desc)
+            if nulls:
+                order = order + nulls if desc else nulls + order
+        return order
+
+    @staticmethod
+    def _descending(direction: str | list[str], count: int) -> list[bool]:
+        # Omsætter retningen til, om hver kolonne sorteres nedadgående
+        directions = [direction] * count if isinstance(direction, str) else list(direction)
+        if len(directions) != count:
+            raise ValueError("Der skal angives én retning for alle kolonner eller én pr. kolonne.")
+        descending = []
+        for value in directions:
+            if value.lower() in ASCENDING:
+                descending.append(False)
+            elif value.lower() in DESCENDING:
+                descending.append(True)
+            else:
+                raise ValueError(f"Ukendt retning '{value}'. Vælg en af {ASCENDING + DESCENDING}.")
+        return descending
+
+    def _reorder(self, order: typing.Sequence[int]) -> None:
+        # Sætter rækkerne i den angivne rækkefølge
+        if isinstance(self.data, list):
+            data = self.data
+            self.data = [data[row] for row in order]
+        else:
+            self.data.keep(order)
+        # Rækkerne har fået nye indeks, så indekserne bygges igen
+        self._rebuild_indexes()
+        if self._dirty_rows:
+            self._dirty_rows = {new for new, old in enumerate(order) if old in self._dirty_rows}
+
     # add row(s) x + y __add__
     # remove row(s) x - y __sub__
     # add column x * y __mul__
@@ -509,7 +1490,7 @@ class InterTable:
 
     #  __setitem__
 
-    def _validate_entry(self, data: DataEntry, *, new: bool = True) -> bool:
+    def _validate_entry(self, data: DataEntry, *, new: bool = True, coerce: typing.Callable[[DataEntry], None] | None = None) -> bool:
         # Tjekker om entry er dict
         if not isinstance(data, dict):
             raise TypeError("En række indsat i tabellen skal være en dict.")
@@ -521,92 +1502,300 @@ class InterTable:
             if col not in self.header:
                 raise KeyError(f"Der findes ingen kolonne med navnet '{col}' i tabellen '{self.name}'.")
 
-        # Validerer værdi for hver kolonne
-        for column in self.header:
-            if not self._validate_value(data, self.header[column], new=new):
-                break
-        else:
-            # Hvis alle tests bestås, er rækken gyldig
-            return True
-
-    def _validate_value(self, data: DataEntry, column: DataField, *, new: bool = True) -> bool:
-        col_name = column.name
-        col_type = column._ptype
-        # Tjekker om værdi mangler
-        if col_name not in data or (row_val := data[col_name]) is None:
-            # Tjekker om standardværdi skal indsættes
-            # TODO: Tjek også for auto-increment her
-            if column.default is not None:
-                data[col_name] = column.default
-                return True
-            # Tjekker om kolonne er nullable
-            elif not column.nullable:
-                raise ValueError(f"Ingen værdi angivet for kolonnen '{col_name}', som ikke er nullable.")
-        else:
-            # Tjekker om datatypen matcher med definitionen i headeren
-            if type(row_val) != col_type:
-                try:
-                    # TODO: Find en måde brugeren kan indsætte egne formater på
-                    if col_type == bool:
-                        new_val = col_type(int(row_val))
-                    elif col_type == date:
-                        split_date = row_val.split('/')
-                        new_val = col_type(int(split_date[2]), int(split_date[1]), int(split_date[0]))
-                    elif col_type == Decimal:
-                        new_val = col_type(row_val).quantize(Decimal("1.00"))
-                    else:
-                        new_val = col_type(row_val)
-                except:
-                    if isinstance(row_val, str) and row_val.lower() == "null":
-                        new_val = None
-                    else:
-                        raise TypeError(f"Værdien ({row_val}) passer ikke til datatypen for kolonnen '{col_name}' ({column.datatype}).")
-                finally:
-                    data[col_name] = new_val
-            # Tjekker om en række med identisk værdi i unikke kolonner findes
-            # TODO: Tjek for dubletter blandt multicols
-            if new and col_name in (self.keys.primary, self.keys.unique):
-                if data[col_name] in self[col_name]:
-                    raise ValueError(f"Der findes allerede en række med værdien ({col_name}={row_val}). Kolonnen '{col_name}' må kun indeholde unikke værdier.")
+        # Validerer og caster værdien for hver kolonne med headerens kompilerede konverteringer
+        (coerce or self.header.coercer())(data)
+        # Hvis alle tests bestås, er rækken gyldig
         return True
 
+    def _key_columns(self, key: ColumnName | list[ColumnName] | None) -> tuple[ColumnName, ...]:
+        # En nøgle på én kolonne og en multikolonnenøgle behandles ens som en tuple
+        if not key:
+            return ()
+        if isinstance(key, str):
+            return (key,)
+        return tuple(key)
+
+    def _key_value(self, entry: DataEntry, columns: tuple[ColumnName, ...]) -> typing.Any:
+        # Nøgler på én kolonne bruger værdien direkte, multikolonnenøgler en tuple af værdierne
+        if len(columns) == 1:
+            return entry.get(columns[0])
+        return tuple(entry.get(column) for column in columns)
+
+    def _unique_columns(self) -> list[tuple[ColumnName, ...]]:
+        # Primary og unique key findes hver gang, da Keys kan ændres udefra
+        unique_columns = []
+        for key in (self.keys.primary, self.keys.unique):
+            columns = self._key_columns(key)
+            # Nøgler på kolonner, der ikke (længere) findes i headeren, springes over
+            if columns and all(column in self.header for column in columns):
+                unique_columns.append(columns)
+        return unique_columns
+
+    def index(self, *columns: ColumnName) -> dict[typing.Any, DataEntry]:
+        """
+        Finder hash-indekset over en eller flere kolonner, der slår en nøgleværdi op i tabellen.
+
+        Indekset bygges første gang, det efterspørges, og opdateres derefter løbende,
+        når rækker tilføjes eller fjernes.
+        Nøgleværdien er selve værdien for en enkelt kolonne og ellers en tuple af værdierne.
+
+        :param columns: Kolonnen eller kolonnerne, som indekset dækker.
+            *Påkrævet*.
+        :type columns: str
+
+        :return: En dict fra nøgleværdi til indekset af den tilhørende række.
+        :rtype: dict[Any, DataEntry]
+        """
+        columns = tuple(columns)
+        # Indekset peger på rækkernes placering i DataList, så rækker markeret som slettet fjernes først
+        if self._tombstones:
+            self._compact()
+        if (index := self._indexes.get(columns)) is not None:
+            return index
+        for column in columns:
+            if column not in self.header:
+                raise KeyError(f"Kolonnen '{column}' findes ikke i tabellen '{self.name}'.")
+        if len(columns) == 1:
+            keys = self._column(columns[0])
+        else:
+            keys = self._tuples(columns)
+        index = {}
+        for row, key in enumerate(keys):
+            if key is None or (len(columns) > 1 and None in key):
+                continue
+            if key in index:
+                raise ValueError(self._duplicate_message(columns, self.data[row]))
+            index[key] = row
+        self._indexes[columns] = index
+        return index
+
+    def _duplicate_message(self, columns: tuple[ColumnName, ...], entry: DataEntry) -> str:
+        if len(columns) == 1:
+            col_name = columns[0]
+            return f"Der findes allerede en række med værdien ({col_name}={entry.get(col_name)}). Kolonnen '{col_name}' må kun indeholde unikke værdier."
+        values = ", ".join(f"{column}={entry.get(column)}" for column in columns)
+        return f"Der findes allerede en række med værdierne ({values}). Kolonnerne {list(columns)} må kun indeholde unikke kombinationer af værdier."
+
+    def _key_indexes(self) -> list[tuple[tuple[ColumnName, ...], dict[typing.Any, int]]]:
+        # Indekserne for tabellens nøgler, så de kun skal slås op én gang pr. indsættelse
+        return [(columns, self.index(*columns)) for columns in self._unique_columns()]
+
+    def _index_entry(self, entry: DataEntry, row: int, key_indexes: list | None = None) -> None:
+        # Alle nøgler tjekkes, før rækken indsættes i nogen af indekserne
+        keys = []
+        for columns, index in (self._key_indexes() if key_indexes is None else key_indexes):
+            if len(columns) == 1:
+                key = entry.get(columns[0])
+                # NULL tæller ikke som en dublet (ligesom i MySQL)
+                if key is None:
+                    continue
+            else:
+                key = tuple(entry.get(column) for column in columns)
+                if None in key:
+                    continue
+            if key in index:
+                raise ValueError(self._duplicate_message(columns, entry))
+            keys.append((index, key))
+        for index, key in keys:
+            index[key] = row
+
+    def _unindex_entries(self, entries: typing.Iterable[DataEntry], start: int) -> None:
+        # Rækkerne antages at stå i forlængelse af hinanden fra indekset 'start'
+        for columns, index in self._indexes.items():
+            for row, entry in enumerate(entries, start):
+                key = self._key_value(entry, columns)
+                # Fjerner kun nøglen, hvis den peger på netop denne række
+                if index.get(key) == row:
+                    del index[key]
+
     def change_type(self, column: ColumnName, new_type: str) -> None:
         # Den nye datatype sættes
         col = self.header[column]
         col.datatype = new_type
-        # Værdien i hver række castes til den nye tilsvarende Python-type
-        for entry in self.data:
-            self._validate_entry(entry, new=False)
+        self._coerce_column(column)
+
+    def _field_signature(self, field: DataField) -> tuple:
+        # Det, der afgør hvordan en kolonnes værdier castes
+        # Selve DataField-objektet indgår, så en ny header også opdages
+        return (field, field.datatype, field.nullable, field.default, field.parser)
+
+    def _coerce_column(self, column: ColumnName) -> None:
+        # Værdien i hver række castes til kolonnens tilsvarende Python-type
+        col = self.header[column]
+        convert = col.converter
+        from parallel import available, coerce_values
+        if available(self.workers, len(self.data)):
+            values = coerce_values(col, self._column(column), self.workers)
+            if isinstance(self.data, list):
+                self._own_rows()
+                name = col.name
+                for entry, value in zip(self.data, values):
+                    entry[name] = value
+            else:
+                self.data.set_column(column, values, col)
+        elif isinstance(self.data, list):
+            self._own_rows()
+            name = col.name
+            for entry in self.data:
+                entry[name] = convert(entry.get(name))
+        else:
+            # I kolonneformat gemmes kolonnen derefter med den nye type
+            self.data.set_column(column, [convert(value) for value in self.data.column(column)], col)
+        # Værdierne er castet på ny, så indekser over kolonnen bygges igen ved næste opslag
+        self._drop_indexes(column)
+        self._fields[column] = self._field_signature(col)
+        self._dirty_columns.discard(column)
 
     def rename(self, old: ColumnName, new: ColumnName) -> None:
         pass
 
-    def refresh(self) -> None:
-        for col in self.header:
-            self.change_type(col, self.header[col].datatype)
+    def refresh(self, full: bool = False) -> None:
+        """
+        Validerer og caster de data, der kan være ændret siden sidste refresh.
+
+        Det omfatter kolonner, hvis DataField er ændret eller udskiftet (f.eks. med en ny header),
+        kolonner, der har fået nye værdier (f.eks. med ``@`` eller ``<<``),
+        og rækker, der er udleveret med indeksering (f.eks. ``table[8]["manager_id"] = 8``).
+        Er intet ændret, røres ingen rækker.
+
+        Rækker, der ændres gennem iteration over tabellen, opdages ikke.
+        Brug i så fald ``full=True``.
+
+        :param full: Bestemmer, om alle kolonner skal valideres, uanset om de er ændret.
+            *Upåkrævet*. Standardværdi: `False`
+        :type full: bool
+        """
+        for column in self.header:
+            if full or column in self._dirty_columns or self._fields.get(column) != self._field_signature(self.header[column]):
+                self._coerce_column(column)
+        # Kolonner, der ikke længere findes i headeren, glemmes
+        for column in [column for column in self._fields if column not in self.header]:
+            del self._fields[column]
+        self._dirty_columns.clear()
+        if self._dirty_rows:
+            self._own_rows()
+            coerce = self.header.coercer()
+            for row in sorted(self._dirty_rows):
+                coerce(self.data[row])
+            # Nøgleværdier kan være ændret direkte i rækkerne
+            self._indexes.clear()
+            self._dirty_rows.clear()
+
+    def _drop_indexes(self, column: ColumnName) -> None:
+        for columns in [columns for columns in self._indexes if column in columns]:
+            del self._indexes[columns]
+
+    def _rebuild_indexes(self) -> None:
+        indexed = list(self._indexes)
+        self._indexes.clear()
+        for columns in indexed:
+            if all(column in self.header for column in columns):
+                self.index(*columns)
 
     def auto_id(self, column: DataField, start: int = 1) -> None:
         if isinstance(column, DataField):
-            self.header = {column.name: column, **self.header}
-            for row, entry in enumerate(self.data):
-                self.data[row] = {column.name: row + start, **entry}
+            self.header = Header({column.name: column, **self.header})
+            self._set_column(column, range(start, len(self.data) + start), first=True)
 
-    def remove_row(self, rows: int | slice | typing.Iterable[int]) -> None:
-        # Hvis et heltal bruges, fjernes kun den ene række med det id
-        if isinstance(rows, int):
+    def remove_row(self, rows: int | slice | typing.Iterable[int] | typing.Callable[[DataEntry], bool], *, lazy: bool = False) -> None:
+        """
+        Fjerner en eller flere rækker fra tabellen.
+
+        Rækkerne kan angives med et indeks, et slice, en iterable af indeks (f.eks. en :class:`TableView`)
+        eller en funktion, der returnerer `True` for de rækker, der skal fjernes.
+        Alle rækkerne fjernes i ét gennemløb af tabellen.
+
+        Med ``lazy=True`` markeres rækkerne kun som slettet, så flere sletninger i træk
+        ikke hver især danner tabellen på ny. De markerede rækker fjernes samlet,
+        når de udgør mindst ``TOMBSTONE_RATIO`` af tabellen, eller når en række næste gang hentes med indeks.
+        ``len()`` og iteration springer blot de markerede rækker over.
+
+        :param rows: Rækkerne, der skal fjernes.
+            *Påkrævet*.
+        :type rows: int | slice | Iterable[int] | Callable[[DataEntry], bool]
+        :param lazy: Bestemmer, om rækkerne kun markeres som slettet.
+            *Upåkrævet*. Standardværdi: `False`
+        :type lazy: bool
+        """
+        # Hvis et heltal bruges uden lazy, fjernes kun den ene række med det id
+        if isinstance(rows, int) and not lazy:
+            length = len(self.data)
+            if rows >= length or rows < -length:
+                raise IndexError(f"Rækkeindekset (i={rows}) er uden for rækkevidde.")
+            rows %= length
             self.data.pop(rows)
+            # Rækkerne efter den fjernede rykker en plads, så indekserne bygges igen
+            self._rebuild_indexes()
+            self._dirty_rows = {row - (row > rows) for row in self._dirty_rows if row != rows}
             return
-        # Hvis slicing bruges, fjernes rækker med id, der omfattes af slicet
-        elif isinstance(rows, slice):
-            remove = range(len(self.data))[rows]
-        # Hvis en liste, tuple eller anden iterable bruges, fjernes alle rækker med id i denne
-        elif isinstance(rows, typing.Iterable):
-            remove = rows
 
-        self.data = [row for index, row in enumerate(self.data) if index not in remove]
+        # Rækker, der allerede er markeret som slettet, springes over,
+        # så indeks angivet af brugeren svarer til rækkerne, som de ser ud udefra
+        data = self._data
+        tombstones = self._tombstones
+        if callable(rows):
+            remove = {row for row in range(len(data)) if row not in tombstones and rows(data[row])}
+        else:
+            length = len(data) - len(tombstones)
+            if isinstance(rows, int):
+                positions = (rows,)
+            # Hvis slicing bruges, fjernes rækker med id, der omfattes af slicet
+            elif isinstance(rows, slice):
+                positions = range(length)[rows]
+            # Et udsnit fjerner de rækker i tabellen, som det viser
+            elif isinstance(rows, TableView):
+                positions = rows.rows
+            # Hvis en liste, tuple eller anden iterable bruges, fjernes alle rækker med id i denne
+            elif isinstance(rows, typing.Iterable) and not isinstance(rows, str):
+                positions = rows
+            else:
+                raise TypeError(f"Rækkerne kan ikke angives med typen '{type(rows).__name__}'.")
+            remove = set()
+            for position in positions:
+                if position >= length or position < -length:
+                    raise IndexError(f"Rækkeindekset (i={position}) er uden for rækkevidde.")
+                remove.add(position % length)
+            if tombstones:
+                remove = self._raw_rows(remove)
+
+        tombstones.update(remove)
+        if not lazy or len(tombstones) >= TOMBSTONE_RATIO * len(data):
+            self._compact()
+
+    def _raw_rows(self, positions: typing.Iterable[int]) -> set[int]:
+        # Omsætter indeks, som de ser ud udefra, til indeks i DataList med rækker markeret som slettet
+        tombstones = sorted(self._tombstones)
+        raw = set()
+        for position in positions:
+            # Rækken ligger én plads længere fremme for hver markeret række før den
+            skipped = bisect_right(tombstones, position)
+            while (more := bisect_right(tombstones, position + skipped)) != skipped:
+                skipped = more
+            raw.add(position + skipped)
+        return raw
+
+    def _compact(self) -> None:
+        # Fjerner alle rækker markeret som slettet i ét gennemløb ud fra en bitmap over rækkerne
+        data = self._data
+        keep = bytearray(b'\x01') * len(data)
+        for row in self._tombstones:
+            keep[row] = 0
+        self._tombstones = set()
+        if isinstance(data, list):
+            self._data = list(compress(data, keep))
+        else:
+            data.compress(keep)
+        self._rebuild_indexes()
+        if self._dirty_rows:
+            kept = compress(range(len(keep)), keep)
+            self._dirty_rows = {row for row, index in enumerate(kept) if index in self._dirty_rows}
 
     def pop(self, times: int = 1) -> DataEntry | DataList:
+        self._own_indexes()
         popped = [self.data.pop() for time in range(times)]
+        # Rækkerne fjernes fra enden, så de øvrige rækkers indeks er uændret
+        self._unindex_entries(popped[::-1], len(self.data))
+        self._dirty_rows = {row for row in self._dirty_rows if row < len(self.data)}
         return popped if len(popped) > 1 else popped[0]
 
     def remove_column(self, *columns: str) -> None:
@@ -615,6 +1804,9 @@ class InterTable:
             # Kolonnens DataField fjernes fra headeren
             if column in self.header:
                 self.header.pop(column)
+            # INDEXES
+            # Indekser, der dækker kolonnen, gælder ikke længere
+            self._drop_indexes(column)
             # KEYS
             # Hvis kolonnen var del af primary key, fjernes primary key
             primary = self.keys.primary
@@ -639,41 +1831,175 @@ class InterTable:
                         self.keys.unique = self.keys.unique[0]
             # DATA
             # Kolonnen fjernes i hver række i DataList
-            for entry in self.data:
-                if column in entry:
-                    entry.pop(column)
+            if isinstance(self.data, list):
+                self._own_rows()
+                for entry in self.data:
+                    if column in entry:
+                        entry.pop(column)
+            else:
+                self.data.remove_column(column)
 
     def to_csv(self, delimiter: str = ',', quote: bool = False) -> list[str]:
         if not delimiter:
             delimiter = ','
         csv_list = []
-        header = delimiter.join([column for column in self.header])
-        csv_list.append(header)
-        to_str = lambda x: str(x) if not quote else f'"{x}"'
-        for entry in self.data:
-            entry_list = [
-                to_str(entry[column])
-                if column in entry and entry[column] is not None
-                else ''
-                for column in self.header
-            ]
-            row = delimiter.join(entry_list)
-            csv_list.append(row)
+        # Værdier med skilletegn, anførselstegn eller linjeskift citeres efter RFC 4180
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=delimiter, quoting=csv.QUOTE_ALL if quote else csv.QUOTE_MINIMAL, lineterminator='')
+        csv_list.append(delimiter.join([column for column in self.header]))
+        for values in self._tuples(list(self.header)):
+            writer.writerow(values)
+            csv_list.append(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
         return csv_list
 
+    def write_csv(self,
+        file: str | Path | typing.TextIO,
+        delimiter: str = ',',
+        *,
+        header: bool = True,
+        batch_size: int = WRITE_BATCH_SIZE
+    ) -> None:
+        """
+        Skriver tabellen til en *.csv*-fil eller en anden tekststrøm, efterhånden som rækkerne dannes.
+
+        Værdierne citeres efter RFC 4180, og linjer afsluttes med CRLF.
+        NULL skrives som et tomt felt, mens Decimal og datoer skrives uden tab af præcision
+        (``123.45``, ``2016-01-01``). Rækkerne skrives i portioner på ``batch_size``,
+        så hukommelsesforbruget ikke afhænger af tabellens størrelse.
+
+        :param file: Stien til filen eller en åben tekststrøm (åbnet med ``newline=''``).
+            *Påkrævet*.
+        :type file: str | Path | TextIO
+        :param delimiter: Skilletegnet mellem værdierne.
+            *Upåkrævet*. Standardværdi: `','`
+        :type delimiter: str
+        :param header: Bestemmer, om kolonnenavnene skrives i første linje.
+            *Upåkrævet*. Standardværdi: `True`
+        :type header: bool
+        :param batch_size: Antal rækker, der skrives ad gangen.
+            *Upåkrævet*. Standardværdi: `10_000`
+        :type batch_size: int
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, 'w', encoding="utf-8", newline='') as opened:
+                return self.write_csv(opened, delimiter, header=header, batch_size=batch_size)
+        writer = csv.writer(file, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL, lineterminator="\r\n")
+        if header:
+            writer.writerow(self.header)
+        rows = self._tuples(list(self.header))
+        while batch := list(islice(rows, batch_size)):
+            writer.writerows(batch)
+
+    def write_ndjson(self, file: str | Path | typing.TextIO, *, batch_size: int = WRITE_BATCH_SIZE) -> None:
+        """
+        Skriver tabellen som NDJSON (ét JSON-objekt pr. linje), efterhånden som rækkerne dannes.
+
+        Decimal skrives som tekst, så ingen decimaler går tabt, og datoer og tidspunkter i ISO 8601-format.
+        Rækkerne skrives i portioner på ``batch_size``, så hukommelsesforbruget ikke afhænger af tabellens størrelse.
+
+        :param file: Stien til filen eller en åben tekststrøm.
+            *Påkrævet*.
+        :type file: str | Path | TextIO
+        :param batch_size: Antal rækker, der skrives ad gangen.
+            *Upåkrævet*. Standardværdi: `10_000`
+        :type batch_size: int
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, 'w', encoding="utf-8") as opened:
+                return self.write_ndjson(opened, batch_size=batch_size)
+        columns = list(self.header)
+        encode = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+        rows = self._tuples(columns)
+        while batch := list(islice(rows, batch_size)):
+            file.write("".join([encode(dict(zip(columns, values))) + "\n" for values in batch]))
+
     def to_dict(self) -> dict[str, typing.Any]:
         dict_form = {
             "name": self.name,
             "header": {self.header[column].name: self.header[column]._unpack(full=True) for column in self.header},
             "keys": self.keys.all,
-            "data": list(self.data)
+            "data": list(self.data) if isinstance(self.data, list) else [dict(entry) for entry in self.data]
         }
         return dict_form
 
+    def to_snapshot(self, path: str) -> None:
+        # Se snapshot.save()
+        import snapshot
+        snapshot.save(self, path)
+
     def to_json(self, pretty: bool = False) -> str:
-        import json
         dict_form = self.to_dict()
-        return json.dumps(dict_form, indent=4 if pretty else None)
+        return json.dumps(dict_form, indent=4 if pretty else None, default=_json_default)
+
+class TableView:
+    """
+    Et udsnit af en InterTable, f.eks. resultatet af :meth:`InterTable.where`.
+
+    Udsnittet gemmer kun indekserne af de udvalgte rækker, og rækkerne hentes først fra tabellen,
+    når der itereres over udsnittet. Ændres tabellens rækker bagefter, passer udsnittet ikke længere.
+
+    :param table: Tabellen, som udsnittet viser.
+        *Påkrævet*.
+    :type table: InterTable
+    :param rows: Indekserne af de udvalgte rækker i tabellen.
+        *Påkrævet*.
+    :type rows: list[int]
+    """
+    def __init__(self, table: InterTable, rows: list[int]) -> None:
+        self.table: InterTable = table
+        self.rows: list[int] = rows
+
+    def __repr__(self) -> str:
+        return f"TableView(table={repr(self.table.name)}, rows={repr(self.rows)})"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> typing.Iterator[DataEntry]:
+        data = self.table.data
+        return (data[row] for row in self.rows)
+
+    def __getitem__(self, loc: ColumnName | int) -> DataEntry | tuple[typing.Any]:
+        # Tekststrenge giver kolonnens værdier i de udvalgte rækker, heltal en enkelt række
+        if isinstance(loc, str):
+            if loc not in self.table.header:
+                raise KeyError(f"Kolonnen '{loc}' findes ikke i tabellen '{self.table.name}'.")
+            values = self.table._column(loc)
+            return tuple(values[row] for row in self.rows)
+        return self.table.data[self.rows[loc]]
+
+    def __or__(self, other: dict[str, tuple]) -> typing.Self:
+        if isinstance(other, dict):
+            return self.where(**other)
+
+    def where(self, **kwargs) -> typing.Self:
+        """
+        Indsnævrer udsnittet yderligere. Se :meth:`InterTable.where`.
+
+        :rtype: TableView
+        """
+        return TableView(self.table, self.table._filter(self.rows, kwargs))
+
+    def to_table(self, name: TableName = '') -> InterTable:
+        """
+        Kopierer de udvalgte rækker over i en ny InterTable.
+
+        :param name: Navnet på den nye tabel. Hvis tomt, bruges tabellens navn.
+            *Upåkrævet*. Standardværdi: `''`
+        :type name: str
+
+        :rtype: InterTable
+        """
+        table = self.table
+        new = type(table)(name if name else table.name, deepcopy(table.header), deepcopy(table.keys), storage=table.storage)
+        columns = {}
+        for column in table.header:
+            values = table._column(column)
+            columns[column] = [values[row] for row in self.rows]
+        new._fill(columns)
+        return new
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,243 @@
+import tempfile
+from copy import deepcopy
+from pathlib import Path
+from intertable import *
+
+# Tjekker InterTable uden database; hver funktion udskriver SUCCES eller FEJL for hvert tjek
+
+def check(description: str, passed: bool) -> bool:
+    print(f"{"SUCCES" if passed else "FEJL"}: {description}")
+    return passed
+
+def raises(error: type[Exception], function: typing.Callable[[], typing.Any]) -> bool:
+    try:
+        function()
+    except error:
+        return True
+    except Exception:
+        return False
+    return False
+
+def dimension(size: int = 20, storage: str = "rows") -> InterTable:
+    header = Header({
+        "id": DataField("id", "int", False),
+        "name": DataField("name", "text")
+    })
+    return InterTable("dim", header, Keys(primary="id"), [{"id": number, "name": f"n{number}"} for number in range(size)], storage=storage)
+
+def fact(size: int = 40, storage: str = "rows") -> InterTable:
+    header = Header({
+        "fid": DataField("fid", "int", False),
+        "did": DataField("did", "int")
+    })
+    return InterTable("fact", header, Keys(primary="fid"), [{"fid": number, "did": number % 20} for number in range(size)], storage=storage)
+
+def stock(storage: str = "rows") -> InterTable:
+    header = Header({
+        "store_id": DataField("store_id", "int", False),
+        "product_id": DataField("product_id", "int", False),
+        "quantity": DataField("quantity", "int", False)
+    })
+    rows = [{"store_id": store, "product_id": product, "quantity": store * product} for store in range(1, 4) for product in range(1, 5)]
+    return InterTable("stock", header, Keys(primary=["store_id", "product_id"]), rows, storage=storage)
+
+def indexes() -> None:
+    table = dimension()
+    index = table.index("id")
+    check("index() slår en nøgle op til rækkens indeks", table[index[7]]["id"] == 7 and len(index) == 20)
+    check("En dublet af primary key udløser ValueError", raises(ValueError, lambda: table.__iadd__({"id": 3, "name": "x"})))
+    check("En liste med en dublet internt udløser ValueError", raises(ValueError, lambda: table.__iadd__([{"id": 30}, {"id": 30}])))
+    check("Tabellen og indekset er uændret efter en fejlet indsættelse", len(table) == 20 and 30 not in table.index("id"))
+    table += {"id": 30, "name": "x"}
+    check("Indekset opdateres ved indsættelse", table[table.index("id")[30]]["name"] == 'x')
+
+    table = stock()
+    check("En dublet af en sammensat primary key udløser ValueError", raises(ValueError, lambda: table.__iadd__({"store_id": 2, "product_id": 3, "quantity": 0})))
+    table += {"store_id": 4, "product_id": 3, "quantity": 0}
+    check("En ny kombination af en sammensat primary key kan indsættes", len(table) == 13)
+    check("index() over flere kolonner bruger en tuple som nøgle", table[table.index("store_id", "product_id")[(2, 3)]]["quantity"] == 6)
+
+    header = Header({"id": DataField("id", "int", False), "email": DataField("email", "text")})
+    table = InterTable("customers", header, Keys(primary="id", unique="email"), [{"id": 1, "email": None}, {"id": 2, "email": None}])
+    check("NULL i en unique key tæller ikke som en dublet", len(table) == 2)
+
+def rows_of(table: InterTable) -> list[dict[str, typing.Any]]:
+    return [dict(entry) for entry in table]
+
+def storage() -> None:
+    # De samme ændringer skal give de samme rækker i alle lagringsformer
+    results = {}
+    for storage in STORAGE_TYPES:
+        header = Header({"id": DataField("id", "text", False), "price": DataField("price", "text"), "name": DataField("name", "text")})
+        table = InterTable("products", header, Keys(primary="id"), [{"id": str(number), "price": f"{number}.50", "name": f"p{number}"} for number in range(10)], storage=storage)
+        with table:
+            table.header["id"].datatype = "int"
+            table.header["price"].datatype = "decimal(5,2)"
+        table += {"id": "10", "price": "NULL", "name": "p10"}
+        table[2]["name"] = "changed"
+        table.refresh()
+        table.remove_row([0, 5])
+        table.remove_column("name")
+        table.auto_id(DataField("row", "int", False))
+        table.change_type("price", "double")
+        check(f"Lagringsformen er '{storage}'", table.storage == storage)
+        results[storage] = rows_of(table)
+    check("Alle lagringsformer giver de samme rækker", all(rows == results["rows"] for rows in results.values()))
+    check("Værdierne er castet", results["rows"][0] == {"row": 1, "id": 1, "price": 1.5} and results["rows"][-1]["price"] is None)
+
+    table = dimension()
+    for storage in ("columns", "tuples", "rows"):
+        table.convert(storage)
+        check(f"convert() til '{storage}' bevarer rækkerne", rows_of(table) == rows_of(dimension()) and table[table.index("id")[4]]["id"] == 4)
+
+def joins() -> None:
+    facts = fact(25)
+    facts += {"fid": 25, "did": None}
+    names = dimension(10)
+    inner = facts.join(names, "did", right_on="id")
+    check("Et inner join beholder kun rækker med et match", [entry["did"] for entry in inner] == list(range(10)) + list(range(5)))
+    check("Et inner join tilføjer den anden tabels kolonner", all(entry["name"] == f"n{entry["did"]}" for entry in inner) and "id" not in inner.header)
+    left = facts.join(names, "did", "left", right_on="id")
+    check("Et left join beholder alle rækker med NULL uden match", len(left) == 26 and left[15]["name"] is None and left[25]["name"] is None)
+    semi = facts.join(names, "did", "semi", right_on="id")
+    check("Et semi join tilføjer ingen kolonner", list(semi.header) == ["fid", "did"] and len(semi) == len(inner))
+
+    # Uden indeks over den anden tabel bygges en hashtabel, hvilket skal give det samme
+    plain = InterTable("plain", deepcopy(names.header), Keys(), rows_of(names))
+    check("Et join uden indeks giver det samme som med indeks", rows_of(facts.join(plain, "did", right_on="id")) == rows_of(inner))
+    check("Et join i kolonneformat giver det samme", rows_of(fact(25, "columns").join(dimension(10, "tuples"), "did", right_on="id")) == rows_of(inner))
+    check("En ukendt join-type udløser ValueError", raises(ValueError, lambda: facts.join(names, "did", "outer", right_on="id")))
+
+def filters() -> None:
+    for storage in STORAGE_TYPES:
+        facts = fact(40, storage)
+        facts += {"fid": 40, "did": None}
+        view = facts.where(gt=("did", 15), lt=("fid", 30))
+        check(f"where() med flere betingelser ({storage})", [entry["fid"] for entry in view] == [16, 17, 18, 19])
+        check(f"where() med betw og in ({storage})", list((facts | {"betw": ("did", 2, 3), "in_": ("fid", [2, 22, 23])})["fid"]) == [2, 22, 23])
+        check(f"where() på et indeks ({storage})", list(facts.where(eq=("fid", 7))["did"]) == [7])
+        check(f"NULL opfylder ingen betingelse ({storage})", len(facts.where(lt=("did", 100))) == 40)
+        check(f"where() på et udsnit indsnævrer udsnittet ({storage})", len(view.where(eq=("did", 17))) == 1)
+    names = dimension()
+    check("like bruger % og _ som i SQL", [entry["id"] for entry in names.where(like=("name", "n1_"))] == list(range(10, 20)))
+    check("to_table() kopierer udsnittet til en ny tabel", rows_of(names.where(le=("id", 1)).to_table()) == rows_of(dimension(2)))
+
+def groups() -> None:
+    for storage in STORAGE_TYPES:
+        header = Header({
+            "store": DataField("store", "text", False),
+            "customer": DataField("customer", "int", False),
+            "price": DataField("price", "decimal(5,2)")
+        })
+        rows = [
+            {"store": 'a', "customer": 1, "price": "1.10"},
+            {"store": 'b', "customer": 2, "price": "2.00"},
+            {"store": 'a', "customer": 1, "price": "NULL"},
+            {"store": 'a', "customer": 3, "price": "3.20"}
+        ]
+        table = InterTable("orders", header, Keys(), rows, storage=storage)
+        grouped = table.group_by("store", rows=("count",), prices=("count", "price"), customers=("count_distinct", "customer"), total=("sum", "price"), mean=("mean", "price"), highest=("max", "price"))
+        first = dict(grouped[0])
+        check(f"group_by() giver én række pr. gruppe i rækkefølge ({storage})", list(grouped["store"]) == ['a', 'b'])
+        check(f"group_by() beregner aggregaterne ({storage})", first == {"store": 'a', "rows": 3, "prices": 2, "customers": 2, "total": Decimal("4.30"), "mean": Decimal("2.150000"), "highest": Decimal("3.20")})
+        check(f"group_by() uden kolonner aggregerer hele tabellen ({storage})", dict(table.group_by(rows=("count",))[0]) == {"rows": 4})
+    check("Et ukendt aggregat udløser ValueError", raises(ValueError, lambda: table.group_by("store", median=("median", "price"))))
+
+def lookups() -> None:
+    names = dimension(10)
+    facts = fact(20)
+    facts.lookup(DataField("name", "text"), "did", names, "id", missing="null")
+    check("lookup() med \"null\" indsætter NULL uden match", [entry["name"] for entry in facts][8:12] == ["n8", "n9", None, None])
+
+    facts = fact(20)
+    facts.lookup(DataField("name", "text", default="ukendt"), "did", names, "id", missing="default")
+    check("lookup() med \"default\" indsætter standardværdien", facts[15]["name"] == "ukendt" and facts[5]["name"] == "n5")
+
+    facts = fact(20)
+    facts.lookup(DataField("name", "text"), "did", names, "id", missing="reject")
+    check("lookup() med \"reject\" fjerner rækker uden match", len(facts) == 10 and [entry["did"] for entry in facts.rejected] == list(range(10, 20)))
+
+    facts = fact(20)
+    check("lookup() med \"fail\" udløser KeyError", raises(KeyError, lambda: facts.lookup(DataField("name", "text"), "did", names, "id")))
+    check("Tabellen er uændret efter et fejlet opslag", "name" not in facts.header and len(facts) == 20)
+    check("En ukendt håndtering udløser ValueError", raises(ValueError, lambda: facts.lookup(DataField("name", "text"), "did", names, "id", missing="skip")))
+
+    facts = fact(20, "columns")
+    facts @= (DataField("name", "text"), "did", {did: f"d{did}" for did in range(20)})
+    check("@ slår op i en dict", facts[3]["name"] == "d3")
+
+def snapshots() -> None:
+    import snapshot
+    header = Header({
+        "id": DataField("id", "int", False),
+        "price": DataField("price", "decimal(6,2)"),
+        "ratio": DataField("ratio", "double"),
+        "day": DataField("day", "date"),
+        "active": DataField("active", "boolean"),
+        "name": DataField("name", "varchar(20)")
+    })
+    rows = [
+        {"id": number, "price": f"{number}.25", "ratio": number / 3, "day": f"{number + 1:02}/01/2018", "active": str(number % 2), "name": f"n{number % 3}"}
+        for number in range(20)
+    ]
+    rows.append({"id": 20, "price": None, "ratio": None, "day": None, "active": None, "name": None})
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in STORAGE_TYPES:
+            table = InterTable("snap", deepcopy(header), Keys(primary="id", unique="ratio"), [dict(row) for row in rows], storage=storage)
+            path = Path(directory) / f"{storage}.snap"
+            table.to_snapshot(path)
+            loaded = snapshot.load(path)
+            check(f"Et snapshot bevarer rækkerne ({storage})", rows_of(loaded) == rows_of(table))
+            check(f"Et snapshot bevarer header, nøgler og lagringsform ({storage})", repr(loaded.header) == repr(table.header) and loaded.keys == table.keys and loaded.storage == storage)
+            check(f"Et snapshot kan indlæses i en anden lagringsform ({storage})", rows_of(snapshot.load(path, "rows")) == rows_of(table))
+            check(f"Nøglerne tjekkes stadig efter indlæsning ({storage})", raises(ValueError, lambda: loaded.__iadd__({"id": 3})))
+        path.write_bytes(b"ikke et snapshot")
+        check("En fil, der ikke er et snapshot, afvises", raises(ValueError, lambda: snapshot.load(path)))
+
+def remove_rows() -> None:
+    table = dimension(10)
+    table.remove_row([1, 3, 5])
+    check("remove_row() fjerner en liste af rækker", [entry["id"] for entry in table] == [0, 2, 4, 6, 7, 8, 9])
+    table.remove_row(lambda entry: entry["id"] > 6)
+    check("remove_row() fjerner rækker ud fra en funktion", [entry["id"] for entry in table] == [0, 2, 4, 6])
+
+    table = dimension(3)
+    check("remove_row() med et heltal uden for tabellen udløser IndexError", raises(IndexError, lambda: table.remove_row(7)))
+    check("remove_row() med et negativt heltal uden for tabellen udløser IndexError", raises(IndexError, lambda: table.remove_row(-4)))
+    check("remove_row() i en tom tabel udløser IndexError", raises(IndexError, lambda: dimension(0).remove_row(0)))
+    check("remove_row() med en ukendt type udløser TypeError", raises(TypeError, lambda: table.remove_row(1.0)))
+    check("remove_row() ændrer ikke tabellen ved fejl", len(table) == 3)
+
+def lazy_remove() -> None:
+    table = dimension()
+    table.index("id")
+    table.remove_row(0, lazy=True)
+    check("Markerede rækker tælles ikke med i len()", len(table) == 19)
+    check("Markerede rækker springes over ved iteration", [entry["id"] for entry in table][:2] == [1, 2])
+    check("index() indeholder ikke markerede rækker", 0 not in table.index("id"))
+    check("index() peger på de rigtige rækker efter markering", table[table.index("id")[5]]["id"] == 5)
+
+    # Opslag og joins bruger indekset over den anden tabels nøgle
+    table = dimension()
+    table.index("id")
+    table.remove_row(0, lazy=True)
+    facts = fact()
+    facts.lookup(DataField("name", "text"), "did", table, "id", missing="null")
+    check("lookup() i en tabel med markerede rækker giver de rigtige værdier", all(entry["name"] == (f"n{entry["did"]}" if entry["did"] else None) for entry in facts))
+
+    table = dimension()
+    table.index("id")
+    table.remove_row([0, 1], lazy=True)
+    joined = fact().join(table, "did", right_on="id")
+    check("join med en tabel med markerede rækker giver de rigtige værdier", len(joined) == 36 and all(entry["name"] == f"n{entry["did"]}" for entry in joined))
+
+if __name__ == "__main__":
+    indexes()
+    storage()
+    joins()
+    filters()
+    groups()
+    lookups()
+    snapshots()
+    remove_rows()
+    lazy_remove()
@@ -1,287 +1,350 @@
 import api
+import typing
 import csvr as csv
 from db.database import Database
 from intertable import *
+from cache import ExtractionCache
+from metrics import Metrics
+from pipeline import Pipeline
 from config import API, DB, CSV
 
-def main() -> bool:
-######################
-##### EXTRACTION #####
-######################
+# Antallet af forbindelser, som tabellerne i samme foreign key-niveau indlæses samtidigt over
+LOAD_CONNECTIONS = 4
+# Eksisterende rækker opdateres, så kørslen kan gentages mod en database, der allerede er indlæst (se Database.insert())
+LOAD_MODE = "overwrite"
 
-### API ###
-    # De tre datasæt hentes som rådata fra API'en
-    api_data = api.get_api_data(
-        "/orders",
-        "/order_items",
-        "/customers",
-        host=API.host,
-        port=API.port
-    )
-    # Rådataene gemmes i InterTable-formatet
-    orders = api.intertable("orders", api_data["orders"])
-    order_items = api.intertable("order_items", api_data["order_items"])
-    customers = api.intertable("customers", api_data["customers"])
-
-### DB ###
-    # Database-objekt m. forbindelse oprettes
-    with Database(
-        DB.username, DB.password,
-        "ProductDB",
-        DB.host, DB.port,
-        preview=False
-    ) as source_db:
-        # De fire tabeller gemmes i InterTable-formatet
-        brands = source_db.get_table("brands")
-        categories = source_db.get_table("categories")
-        products = source_db.get_table("products")
-        stock = source_db.get_table("stocks", "stock")
+def add_transformations(pipeline: Pipeline) -> None:
+    """
+    Tilføjer transformationen af hver tabel som et trin i en kørsel.
 
-### CSV ###
-    # Rådata for de to tabeller hentes
-    staff_data = csv.read_csv("staffs.csv", CSV.dir)
-    store_data = csv.read_csv("stores.csv", CSV.dir)
-    # Dataene gemmes i InterTable-format
-    staff = csv.intertable("staff", staff_data)
-    stores = csv.intertable("stores", store_data)
+    Hvert trin bruger trinnet ``<tabel>_source`` med den udtrukne tabel som input
+    og giver den transformerede tabel under tabellens navn.
+    Kun staff, orders og stock slår op i andre tabeller og venter derfor på dem,
+    mens de øvrige tabeller kan transformeres, så snart de er udtrukket.
 
+    :param pipeline: Kørslen, som trinnene tilføjes til.
+        *Påkrævet*.
+    :type pipeline: Pipeline
+    """
 ##########################
 ##### TRANSFORMATION #####
 ##########################
 
 # Brands #
 ##########
-    with brands:
-        # Definerer header
-        brands.header = Header({
-            "brand_id": DataField("brand_id", "smallint unsigned", False, extra="auto"),
-            "brand_name": DataField("brand_name", "varchar(40)", False)
-        })
-
-        # Tilføjer keys
-        brands.keys.primary = "brand_id"
+    @pipeline.stage("brands", "brands_source")
+    def transform_brands(brands: InterTable) -> InterTable:
+        with brands:
+            # Definerer header
+            brands.header = Header({
+                "brand_id": DataField("brand_id", "smallint unsigned", False, extra="auto"),
+                "brand_name": DataField("brand_name", "varchar(40)", False)
+            })
+
+            # Tilføjer keys
+            brands.keys.primary = "brand_id"
+        return brands
 
 # Categories #
 ##############
-    with categories:
-        # Definerer header
-        categories.header = Header({
-            "category_id": DataField("category_id", "smallint unsigned", False, extra="auto"),
-            "category_name": DataField("category_name", "varchar(40)", False)
-        })
-
-        # Tilføjer keys
-        categories.keys.primary = "category_id"
+    @pipeline.stage("categories", "categories_source")
+    def transform_categories(categories: InterTable) -> InterTable:
+        with categories:
+            # Definerer header
+            categories.header = Header({
+                "category_id": DataField("category_id", "smallint unsigned", False, extra="auto"),
+                "category_name": DataField("category_name", "varchar(40)", False)
+            })
+
+            # Tilføjer keys
+            categories.keys.primary = "category_id"
+        return categories
 
 # Customers #
 #############
-    with customers:
-        # Definerer header
-        customers.header = Header({
-            "customer_id": DataField("customer_id", "mediumint unsigned", False, extra="auto"),
-            "first_name": DataField("first_name", "varchar(40)", False),
-            "last_name": DataField("last_name", "varchar(40)", False),
-            "phone": DataField("phone", "char(14)"),
-            "email": DataField("email", "varchar(80)", False),
-            "street": DataField("street", "varchar(63)", False),
-            "city": DataField("city", "varchar(40)", False),
-            "state": DataField("state", "char(2)", False),
-            "zip_code": DataField("zip_code", "mediumint unsigned", False),
-        })
-
-        # Tilføjer keys
-        customers.keys.primary = "customer_id"
-        customers.keys.unique = "email"
+    @pipeline.stage("customers", "customers_source")
+    def transform_customers(customers: InterTable) -> InterTable:
+        with customers:
+            # Definerer header
+            customers.header = Header({
+                "customer_id": DataField("customer_id", "mediumint unsigned", False, extra="auto"),
+                "first_name": DataField("first_name", "varchar(40)", False),
+                "last_name": DataField("last_name", "varchar(40)", False),
+                "phone": DataField("phone", "char(14)"),
+                "email": DataField("email", "varchar(80)", False),
+                "street": DataField("street", "varchar(63)", False),
+                "city": DataField("city", "varchar(40)", False),
+                "state": DataField("state", "char(2)", False),
+                "zip_code": DataField("zip_code", "mediumint unsigned", False),
+            })
+
+            # Tilføjer keys
+            customers.keys.primary = "customer_id"
+            customers.keys.unique = "email"
+        return customers
 
 # Stores #
 ##########
-    with stores:
-        # Definerer header
-        stores.header = Header({
-            "name": DataField("name", "varchar(80)", False),
-            "phone": DataField("phone", "char(14)", False),
-            "email": DataField("email", "varchar(80)", False),
-            "street": DataField("street", "varchar(63)", False),
-            "city": DataField("city", "varchar(40)", False),
-            "state": DataField("state", "char(2)", False),
-            "zip_code": DataField("zip_code", "mediumint unsigned", False)
-        })
-
-        # Indsætter ny autogenereret id-kolonne i starten af tabellen
-        stores << DataField("store_id", "smallint unsigned", False, extra="auto")
-
-        # Tilføjer keys
-        stores.keys.primary = "store_id"
+    @pipeline.stage("stores", "stores_source")
+    def transform_stores(stores: InterTable) -> InterTable:
+        with stores:
+            # Definerer header
+            stores.header = Header({
+                "name": DataField("name", "varchar(80)", False),
+                "phone": DataField("phone", "char(14)", False),
+                "email": DataField("email", "varchar(80)", False),
+                "street": DataField("street", "varchar(63)", False),
+                "city": DataField("city", "varchar(40)", False),
+                "state": DataField("state", "char(2)", False),
+                "zip_code": DataField("zip_code", "mediumint unsigned", False)
+            })
+
+            # Indsætter ny autogenereret id-kolonne i starten af tabellen
+            stores << DataField("store_id", "smallint unsigned", False, extra="auto")
+
+            # Tilføjer keys
+            stores.keys.primary = "store_id"
+        return stores
 
 # Staff #
 #########
-    with staff:
-        # Definerer header
-        staff.header = Header({
-            "name": DataField("name", "varchar(40)", False),
-            "last_name": DataField("last_name", "varchar(40)", False),
-            "email": DataField("email", "varchar(80)", False),
-            "phone": DataField("phone", "char(14)", False),
-            "active": DataField("active", "boolean", False),
-            "store_name": DataField("store_name", "text"),
-            "street": DataField("street", "text"),
-            "manager_id": DataField("manager_id", "smallint unsigned")
-        })
-
-        # TODO: Indbyg forbindelsen i nedenstående funktion
-        store_map = {entry["name"]: entry["store_id"] for entry in stores}
-
-        # Indsætter ny kolonne med værdier ud fra forbindelse til anden tabel
-        staff @ (DataField("store_id", "smallint unsigned", False), "store_name", store_map)
-
-        # Fjerner overflødige kolonner
-        staff.remove_column("store_name", "street")
-
-        # Indsætter ny autogenereret id-kolonne i starten af tabellen
-        staff << DataField("staff_id", "smallint unsigned", False, extra="auto")
-
-        # Tilføjer keys
-        staff.keys.primary = "staff_id"
-        staff.keys.foreign = {
-            "store_id": ("stores", "store_id"),
-            "manager_id": ("staff", "staff_id")
-        }
-        staff.keys.unique = ["email", "phone"]
-
-        # Retter forkert 'manager_id' for to medarbejdere
-        staff[8]["manager_id"] = 8
-        staff[9]["manager_id"] = 8
+    @pipeline.stage("staff", "staff_source", "stores")
+    def transform_staff(staff: InterTable, stores: InterTable) -> InterTable:
+        with staff:
+            # Definerer header
+            staff.header = Header({
+                "name": DataField("name", "varchar(40)", False),
+                "last_name": DataField("last_name", "varchar(40)", False),
+                "email": DataField("email", "varchar(80)", False),
+                "phone": DataField("phone", "char(14)", False),
+                "active": DataField("active", "boolean", False),
+                "store_name": DataField("store_name", "text"),
+                "street": DataField("street", "text"),
+                "manager_id": DataField("manager_id", "smallint unsigned")
+            })
+
+            # Indsætter ny kolonne med værdier slået op i stores ud fra butikkens navn
+            staff @ (DataField("store_id", "smallint unsigned", False), "store_name", stores, "name")
+
+            # Fjerner overflødige kolonner
+            staff.remove_column("store_name", "street")
+
+            # Indsætter ny autogenereret id-kolonne i starten af tabellen
+            staff << DataField("staff_id", "smallint unsigned", False, extra="auto")
+
+            # Tilføjer keys
+            staff.keys.primary = "staff_id"
+            staff.keys.foreign = {
+                "store_id": ("stores", "store_id"),
+                "manager_id": ("staff", "staff_id")
+            }
+            staff.keys.unique = ["email", "phone"]
+
+            # Retter forkert 'manager_id' for to medarbejdere
+            staff[8]["manager_id"] = 8
+            staff[9]["manager_id"] = 8
+        return staff
 
 # Orders #
 ##########
-    with orders:
-        # Definerer header
-        orders.header = Header({
-            "order_id": DataField("order_id", "mediumint unsigned", False, extra="auto"),
-            "customer_id": DataField("customer_id", "mediumint unsigned", False),
-            "order_status": DataField("order_status", "tinyint unsigned", False),
-            "order_date": DataField("order_date", "date", False),
-            "required_date": DataField("required_date", "date", False),
-            "shipped_date": DataField("shipped_date", "date"),
-            "store": DataField("store", "text"),
-            "staff_name": DataField("staff_name", "text")
-        })
-
-        # TODO: Indbyg forbindelsen i nedenstående funktion
-        staff_map = {entry["name"]: entry["staff_id"] for entry in staff}
-
-        # Indsætter ny kolonne med værdier ud fra forbindelse til anden tabel
-        orders @ (DataField("store_id", "smallint unsigned", False), "store", store_map)
-        orders @ (DataField("staff_id", "smallint unsigned", False), "staff_name", staff_map)
-
-        # Fjerner overflødige kolonner
-        orders.remove_column("store", "staff_name")
-
-        # Tilføjer keys
-        orders.keys.primary = "order_id"
-        orders.keys.foreign = {
-            "customer_id": ("customers", "customer_id"),
-            "store_id": ("stores", "store_id"),
-            "staff_id": ("staff", "staff_id")
-        }
-
-    # COUNT() = len();  WHERE = if; FROM = for in
-    # SELECT COUNT(shipped_date) FROM orders WHERE shipped_date IS NULL
-    # print(len([nulldate for nulldate in orders["shipped_date"].values() if nulldate is None]))
+    @pipeline.stage("orders", "orders_source", "stores", "staff")
+    def transform_orders(orders: InterTable, stores: InterTable, staff: InterTable) -> InterTable:
+        with orders:
+            # Definerer header
+            orders.header = Header({
+                "order_id": DataField("order_id", "mediumint unsigned", False, extra="auto"),
+                "customer_id": DataField("customer_id", "mediumint unsigned", False),
+                "order_status": DataField("order_status", "tinyint unsigned", False),
+                "order_date": DataField("order_date", "date", False),
+                "required_date": DataField("required_date", "date", False),
+                "shipped_date": DataField("shipped_date", "date"),
+                "store": DataField("store", "text"),
+                "staff_name": DataField("staff_name", "text")
+            })
+
+            # Indsætter nye kolonner med værdier slået op i stores og staff ud fra navnene
+            orders @ (DataField("store_id", "smallint unsigned", False), "store", stores, "name")
+            orders @ (DataField("staff_id", "smallint unsigned", False), "staff_name", staff, "name")
+
+            # Fjerner overflødige kolonner
+            orders.remove_column("store", "staff_name")
+
+            # Tilføjer keys
+            orders.keys.primary = "order_id"
+            orders.keys.foreign = {
+                "customer_id": ("customers", "customer_id"),
+                "store_id": ("stores", "store_id"),
+                "staff_id": ("staff", "staff_id")
+            }
+
+        # COUNT() = len();  WHERE = if; FROM = for in
+        # SELECT COUNT(shipped_date) FROM orders WHERE shipped_date IS NULL
+        # print(len([nulldate for nulldate in orders["shipped_date"].values() if nulldate is None]))
+        return orders
 
 # Products #
 ############
-    with products:
-        # Definerer header
-        products.header = Header({
-            "product_id": DataField("product_id", "mediumint unsigned", False, extra="auto"),
-            "product_name": DataField("product_name", "varchar(80)", False),
-            "brand_id": DataField("brand_id", "smallint unsigned", False),
-            "category_id": DataField("category_id", "smallint unsigned", False),
-            "model_year": DataField("model_year", "year", False),
-            "list_price": DataField("list_price", "decimal(10,2)", False)
-        })
-
-        # Tilføjer keys
-        products.keys.primary = "product_id"
-        products.keys.foreign = {
-            "brand_id": ("brands", "brand_id"),
-            "category_id": ("categories", "category_id")
-        }
-        # products.keys.unique = "product_name"
+    @pipeline.stage("products", "products_source")
+    def transform_products(products: InterTable) -> InterTable:
+        with products:
+            # Definerer header
+            products.header = Header({
+                "product_id": DataField("product_id", "mediumint unsigned", False, extra="auto"),
+                "product_name": DataField("product_name", "varchar(80)", False),
+                "brand_id": DataField("brand_id", "smallint unsigned", False),
+                "category_id": DataField("category_id", "smallint unsigned", False),
+                "model_year": DataField("model_year", "year", False),
+                "list_price": DataField("list_price", "decimal(10,2)", False)
+            })
+
+            # Tilføjer keys
+            products.keys.primary = "product_id"
+            products.keys.foreign = {
+                "brand_id": ("brands", "brand_id"),
+                "category_id": ("categories", "category_id")
+            }
+            # products.keys.unique = "product_name"
+        return products
 
 # Order Items #
 ###############
-    with order_items:
-        # Definerer header
-        order_items.header = Header({
-            "order_id": DataField("order_id", "mediumint unsigned", False),
-            "item_id": DataField("item_id", "tinyint unsigned", False),
-            "product_id": DataField("product_id", "mediumint unsigned", False),
-            "quantity": DataField("quantity", "smallint unsigned", False),
-            "list_price": DataField("list_price", "decimal(10,2)", False),
-            "discount": DataField("discount", "decimal(3,2)", False, default=Decimal(0.00)),
-        })
-
-        # Tilføjer keys
-        order_items.keys.primary = ["order_id", "item_id"]
-        order_items.keys.foreign = {
-            "order_id": ("orders", "order_id"),
-            "product_id": ("products", "product_id")
-        }
+    @pipeline.stage("order_items", "order_items_source")
+    def transform_order_items(order_items: InterTable) -> InterTable:
+        with order_items:
+            # Definerer header
+            order_items.header = Header({
+                "order_id": DataField("order_id", "mediumint unsigned", False),
+                "item_id": DataField("item_id", "tinyint unsigned", False),
+                "product_id": DataField("product_id", "mediumint unsigned", False),
+                "quantity": DataField("quantity", "smallint unsigned", False),
+                "list_price": DataField("list_price", "decimal(10,2)", False),
+                "discount": DataField("discount", "decimal(3,2)", False, default=Decimal(0.00)),
+            })
+
+            # Tilføjer keys
+            order_items.keys.primary = ["order_id", "item_id"]
+            order_items.keys.foreign = {
+                "order_id": ("orders", "order_id"),
+                "product_id": ("products", "product_id")
+            }
+        return order_items
 
 # Stock #
 #########
-    with stock:
-        # Definerer header
-        stock.header = Header({
-            "store_name": DataField("store_name", "text"),
-            "product_id": DataField("product_id", "mediumint unsigned", False),
-            "quantity": DataField("quantity", "mediumint unsigned", False)
-        })
-
-        # Indsætter ny kolonne med værdier ud fra forbindelse til anden tabel
-        stock @ (DataField("store_id", "smallint unsigned", False), "store_name", store_map)
-
-        # Fjerner overflødig kolonne
-        del stock["store_name"]
-
-        # Tilføjer keys
-        stock.keys.primary = ["store_id", "product_id"]
-        stock.keys.foreign = {
-            "product_id": ("products", "product_id")
-        }
-
-# Størrelsen af tabellerne efter transformation
-    all_tables = (orders, order_items, customers, brands, categories, products, stock, staff, stores)
-    transform_sizes = {table.name: table.size for table in all_tables}
-    print(transform_sizes)
+    @pipeline.stage("stock", "stock_source", "stores")
+    def transform_stock(stock: InterTable, stores: InterTable) -> InterTable:
+        with stock:
+            # Definerer header
+            stock.header = Header({
+                "store_name": DataField("store_name", "text"),
+                "product_id": DataField("product_id", "mediumint unsigned", False),
+                "quantity": DataField("quantity", "mediumint unsigned", False)
+            })
+
+            # Indsætter ny kolonne med værdier slået op i stores ud fra butikkens navn
+            stock @ (DataField("store_id", "smallint unsigned", False), "store_name", stores, "name")
+
+            # Fjerner overflødig kolonne
+            del stock["store_name"]
+
+            # Tilføjer keys
+            stock.keys.primary = ["store_id", "product_id"]
+            stock.keys.foreign = {
+                "product_id": ("products", "product_id")
+            }
+        return stock
+
+def main(metrics: Metrics) -> bool:
+    # Udtræk, transformationer og indlæsning udføres som trin efter deres afhængigheder
+    # Fejler et trin, fortsætter næste kørsel fra de trin, der allerede er udført
+    pipeline = Pipeline("bikecorp", metrics=metrics)
+    add_transformations(pipeline)
 
-###################
-##### LOADING #####
-###################
-    # Grupperer tabellerne efter antal foreign key-led
-    zero_fk: tuple[InterTable] = (brands, categories, customers, stores)
-    one_fk: tuple[InterTable] = (staff,)
-    two_fk: tuple[InterTable] = (orders, products)
-    three_fk: tuple[InterTable] = (order_items, stock)
+######################
+##### EXTRACTION #####
+######################
 
-    load_tuple: tuple[InterTable] = (*zero_fk, *one_fk, *two_fk, *three_fk)
+    # Uændrede kilder hentes fra cachen i stedet for at blive hentet og parset igen
+    cache = ExtractionCache()
 
-    # Opretter et nyt database-objekt
-    with Database(
+### API ###
+    # De tre datasæt hentes som rådata fra API'en
+    @pipeline.stage("api", kind="extract")
+    def extract_api() -> dict[str, list[dict[str, typing.Any]]]:
+        return api.get_api_data(
+            "/orders",
+            "/order_items",
+            "/customers",
+            host=API.host,
+            port=API.port,
+            cache=cache
+        )
+    # Rådataene gemmes i InterTable-formatet
+    pipeline.add("orders_source", lambda api_data: api.intertable("orders", api_data["orders"]), "api", kind="extract")
+    # order_items er den største tabel og gemmes derfor kolonnevis
+    pipeline.add("order_items_source", lambda api_data: api.intertable("order_items", api_data["order_items"], storage="columns"), "api", kind="extract")
+    pipeline.add("customers_source", lambda api_data: api.intertable("customers", api_data["customers"]), "api", kind="extract")
+
+### DB ###
+    # Database-objekt m. forbindelse oprettes; forbindelsen deles, så tabellerne hentes én ad gangen
+    source_db = Database(
         DB.username, DB.password,
-        "bikecorpdb",
+        "ProductDB",
         DB.host, DB.port,
-        preview=False,
-        init_load=load_tuple
-    ) as target_db:
-        print(target_db.info())
+        preview=False
+    )
+    # De fire tabeller gemmes i InterTable-formatet
+    pipeline.add("brands_source", lambda: source_db.get_table("brands", cache=cache), kind="extract", exclusive="source_db")
+    pipeline.add("categories_source", lambda: source_db.get_table("categories", cache=cache), kind="extract", exclusive="source_db")
+    pipeline.add("products_source", lambda: source_db.get_table("products", cache=cache), kind="extract", exclusive="source_db")
+    pipeline.add("stock_source", lambda: source_db.get_table("stocks", "stock", cache=cache), kind="extract", exclusive="source_db")
+
+### CSV ###
+    # Rådata for de to tabeller hentes og gemmes i InterTable-format
+    pipeline.add("staff_source", lambda: csv.intertable("staff", csv.read_csv("staffs.csv", CSV.dir, cache)), kind="extract")
+    pipeline.add("stores_source", lambda: csv.intertable("stores", csv.read_csv("stores.csv", CSV.dir, cache)), kind="extract")
+
+###################
+##### LOADING #####
+###################
+    @pipeline.stage("load", "orders", "order_items", "customers", "brands", "categories", "products", "stock", "staff", "stores", kind="load", checkpoint=False)
+    def load(
+        orders: InterTable, order_items: InterTable, customers: InterTable,
+        brands: InterTable, categories: InterTable, products: InterTable,
+        stock: InterTable, staff: InterTable, stores: InterTable
+    ) -> None:
+        # Størrelsen af tabellerne efter transformation
+        all_tables = (orders, order_items, customers, brands, categories, products, stock, staff, stores)
+        transform_sizes = {table.name: table.size for table in all_tables}
+        print(transform_sizes)
+
+        # Opretter et nyt database-objekt; rækkefølgen findes ud fra tabellernes foreign keys,
+        # og tabeller uden indbyrdes afhængighed indlæses samtidigt over hver sin forbindelse
+        with Database(
+            DB.username, DB.password,
+            "bikecorpdb",
+            DB.host, DB.port,
+            preview=False,
+            init_load=all_tables,
+            metrics=metrics,
+            pool_size=LOAD_CONNECTIONS,
+            load_mode=LOAD_MODE
+        ) as target_db:
+            print(target_db.info())
+
+    with source_db:
+        pipeline.run()
 
     return True
 
 if __name__ == "__main__":
-    if main():
+    # Tider, rækker og hukommelse for hvert trin skrives til en rapport, også hvis kørslen fejler
+    metrics = Metrics()
+    try:
+        success = main(metrics)
+    finally:
+        metrics.write()
+    if success:
         msg = "SUCCES: Alle data hentet og indsat i ny database."
         print('=' * len(msg))
         print(msg)
@@ -0,0 +1,291 @@
+import json
+import typing
+import threading
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter, process_time
+from intertable import InterTable
+
+# Standardfilen til rapporten, placeret ved siden af modulerne
+METRICS_FILE = Path(__file__).parent / "metrics.json"
+STAGE_TYPES = ("extract", "transform", "load")
+
+def count_rows(value: typing.Any) -> int | None:
+    """
+    Tæller rækkerne i resultatet af et udtræk eller en transformation.
+
+    En InterTable og en liste tælles med ``len()``, og en dict med flere datasæt (f.eks. fra API'en)
+    tælles som summen af dens datasæt. Rådata fra en *.csv*-fil tælles uden headeren.
+
+    :param value: Resultatet.
+        *Påkrævet*.
+    :type value: Any
+
+    :return: Antallet af rækker, eller `None`, hvis de ikke kan tælles (f.eks. for en TableStream).
+    :rtype: int | None
+    """
+    if isinstance(value, InterTable):
+        return len(value)
+    if isinstance(value, dict):
+        counts = [count_rows(dataset) for dataset in value.values()]
+        return None if None in counts else sum(counts)
+    if isinstance(value, list):
+        return len(value) - 1 if value and isinstance(value[0], str) else len(value)
+    return None
+
+class Stage:
+    """
+    Målingerne for ét trin i en ETL-kørsel for én tabel.
+
+    :param stage: Trinnet, `"extract"`, `"transform"` eller `"load"`.
+        *Påkrævet*.
+    :type stage: str
+    :param table: Navnet på tabellen eller kilden.
+        *Påkrævet*.
+    :type table: str
+    :param rows_in: Antallet af rækker før trinnet.
+        *Upåkrævet*. Standardværdi: `None`
+    :type rows_in: int | None
+    """
+    def __init__(self, stage: str, table: str, rows_in: int | None = None) -> None:
+        if stage not in STAGE_TYPES:
+            raise ValueError(f"Ukendt trin '{stage}'. Vælg et af {STAGE_TYPES}.")
+        self.stage: str = stage
+        self.table: str = table
+        self.rows_in: int | None = rows_in
+        self.rows_out: int | None = None
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        # Den højeste mængde hukommelse i brug under trinnet og mængden ved starten (se Metrics.stage())
+        self.peak: int | None = None
+        self.start_memory: int = 0
+        # Antal trin, som dette trin ligger inden i
+        self.depth: int = 0
+        self.error: str | None = None
+
+    def __repr__(self) -> str:
+        return f"Stage(stage={repr(self.stage)}, table={repr(self.table)}, rows_in={self.rows_in}, rows_out={self.rows_out}, wall={self.wall:.4f})"
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """
+        Antallet af rækker ud af trinnet (eller ind, hvis de ikke er talt) pr. sekund.
+        """
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        if rows is None or not self.wall:
+            return None
+        return rows / self.wall
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        return {
+            "stage": self.stage,
+            "table": self.table,
+            "depth": self.depth,
+            "wall_seconds": self.wall,
+            "cpu_seconds": self.cpu,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_second": self.rows_per_second,
+            "peak_memory_bytes": self.peak - self.start_memory if self.peak is not None else None,
+            "error": self.error
+        }
+
+class Metrics:
+    """
+    Måler hvert trin i en ETL-kørsel: væg- og CPU-tid, rækker ind og ud, rækker pr. sekund
+    og den højeste ekstra hukommelse, trinnet har brugt (med :mod:`tracemalloc`).
+
+    Trin kan ligge inden i hinanden, f.eks. en indsættelse pr. tabel inden i en samlet indlæsning,
+    og det ydre trins hukommelsestop omfatter så også de indre trins.
+    Trin kan også måles fra flere tråde på én gang (se :mod:`pipeline`); hver tråd har sine egne indre trin,
+    men :mod:`tracemalloc` måler hele processen, så hukommelsestoppen for samtidige trin omfatter dem alle.
+    Toppen indtil nu gemmes derfor på alle igangværende trin i alle tråde, før den nulstilles til et nyt trin.
+    CPU-tiden omfatter kun denne proces og altså ikke processer startet af :mod:`parallel`.
+    :mod:`tracemalloc` gør Python-koden mærkbart langsommere, mens den kører,
+    så tiderne er kun sammenlignelige med andre kørsler med samme indstilling.
+
+    :param memory: Bestemmer, om hukommelsesforbruget måles.
+        *Upåkrævet*. Standardværdi: `True`
+    :type memory: bool
+    """
+    def __init__(self, memory: bool = True) -> None:
+        self.memory: bool = memory
+        self.stages: list[Stage] = []
+        self.started: datetime = datetime.now()
+        self._start_wall: float = perf_counter()
+        self._start_cpu: float = process_time()
+        # De trin, der er i gang i hver tråd, med det inderste sidst (se _active)
+        self._threads: threading.local = threading.local()
+        # De trin, der er i gang i alle tråde (se _save_peak())
+        self._running: list[Stage] = []
+        # Den højeste mængde hukommelse i brug under de afsluttede trin
+        self._peak: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def _active(self) -> list[Stage]:
+        return self._threads.__dict__.setdefault("active", [])
+
+    def __repr__(self) -> str:
+        return f"Metrics(memory={self.memory}, stages={len(self.stages)})"
+
+    @contextmanager
+    def stage(self, stage: str, table: str, rows_in: int | None = None) -> typing.Iterator[Stage]:
+        """
+        Måler koden i en with-blok som et trin.
+
+        Antallet af rækker ud sættes på det leverede :class:`Stage`-objekt, f.eks. ``record.rows_out = len(table)``.
+        Fejler blokken, registreres fejlen, og den udløses igen.
+
+        :param stage: Trinnet, `"extract"`, `"transform"` eller `"load"`.
+            *Påkrævet*.
+        :type stage: str
+        :param table: Navnet på tabellen eller kilden.
+            *Påkrævet*.
+        :type table: str
+        :param rows_in: Antallet af rækker før trinnet.
+            *Upåkrævet*. Standardværdi: `None`
+        :type rows_in: int | None
+        """
+        record = Stage(stage, table, rows_in)
+        record.depth = len(self._active)
+        with self._lock:
+            self.stages.append(record)
+            if self.memory:
+                # Toppen indtil nu gemmes på alle igangværende trin, før den nulstilles til dette trin
+                self._save_peak()
+                tracemalloc.reset_peak()
+                record.start_memory = record.peak = tracemalloc.get_traced_memory()[0]
+            self._running.append(record)
+        self._active.append(record)
+        start_wall, start_cpu = perf_counter(), process_time()
+        try:
+            yield record
+        except BaseException as err:
+            record.error = f"{type(err).__name__}: {err}"
+            raise
+        finally:
+            record.wall = perf_counter() - start_wall
+            record.cpu = process_time() - start_cpu
+            self._active.pop()
+            with self._lock:
+                if self.memory:
+                    self._save_peak()
+                self._running.remove(record)
+
+    def _save_peak(self) -> None:
+        # Gemmer toppen siden sidste nulstilling på alle igangværende trin og på hele kørslen
+        # Kaldes med _lock, så ingen andre tråde nulstiller toppen imens
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._running:
+            record.peak = max(record.peak, peak)
+        self._peak = max(self._peak, peak)
+
+    def measure(self, stage: str, table: str, function: typing.Callable[..., typing.Any], *args, **kwargs) -> typing.Any:
+        """
+        Kalder en funktion som et trin og tæller rækkerne i resultatet med :func:`count_rows`.
+
+        Bruges til udtræk, f.eks. ``metrics.measure("extract", "brands", db.get_table, "brands")``.
+
+        :param stage: Trinnet, `"extract"`, `"transform"` eller `"load"`.
+            *Påkrævet*.
+        :type stage: str
+        :param table: Navnet på tabellen eller kilden.
+            *Påkrævet*.
+        :type table: str
+        :param function: Funktionen, der kaldes med de øvrige argumenter.
+            *Påkrævet*.
+        :type function: Callable[..., Any]
+
+        :return: Funktionens resultat.
+        :rtype: Any
+        """
+        with self.stage(stage, table) as record:
+            result = function(*args, **kwargs)
+            record.rows_out = count_rows(result)
+        return result
+
+    def inherit(self, function: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        """
+        Pakker en funktion ind, så trin målt i den ligger inden i de trin, der er i gang i den kaldende tråd,
+        også når funktionen køres i en anden tråd (f.eks. ved samtidig indlæsning i :meth:`Database.load`).
+
+        Ellers ville trinnene fra de andre tråde være yderste trin og tælles med i totalerne to gange.
+
+        :param function: Funktionen, der skal køres i en anden tråd.
+            *Påkrævet*.
+        :type function: Callable[..., Any]
+
+        :return: Den indpakkede funktion.
+        :rtype: Callable[..., Any]
+        """
+        active = list(self._active)
+
+        def wrapper(*args, **kwargs) -> typing.Any:
+            previous = self._active
+            self._threads.active = list(active)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._threads.active = previous
+        return wrapper
+
+    @contextmanager
+    def transform(self, table: InterTable) -> typing.Iterator[InterTable]:
+        """
+        Svarer til en with-blok for en InterTable (se :meth:`InterTable.refresh`), men måles som et trin.
+
+        Rækkerne tælles før blokken og efter den afsluttende refresh, som også tæller med i tiden.
+
+        :param table: Tabellen, der transformeres.
+            *Påkrævet*.
+        :type table: InterTable
+        """
+        with self.stage("transform", table.name, len(table)) as record:
+            with table:
+                yield table
+            record.rows_out = len(table)
+
+    def report(self) -> dict[str, typing.Any]:
+        """
+        Samler målingerne i en rapport med hvert trin og totalerne for hver type trin.
+
+        Totalerne medregner kun de yderste trin, så indre trin ikke tælles to gange.
+
+        :rtype: dict[str, Any]
+        """
+        stages = [record.as_dict() for record in self.stages]
+        totals = {}
+        for record in self.stages:
+            if record.depth:
+                continue
+            total = totals.setdefault(record.stage, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "rows_out": 0, "tables": 0})
+            total["wall_seconds"] += record.wall
+            total["cpu_seconds"] += record.cpu
+            total["rows_out"] += record.rows_out or 0
+            total["tables"] += 1
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": perf_counter() - self._start_wall,
+            "cpu_seconds": process_time() - self._start_cpu,
+            "peak_memory_bytes": max(self._peak, tracemalloc.get_traced_memory()[1]) if self.memory else None,
+            "totals": totals,
+            "stages": stages
+        }
+
+    def write(self, path: str | Path = METRICS_FILE) -> None:
+        """
+        Skriver rapporten som JSON. Se :meth:`report`.
+
+        :param path: Stien til filen.
+            *Upåkrævet*. Standardværdi: `METRICS_FILE`
+        :type path: str | Path
+        """
+        with open(path, 'w', encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+            file.write('\n')
+        print(f"SUCCES: Skrev målingerne til '{path}'.")
@@ -0,0 +1,135 @@
+import typing
+import operator
+import threading
+import multiprocessing
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from intertable import *
+
+# Under dette antal rækker valideres der i én proces, da det tager længere at starte processerne
+PARALLEL_MIN_ROWS = 100_000
+# Antal bidder pr. proces, så processer, der bliver hurtigt færdige, kan tage en bid mere
+CHUNKS_PER_WORKER = 4
+
+# Opgaven, som processerne arver ved fork i stedet for at få den tilsendt (se _map_chunks())
+_job: tuple[typing.Callable[..., typing.Any], tuple] | None = None
+# Kun én opgave ad gangen, da trin i en pipeline kan validere fra flere tråde på én gang (se pipeline.py)
+_job_lock: threading.Lock = threading.Lock()
+
+def available(workers: int, rows: int) -> bool:
+    """
+    Afgør, om en validering skal fordeles på flere processer.
+
+    Det kræver mere end én proces, mindst ``PARALLEL_MIN_ROWS`` rækker og en platform,
+    der kan starte processer med fork (f.eks. Linux), så de arver dataene uden at få dem tilsendt.
+
+    :param workers: Det ønskede antal processer.
+        *Påkrævet*.
+    :type workers: int
+    :param rows: Antallet af rækker, der skal valideres.
+        *Påkrævet*.
+    :type rows: int
+
+    :rtype: bool
+    """
+    return workers > 1 and rows >= PARALLEL_MIN_ROWS and "fork" in multiprocessing.get_all_start_methods()
+
+def validate_rows(table: InterTable, rows: DataList, workers: int) -> None:
+    """
+    Validerer og caster rækker, der skal indsættes i en tabel, fordelt på flere processer.
+
+    Rækkerne deles i bidder, som hver proces validerer og caster kolonnevis med headerens konverteringer.
+    De castede værdier sendes tilbage kolonnevis og skrives ind i rækkerne på stedet i den oprindelige rækkefølge;
+    kolonner, hvis værdier er uændrede (f.eks. tekst), sendes ikke tilbage, medmindre kolonnen mangler i en række.
+    Rækkerne får derfor de samme værdier som ved validering i én proces.
+    Fejler en række, udløses samme fejl som ved :meth:`InterTable._validate_entry` for den første fejlende række,
+    og ingen rækker ændres.
+    Nøglerne tjekkes ikke her, men i hovedprocessen, så dubletter også findes på tværs af bidderne.
+
+    :param table: Tabellen, hvis header rækkerne valideres efter.
+        *Påkrævet*.
+    :type table: InterTable
+    :param rows: Rækkerne, der skal valideres.
+        *Påkrævet*.
+    :type rows: DataList
+    :param workers: Antallet af processer.
+        *Påkrævet*.
+    :type workers: int
+    """
+    results = _map_chunks(_validate_chunk, (table, rows), len(rows), workers)
+    for name in table.header:
+        chunks = [result[name] for result in results]
+        if all(chunk is None for chunk in chunks):
+            continue
+        # Uændrede bidder springes over, mens de øvrige skrives ind række for række
+        start = 0
+        for chunk, result in zip(chunks, results):
+            if chunk is not None:
+                for entry, value in zip(rows[start:start + len(chunk)], chunk):
+                    entry[name] = value
+            start += result[None]
+
+def coerce_values(field: DataField, values: typing.Sequence[typing.Any], workers: int) -> list[typing.Any]:
+    """
+    Caster alle værdierne i en kolonne til kolonnens type, fordelt på flere processer.
+
+    :param field: Kolonnens definition.
+        *Påkrævet*.
+    :type field: DataField
+    :param values: Kolonnens værdier.
+        *Påkrævet*.
+    :type values: Sequence[Any]
+    :param workers: Antallet af processer.
+        *Påkrævet*.
+    :type workers: int
+
+    :return: De castede værdier i samme rækkefølge.
+    :rtype: list[Any]
+    """
+    return list(chain.from_iterable(_map_chunks(_coerce_chunk, (field.converter, values), len(values), workers)))
+
+def _map_chunks(function: typing.Callable[..., typing.Any], args: tuple, length: int, workers: int) -> list[typing.Any]:
+    # Processerne startes med fork efter, at opgaven er gemt i _job, så de arver dataene
+    # i stedet for at få dem sendt; kun start og slut for hver bid og resultaterne sendes
+    global _job
+    size = max(1, -(-length // (workers * CHUNKS_PER_WORKER)))
+    chunks = [(start, min(start + size, length)) for start in range(0, length, size)]
+    with _job_lock:
+        _job = (function, args)
+        try:
+            with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("fork")) as pool:
+                # map() returnerer resultaterne (og en evt. fejl) i biddernes rækkefølge
+                return list(pool.map(_run, chunks))
+        finally:
+            _job = None
+
+def _run(chunk: tuple[int, int]) -> typing.Any:
+    function, args = _job
+    return function(*args, *chunk)
+
+def _validate_chunk(table: InterTable, rows: DataList, start: int, end: int) -> dict[ColumnName | None, list[typing.Any] | int | None]:
+    # De castede værdier for hver kolonne, eller None, hvis de er de samme objekter som før,
+    # og kolonnen findes i alle rækker (ellers skal den tilføjes, f.eks. med None)
+    # Under nøglen None står antallet af rækker i bidden
+    chunk = rows[start:end]
+    ignore = lambda entry: None
+    try:
+        for entry in chunk:
+            table._validate_entry(entry, new=True, coerce=ignore)
+        result = {None: len(chunk)}
+        for name, field in table.header.items():
+            convert = field.converter
+            before = [entry.get(name) for entry in chunk]
+            after = list(map(convert, before))
+            unchanged = all(map(operator.is_, before, after)) and all(name in entry for entry in chunk)
+            result[name] = None if unchanged else after
+        return result
+    except Exception:
+        # Rækkerne valideres igen én ad gangen, så fejlen er den samme som uden flere processer
+        coerce = table.header.coercer()
+        for entry in chunk:
+            table._validate_entry(entry, new=True, coerce=coerce)
+        raise
+
+def _coerce_chunk(convert: typing.Callable[[typing.Any], typing.Any], values: typing.Sequence[typing.Any], start: int, end: int) -> list[typing.Any]:
+    return list(map(convert, values[start:end]))
@@ -0,0 +1,77 @@
+import threading
+from copy import deepcopy
+import datagen
+import parallel
+from intertable import *
+from benchmark import ORDER_ITEMS_HEADER
+
+# Tjekker, at validering i flere processer giver præcis de samme rækker som validering i én proces
+
+WORKERS = 4
+
+def validate(header: Header, rows: DataList, workers: int) -> DataList:
+    table = InterTable("test", deepcopy(header), Keys(), workers=workers)
+    table += [dict(row) for row in rows]
+    return table.data
+
+def compare(name: str, header: Header, rows: DataList) -> bool:
+    serial = validate(header, rows, 1)
+    # Fordeler også små mængder rækker på flere processer
+    min_rows, parallel.PARALLEL_MIN_ROWS = parallel.PARALLEL_MIN_ROWS, 0
+    try:
+        spread = validate(header, rows, WORKERS)
+    finally:
+        parallel.PARALLEL_MIN_ROWS = min_rows
+    for number, (entry, other) in enumerate(zip(serial, spread)):
+        if entry != other or list(entry) != list(other):
+            print(f"FEJL: {name}: Række {number} er {other} i flere processer, men {entry} i én proces.")
+            return False
+    if len(serial) != len(spread):
+        print(f"FEJL: {name}: {len(spread)} rækker i flere processer, men {len(serial)} i én proces.")
+        return False
+    print(f"SUCCES: {name}: {len(serial)} rækker er ens.")
+    return True
+
+def missing_column() -> bool:
+    # En nullable kolonne, der mangler i rækkerne, skal tilføjes med None
+    header = Header({
+        "a": DataField("a", "int", False, default=0),
+        "b": DataField("b", "text"),
+        "c": DataField("c", "text")
+    })
+    rows = [{"a": str(number), "b": 'x'} for number in range(1_000)]
+    return compare("Manglende kolonne", header, rows)
+
+def order_items() -> bool:
+    # Syntetiske rådata som tekst, der castes
+    rows = datagen.generate(10_000)["order_items"]
+    return compare("order_items", ORDER_ITEMS_HEADER, rows)
+
+def threads() -> bool:
+    # To tråde, der validerer hver sin tabel på samme tid, må ikke få hinandens rækker (se pipeline.py)
+    rows = datagen.generate(10_000)["order_items"]
+    header = Header({"number": DataField("number", "int", False)})
+    numbers = [{"number": str(number)} for number in range(10_000)]
+    results = {}
+    min_rows, parallel.PARALLEL_MIN_ROWS = parallel.PARALLEL_MIN_ROWS, 0
+    try:
+        jobs = [
+            threading.Thread(target=lambda: results.update(order_items=validate(ORDER_ITEMS_HEADER, rows, WORKERS))),
+            threading.Thread(target=lambda: results.update(numbers=validate(header, numbers, WORKERS)))
+        ]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+    finally:
+        parallel.PARALLEL_MIN_ROWS = min_rows
+    passed = results.get("order_items") == validate(ORDER_ITEMS_HEADER, rows, 1) and results.get("numbers") == validate(header, numbers, 1)
+    print(f"{"SUCCES" if passed else "FEJL"}: Samtidige valideringer fra to tråde giver de rigtige rækker.")
+    return passed
+
+if __name__ == "__main__":
+    if not parallel.available(WORKERS, parallel.PARALLEL_MIN_ROWS):
+        print("ADVARSEL: Platformen kan ikke starte processer med fork, så der tjekkes kun i én proces.")
+    missing_column()
+    order_items()
+    threads()
@@ -0,0 +1,287 @@
+import typing
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from cache import ExtractionCache
+from metrics import Metrics, count_rows
+
+# Standardmappen til checkpoints, placeret ved siden af modulerne
+CHECKPOINT_DIR = Path(__file__).parent / ".checkpoints"
+# Antal tråde, som uafhængige trin udføres i samtidigt
+PIPELINE_WORKERS = 4
+
+class PipelineStage:
+    """
+    Et navngivet trin i en :class:`Pipeline`.
+
+    :param name: Navnet på trinnet, som andre trin angiver som input.
+        *Påkrævet*.
+    :type name: str
+    :param function: Funktionen, der kaldes med resultaterne af ``inputs`` i samme rækkefølge.
+        *Påkrævet*.
+    :type function: Callable[..., Any]
+    :param inputs: Navnene på de trin, hvis resultater funktionen skal bruge.
+        *Upåkrævet*. Standardværdi: `()`
+    :type inputs: tuple[str, ...]
+    :param kind: Typen af trin i målingerne, `"extract"`, `"transform"` eller `"load"`.
+        *Upåkrævet*. Standardværdi: `"transform"`
+    :type kind: str
+    :param checkpoint: Bestemmer, om resultatet gemmes, så en ny kørsel kan genoptages herfra.
+        *Upåkrævet*. Standardværdi: `True`
+    :type checkpoint: bool
+    :param exclusive: Trin med samme værdi udføres aldrig samtidigt, f.eks. fordi de deler en databaseforbindelse.
+        *Upåkrævet*. Standardværdi: `None`
+    :type exclusive: str | None
+    """
+    def __init__(self,
+        name: str,
+        function: typing.Callable[..., typing.Any],
+        inputs: tuple[str, ...] = (),
+        *,
+        kind: str = "transform",
+        checkpoint: bool = True,
+        exclusive: str | None = None
+    ) -> None:
+        self.name: str = name
+        self.function: typing.Callable[..., typing.Any] = function
+        self.inputs: tuple[str, ...] = inputs
+        self.kind: str = kind
+        self.checkpoint: bool = checkpoint
+        self.exclusive: str | None = exclusive
+
+    def __repr__(self) -> str:
+        return f"PipelineStage(name={repr(self.name)}, inputs={self.inputs}, kind={repr(self.kind)})"
+
+class Pipeline:
+    """
+    En ETL-kørsel opdelt i navngivne trin med erklærede input, der udføres efter deres afhængigheder.
+
+    Trin, der ikke afhænger af hinanden, udføres samtidigt i en trådpulje, så f.eks. udtræk fra
+    API'en, databasen og *.csv*-filerne overlapper. Tråde bruges i stedet for processer,
+    da trinnenes resultater er InterTables, som de efterfølgende trin ændrer på stedet,
+    og da trinnene kan bruge åbne databaseforbindelser. CPU-tung validering i et trin kan
+    stadig fordeles på flere processer med tabellens ``workers`` (se :mod:`parallel`).
+
+    Et trin må kun ændre sine input på stedet, hvis det er det eneste trin, der bruger dem.
+
+    Resultatet af hvert trin gemmes som et checkpoint (se :class:`cache.ExtractionCache`).
+    Fejler et trin, fortsætter en ny kørsel fra de gemte checkpoints i stedet for forfra.
+    Et checkpoint bruges kun, hvis trinnets kode og alle dets input er de samme som sidst,
+    så rettes det fejlende trin, udføres det og alle trin efter det igen.
+    Når en hel kørsel lykkes, slettes checkpointene, så næste kørsel henter data på ny.
+
+    :param name: Navnet på kørslen, som checkpointene gemmes under.
+        *Upåkrævet*. Standardværdi: `"pipeline"`
+    :type name: str
+    :param workers: Det største antal trin, der udføres samtidigt.
+        *Upåkrævet*. Standardværdi: `4`
+    :type workers: int
+    :param checkpoints: Mappen, som checkpointene gemmes i. Hvis `None`, gemmes ingen checkpoints.
+        *Upåkrævet*. Standardværdi: `CHECKPOINT_DIR`
+    :type checkpoints: str | Path | None
+    :param metrics: Målingerne, som hvert trin registreres i.
+        *Upåkrævet*. Standardværdi: `None`
+    :type metrics: Metrics | None
+    """
+    def __init__(self,
+        name: str = "pipeline",
+        *,
+        workers: int = PIPELINE_WORKERS,
+        checkpoints: str | Path | None = CHECKPOINT_DIR,
+        metrics: Metrics | None = None
+    ) -> None:
+        self.name: str = name
+        self.workers: int = workers
+        self.metrics: Metrics | None = metrics
+        self.stages: dict[str, PipelineStage] = {}
+        # Et checkpoint, der fjernes, fordi cachen er fuld, betyder blot, at trinnet udføres igen
+        self._checkpoints: ExtractionCache | None = ExtractionCache(Path(checkpoints) / name) if checkpoints is not None else None
+        self._locks: dict[str, threading.Lock] = {}
+
+    def __repr__(self) -> str:
+        return f"Pipeline(name={repr(self.name)}, stages={list(self.stages)})"
+
+    def add(self, name: str, function: typing.Callable[..., typing.Any], *inputs: str, kind: str = "transform", checkpoint: bool = True, exclusive: str | None = None) -> None:
+        """
+        Tilføjer et trin. Se :class:`PipelineStage`.
+
+        :param name: Navnet på trinnet.
+            *Påkrævet*.
+        :type name: str
+        :param function: Funktionen, der kaldes med resultaterne af ``inputs``.
+            *Påkrævet*.
+        :type function: Callable[..., Any]
+        :param inputs: Navnene på de trin, hvis resultater funktionen skal bruge.
+            Det første input tælles som rækkerne ind i trinnet i målingerne.
+        :type inputs: str
+        """
+        if name in self.stages:
+            raise ValueError(f"Trinnet '{name}' findes allerede i kørslen '{self.name}'.")
+        self.stages[name] = PipelineStage(name, function, inputs, kind=kind, checkpoint=checkpoint, exclusive=exclusive)
+        if exclusive is not None:
+            self._locks.setdefault(exclusive, threading.Lock())
+
+    def stage(self, name: str, *inputs: str, kind: str = "transform", checkpoint: bool = True, exclusive: str | None = None) -> typing.Callable[[typing.Callable[..., typing.Any]], typing.Callable[..., typing.Any]]:
+        """
+        Tilføjer den dekorerede funktion som et trin. Se :meth:`add`.
+        """
+        def decorator(function: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+            self.add(name, function, *inputs, kind=kind, checkpoint=checkpoint, exclusive=exclusive)
+            return function
+        return decorator
+
+    def order(self, *targets: str) -> list[str]:
+        """
+        Finder rækkefølgen, trinnene kan udføres i, så hvert trin kommer efter sine input.
+
+        :param targets: Trinnene, der skal udføres, sammen med alle trin, de afhænger af.
+            Hvis ingen angives, bruges alle trin.
+
+        :return: Navnene på trinnene i en rækkefølge, der overholder afhængighederne.
+        :rtype: list[str]
+        """
+        needed = self._needed(targets or tuple(self.stages))
+        # Kahns algoritme i trinnenes tilføjede rækkefølge
+        remaining = {name: set(self.stages[name].inputs) for name in self.stages if name in needed}
+        order = []
+        while remaining:
+            ready = [name for name, inputs in remaining.items() if not inputs]
+            if not ready:
+                raise ValueError(f"Trinnene {sorted(remaining)} i kørslen '{self.name}' afhænger af hinanden i ring.")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for inputs in remaining.values():
+                inputs.difference_update(ready)
+        return order
+
+    def run(self, *targets: str, resume: bool = True) -> dict[str, typing.Any]:
+        """
+        Udfører trinnene efter deres afhængigheder med uafhængige trin samtidigt.
+
+        Et trin startes, så snart alle dets input er færdige. Fejler et trin, startes ingen nye trin,
+        men de igangværende gøres færdige og gemmes, før fejlen udløses igen.
+
+        :param targets: Trinnene, der skal udføres, sammen med alle trin, de afhænger af.
+            Hvis ingen angives, udføres alle trin.
+        :type targets: str
+        :param resume: Bestemmer, om gemte checkpoints fra en tidligere kørsel bruges.
+            *Upåkrævet*. Standardværdi: `True`
+        :type resume: bool
+
+        :return: Resultatet af hvert udført trin.
+        :rtype: dict[str, Any]
+        """
+        order = self.order(*targets)
+        pending = list(order)
+        results: dict[str, typing.Any] = {}
+        fingerprints: dict[str, str] = {}
+        running: dict[Future, str] = {}
+        failure: tuple[str, BaseException] | None = None
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix=self.name) as pool:
+            while pending or running:
+                if failure is None:
+                    # Trinnene gennemgås i rækkefølge, så et trin hentet fra et checkpoint straks gør de næste klar
+                    for name in list(pending):
+                        stage = self.stages[name]
+                        if not all(dependency in results for dependency in stage.inputs):
+                            continue
+                        pending.remove(name)
+                        fingerprints[name] = self._fingerprint(stage, fingerprints)
+                        if resume and (checkpoint := self._restore(stage, fingerprints[name])) is not None:
+                            results[name] = checkpoint
+                            continue
+                        running[pool.submit(self._execute, stage, [results[dependency] for dependency in stage.inputs])] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as err:
+                        print(f"FEJL: Trinnet '{name}' i kørslen '{self.name}' fejlede. Følgende fejl opstod:\n    {err}")
+                        if failure is None:
+                            failure = (name, err)
+                    else:
+                        self._save(self.stages[name], fingerprints[name], results[name])
+
+        if failure is not None:
+            if self._checkpoints is not None:
+                print(f"FEJL: Kør igen for at fortsætte fra de {len(self._checkpoints)} gemte trin.")
+            raise failure[1]
+        # Checkpointene skal kun bruges til at genoptage en fejlet kørsel
+        if not targets and self._checkpoints is not None:
+            self._checkpoints.clear()
+        return results
+
+    def clear(self) -> None:
+        """
+        Sletter alle checkpoints for kørslen.
+        """
+        if self._checkpoints is not None:
+            self._checkpoints.clear()
+
+    def _needed(self, targets: typing.Iterable[str]) -> set[str]:
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise KeyError(f"Trinnet '{name}' findes ikke i kørslen '{self.name}'.")
+            needed.add(name)
+            stack.extend(self.stages[name].inputs)
+        return needed
+
+    def _execute(self, stage: PipelineStage, inputs: list[typing.Any]) -> typing.Any:
+        lock = self._locks.get(stage.exclusive) if stage.exclusive is not None else None
+        if lock is not None:
+            lock.acquire()
+        try:
+            if self.metrics is None:
+                return stage.function(*inputs)
+            with self.metrics.stage(stage.kind, stage.name, count_rows(inputs[0]) if inputs else None) as record:
+                result = stage.function(*inputs)
+                record.rows_out = count_rows(result)
+            return result
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def _fingerprint(self, stage: PipelineStage, fingerprints: dict[str, str]) -> str:
+        # Trinnets kode og dets inputs fingeraftryk, så ændringer før et trin også gør dets checkpoint ugyldigt
+        digest = hashlib.sha256(stage.name.encode())
+        _hash_code(digest, getattr(stage.function, "__code__", None) or getattr(stage.function, "__qualname__", repr(type(stage.function))))
+        for dependency in stage.inputs:
+            digest.update(fingerprints[dependency].encode())
+        return digest.hexdigest()
+
+    def _restore(self, stage: PipelineStage, fingerprint: str) -> typing.Any:
+        if not stage.checkpoint or self._checkpoints is None:
+            return None
+        value = self._checkpoints.get(stage.name, fingerprint)
+        if value is not None:
+            print(f"SUCCES: Genoptog trinnet '{stage.name}' fra et checkpoint.")
+        return value
+
+    def _save(self, stage: PipelineStage, fingerprint: str, value: typing.Any) -> None:
+        # Resultater, der er None, gemmes ikke, da de ikke kan skelnes fra et manglende checkpoint
+        if stage.checkpoint and self._checkpoints is not None and value is not None:
+            self._checkpoints.put(stage.name, fingerprint, value)
+
+def _hash_code(digest: typing.Any, code: typing.Any) -> None:
+    # Koden hashes ud fra bytekode, konstanter og navne, da repr() af en code object indeholder dens adresse
+    if not hasattr(code, "co_code"):
+        digest.update(str(code).encode())
+        return
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if hasattr(constant, "co_code"):
+            _hash_code(digest, constant)
+        else:
+            digest.update(repr(constant).encode())
@@ -0,0 +1,258 @@
+import re
+import random
+import typing
+from decimal import Decimal
+from datetime import date, datetime
+from intertable import *
+
+# Antal rækker i stikprøven, som kolonnernes typer udledes af
+SCHEMA_SAMPLE_SIZE = 1_000
+SAMPLE_METHODS = ("reservoir", "first")
+# Under dette antal værdier (uden NULL) i stikprøven gennemløbes hele kolonnen i stedet
+SCHEMA_MIN_VALUES = 20
+# Når typen kun er udledt af en stikprøve, gives heltal og tekstlængder denne faktor luft
+SCHEMA_HEADROOM = 2
+# Heltalstyper fra den mindste til den største med grænsen for deres signed-udgave
+INTEGER_TYPES = (("tinyint", 1 << 7), ("smallint", 1 << 15), ("mediumint", 1 << 23), ("int", 1 << 31), ("bigint", 1 << 63))
+# Den længste varchar, der kan indeholde utf8mb4-tekst, og den længste char
+VARCHAR_MAX = 16_383
+CHAR_MAX = 255
+# Ligesom i MySQL
+DECIMAL_MAX_PRECISION = 65
+DECIMAL_MAX_SCALE = 30
+
+# Heltal uden foranstillede nuller (ellers er det f.eks. et postnummer, der skal forblive tekst)
+_INTEGER = re.compile(r"[+-]?(?:0|[1-9]\d*)")
+_NUMBER = re.compile(r"[+-]?(0|[1-9]\d*)(?:\.(\d+))?")
+_LEADING_ZERO = re.compile(r"[+-]?0\d")
+_BOOLEANS = {"0", "1", "true", "false"}
+
+def sample(rows: typing.Iterable[DataEntry], size: int | None = SCHEMA_SAMPLE_SIZE, method: str = "reservoir") -> list[DataEntry]:
+    """
+    Udtager en stikprøve af rækker.
+
+    Med `"reservoir"` får alle rækker samme chance for at komme med (reservoir sampling),
+    så stikprøven også dækker slutningen af kilden. Rækkefølgen er den samme ved hver kørsel.
+    Med `"first"` bruges blot de første rækker, f.eks. når kilden læses i bidder.
+
+    :param rows: Rækkerne, der udtages af.
+        *Påkrævet*.
+    :type rows: Iterable[DataEntry]
+    :param size: Det største antal rækker i stikprøven. Hvis `None`, bruges alle rækker.
+        *Upåkrævet*. Standardværdi: `1_000`
+    :type size: int | None
+    :param method: Måden, stikprøven udtages på, `"reservoir"` eller `"first"`.
+        *Upåkrævet*. Standardværdi: `"reservoir"`
+    :type method: str
+
+    :rtype: list[DataEntry]
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Ukendt måde at udtage en stikprøve på '{method}'. Vælg en af {SAMPLE_METHODS}.")
+    if size is None:
+        return list(rows)
+    reservoir = []
+    rng = random.Random(0)
+    for seen, row in enumerate(rows):
+        if seen < size:
+            reservoir.append(row)
+        elif method == "first":
+            break
+        elif (slot := rng.randrange(seen + 1)) < size:
+            reservoir[slot] = row
+    return reservoir
+
+def infer_header(rows: typing.Sequence[DataEntry], size: int | None = SCHEMA_SAMPLE_SIZE, method: str = "reservoir") -> Header:
+    """
+    Udleder en header med den snævreste datatype for hver kolonne ud fra en stikprøve af rækkerne.
+
+    For hver kolonne findes typen (heltal, decimal, kommatal, boolean, dato eller tekst),
+    om den indeholder NULL, samt grænserne for typen, f.eks. ``mediumint unsigned``,
+    ``decimal(6,2)`` eller ``char(2)``. Heltal og tekstlængder gives luft (``SCHEMA_HEADROOM``),
+    når kun en stikprøve er set. Hele kolonnen gennemløbes kun, hvis stikprøven er tvetydig:
+    hvis den har for få værdier, kun indeholder 0 og 1 (boolean eller heltal?),
+    eller kun tekst af samme længde (char eller varchar?).
+
+    :param rows: Rækkerne med rå værdier, f.eks. tekst fra en *.csv*-fil eller værdier fra JSON.
+        *Påkrævet*.
+    :type rows: Sequence[DataEntry]
+    :param size: Det største antal rækker i stikprøven. Hvis `None`, bruges alle rækker.
+        *Upåkrævet*. Standardværdi: `1_000`
+    :type size: int | None
+    :param method: Måden, stikprøven udtages på. Se :func:`sample`.
+        *Upåkrævet*. Standardværdi: `"reservoir"`
+    :type method: str
+
+    :rtype: Header
+    """
+    rows_sample = sample(rows, size, method)
+    exact = len(rows_sample) == len(rows)
+    columns = dict.fromkeys(column for row in rows_sample for column in row)
+    header = Header()
+    for column in columns:
+        field, ambiguous = infer_field(column, [row.get(column) for row in rows_sample], exact=exact)
+        if ambiguous:
+            field, ambiguous = infer_field(column, [row.get(column) for row in rows], exact=True)
+        header[column] = field
+    return header
+
+def infer_table(name: TableName, rows: DataList, size: int | None = SCHEMA_SAMPLE_SIZE, method: str = "reservoir", *, storage: str = "rows") -> InterTable:
+    """
+    Opretter en InterTable med en header udledt af rækkerne. Se :func:`infer_header`.
+
+    Passer en værdi uden for stikprøven ikke til den udledte header,
+    udledes headeren igen ud fra alle rækker, og tabellen oprettes på ny.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param rows: Rækkerne med rå værdier.
+        *Påkrævet*.
+    :type rows: DataList
+    :param size: Det største antal rækker i stikprøven. Hvis `None`, bruges alle rækker.
+        *Upåkrævet*. Standardværdi: `1_000`
+    :type size: int | None
+    :param method: Måden, stikprøven udtages på. Se :func:`sample`.
+        *Upåkrævet*. Standardværdi: `"reservoir"`
+    :type method: str
+    :param storage: Lagringsformen for tabellen.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+
+    :rtype: InterTable
+    """
+    header = infer_header(rows, size, method)
+    if size is None or len(rows) <= size:
+        return InterTable(name, header, Keys(), rows, storage=storage)
+    try:
+        # Rækkerne castes på stedet, så de rå værdier bevares til et evt. nyt forsøg
+        return InterTable(name, header, Keys(), [dict(row) for row in rows], storage=storage)
+    except (TypeError, ValueError):
+        print(f"ADVARSEL: Stikprøven passede ikke på alle rækker i '{name}'. Udleder headeren ud fra alle rækker.")
+        return InterTable(name, infer_header(rows, None), Keys(), rows, storage=storage)
+
+def infer_field(name: ColumnName, values: typing.Sequence[typing.Any], *, exact: bool = True) -> tuple[DataField, bool]:
+    """
+    Udleder den snævreste datatype for en kolonne ud fra dens værdier.
+
+    :param name: Kolonnens navn.
+        *Påkrævet*.
+    :type name: str
+    :param values: Kolonnens værdier eller en stikprøve af dem.
+        *Påkrævet*.
+    :type values: Sequence[Any]
+    :param exact: Angiver, om ``values`` er alle kolonnens værdier. Ellers gives grænserne luft.
+        *Upåkrævet*. Standardværdi: `True`
+    :type exact: bool
+
+    :return: Kolonnens definition, og om stikprøven var for tvetydig til at afgøre den.
+    :rtype: tuple[DataField, bool]
+    """
+    present = [value for value in values if not _is_null(value)]
+    nullable = len(present) < len(values)
+    if len(present) < (SCHEMA_MIN_VALUES if not exact else 1):
+        return DataField(name, STANDARD_FIELD["datatype"], True), not exact
+
+    if all(type(value) is bool for value in present):
+        return DataField(name, "boolean", nullable), False
+    # Begge værdier skal forekomme, ellers er f.eks. et id i en tabel med én række også en boolean,
+    # og værdierne skal kunne castes af kolonnens konvertering (der ikke forstår "true" og "false")
+    if all(_is_boolean(value) for value in present) and len({str(value).lower() for value in present}) > 1 and _accepts("boolean", present):
+        # Kun 0 og 1 i stikprøven kan lige så vel være et heltal
+        return DataField(name, "boolean", nullable), not exact
+
+    headroom = 1 if exact else SCHEMA_HEADROOM
+    if (bounds := _integer_bounds(present)) is not None:
+        low, high = bounds
+        return DataField(name, _integer_type(low * headroom, high * headroom), nullable), False
+    if (digits := _decimal_digits(present)) is not None:
+        integer, scale = digits
+        # Et ekstra ciffer før kommaet svarer til luften for heltal
+        precision = integer + scale + (not exact)
+        if precision <= DECIMAL_MAX_PRECISION and scale <= DECIMAL_MAX_SCALE:
+            return DataField(name, f"decimal({max(precision, 1)},{scale})", nullable), False
+        return DataField(name, "double", nullable), False
+    if all(_is_float(value) for value in present):
+        return DataField(name, "double", nullable), False
+    for datatype in ("date", "datetime"):
+        if _accepts(datatype, present):
+            return DataField(name, datatype, nullable), False
+
+    lengths = [len(value) if isinstance(value, str) else len(str(value)) for value in present]
+    shortest, longest = min(lengths), max(lengths)
+    if shortest == longest and 0 < longest <= CHAR_MAX:
+        # Tekst af samme længde i stikprøven kan stadig have andre længder i resten af kolonnen
+        return DataField(name, f"char({longest})", nullable), not exact
+    longest = max(longest * headroom, 1)
+    return DataField(name, f"varchar({longest})" if longest <= VARCHAR_MAX else "mediumtext", nullable), False
+
+def _is_null(value: typing.Any) -> bool:
+    # Samme værdier, som DataField.converter behandler som NULL
+    return value is None or (isinstance(value, str) and value.lower() == "null")
+
+def _is_boolean(value: typing.Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in _BOOLEANS
+    return type(value) is int and value in (0, 1)
+
+def _integer_bounds(values: list[typing.Any]) -> tuple[int, int] | None:
+    # Den mindste og største værdi, hvis alle værdier er heltal
+    integers = []
+    for value in values:
+        if type(value) is int:
+            integers.append(value)
+        elif isinstance(value, str) and _INTEGER.fullmatch(value):
+            integers.append(int(value))
+        else:
+            return None
+    return min(integers), max(integers)
+
+def _integer_type(low: int, high: int) -> str:
+    for datatype, limit in INTEGER_TYPES:
+        if low >= 0 and high < 2 * limit:
+            return f"{datatype} unsigned"
+        if -limit <= low and high < limit:
+            return datatype
+    return f"decimal({DECIMAL_MAX_PRECISION},0)"
+
+def _decimal_digits(values: list[typing.Any]) -> tuple[int, int] | None:
+    # Det største antal cifre før og efter kommaet, hvis alle værdier er tal uden eksponent
+    integer = scale = 0
+    for value in values:
+        if isinstance(value, Decimal):
+            if not value.is_finite():
+                return None
+            sign, digits, exponent = value.as_tuple()
+            value_scale = max(-exponent, 0)
+            value_integer = max(len(digits) + exponent, 1) if exponent < 0 else len(digits) + exponent
+        else:
+            if type(value) in (int, float):
+                value = repr(value)
+            if not isinstance(value, str) or (match := _NUMBER.fullmatch(value)) is None:
+                return None
+            value_integer = len(match.group(1))
+            value_scale = len(match.group(2) or '')
+        integer = max(integer, value_integer)
+        scale = max(scale, value_scale)
+    return integer, scale
+
+def _is_float(value: typing.Any) -> bool:
+    if type(value) is float:
+        return True
+    if not isinstance(value, str) or _LEADING_ZERO.match(value):
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+def _accepts(datatype: str, values: list[typing.Any]) -> bool:
+    # Tjekker med kolonnens egen konvertering, så typen kun vælges, hvis værdierne senere kan castes til den
+    convert = DataField("sample", datatype).converter
+    try:
+        for value in values:
+            convert(value)
+    except (TypeError, ValueError):
+        return False
+    return True
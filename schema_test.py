@@ -0,0 +1,36 @@
+import csvr
+from schema import infer_field, infer_header
+from intertable import *
+
+# Tjekker udledningen af kolonnernes datatyper; hver funktion udskriver SUCCES eller FEJL for hvert tjek
+
+def check(description: str, passed: bool) -> bool:
+    print(f"{"SUCCES" if passed else "FEJL"}: {description}")
+    return passed
+
+def datatype(values: list[typing.Any]) -> str:
+    return infer_field("column", values)[0].datatype
+
+def fields() -> None:
+    check("Små heltal bliver tinyint", datatype(["1", "2", "100"]) == "tinyint unsigned")
+    check("Negative heltal bliver signed", datatype(["-1", "2"]) == "tinyint")
+    check("Foranstillede nuller forbliver tekst", datatype(["0123", "4567"]).startswith("char"))
+    check("Decimaltal bliver decimal", datatype(["1.25", "10.5"]) == "decimal(4,2)")
+    check("Datoer bliver date", datatype(["01/02/2016", "31/12/2018"]) == "date")
+    check("0 og 1 bliver boolean", datatype(["0", "1", "1"]) == "boolean")
+    check("Kun én værdi af 0 og 1 bliver ikke boolean", datatype(["1"]) != "boolean")
+    check("true og false bliver ikke en boolean, der ikke kan castes", datatype(["true", "false"]) != "boolean")
+    field = infer_field("column", ["1", "NULL"])[0]
+    check("NULL gør kolonnen nullable", field.nullable)
+
+def tables() -> None:
+    table = csvr.intertable("t", ["id,active", "1,true", "2,false"])
+    check("En csv-fil med true og false kan indlæses", [entry["active"] for entry in table] == ["true", "false"])
+    table = csvr.intertable("t", ["id,name", "1,x"])
+    check("Et id i en tabel med én række bliver et heltal", table[0]["id"] == 1 and table.header["id"].datatype != "boolean")
+    header = infer_header([{"id": str(number), "flag": str(number % 2)} for number in range(100)])
+    check("infer_header() udleder hver kolonne for sig", header["id"].datatype == "tinyint unsigned" and header["flag"].datatype == "boolean")
+
+if __name__ == "__main__":
+    fields()
+    tables()
@@ -0,0 +1,151 @@
+import mmap
+import pickle
+import typing
+from array import array
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from intertable import *
+from storage import DictColumn
+
+# Filen starter og slutter med denne signatur
+MAGIC = b"ITSNAP01"
+# Pladsholdere for NULL i typede kolonner; de rigtige værdier genskabes ud fra NULL-masken
+_PLACEHOLDERS = {"int": 0, "float": 0.0, "decimal": Decimal(0), "date": date.min}
+
+def save(table: InterTable, path: str | Path) -> None:
+    """
+    Gemmer en tabel i et binært snapshot, som kan indlæses igen med :func:`load`.
+
+    Filen skrives i ét gennemløb: først kolonnerne én efter én og til sidst en blok med
+    tabellens navn, header, keys og placeringen af hver kolonne i filen.
+    Heltal, kommatal, Decimal (som heltal ganget med 10^scale) og datoer (som ordinaltal)
+    gemmes som rå 64-bit arrays med en NULL-maske, hvis kolonnen indeholder NULL.
+    Kodede tekstkolonner (se :class:`storage.DictColumn`) gemmes som deres koder og en pickle af værditabellen.
+    Øvrige kolonner, f.eks. tekst, gemmes som en pickle af værdierne.
+
+    Egne parsere på kolonnerne gemmes ikke, da værdierne allerede er castet.
+
+    :param table: Tabellen, der skal gemmes.
+        *Påkrævet*.
+    :type table: InterTable
+    :param path: Stien til filen.
+        *Påkrævet*.
+    :type path: str | Path
+    """
+    columns = []
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        for name in table.header:
+            field = table.header[name]
+            encoding, blocks = _encode(field, table._column(name))
+            column = {"name": name, "encoding": encoding, "scale": field._scale()}
+            for part, payload in blocks.items():
+                column[part] = (file.tell(), len(payload))
+                file.write(payload)
+            columns.append(column)
+        meta = pickle.dumps({
+            "name": table.name,
+            "header": [(field.name, field.datatype, field.nullable, field.default, field.extra) for field in table.header.values()],
+            "keys": table.keys.all,
+            "storage": table.storage,
+            "length": len(table),
+            "columns": columns
+        }, pickle.HIGHEST_PROTOCOL)
+        file.write(meta)
+        file.write(len(meta).to_bytes(8, "little"))
+        file.write(MAGIC)
+
+def load(path: str | Path, storage: str | None = None) -> InterTable:
+    """
+    Indlæser en tabel fra et snapshot gemt med :func:`save`.
+
+    Filen åbnes med mmap, og typede kolonner kopieres direkte ind i arrays.
+    Værdierne er valideret, da tabellen blev gemt, så de hverken parses eller valideres igen.
+    Snapshots indeholder pickles og må derfor kun indlæses fra kilder, man stoler på.
+
+    :param path: Stien til filen.
+        *Påkrævet*.
+    :type path: str | Path
+    :param storage: Lagringsformen for tabellen. Hvis `None`, bruges den, tabellen havde, da den blev gemt.
+        *Upåkrævet*. Standardværdi: `None`
+    :type storage: str | None
+
+    :rtype: InterTable
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if view[:len(MAGIC)] != MAGIC or view[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"Filen '{path}' er ikke et gyldigt snapshot.")
+        with memoryview(view) as buffer:
+            end = len(buffer) - len(MAGIC) - 8
+            meta_size = int.from_bytes(buffer[end:end + 8], "little")
+            meta = pickle.loads(buffer[end - meta_size:end])
+            columns = {column["name"]: _decode(buffer, column) for column in meta["columns"]}
+
+    header = Header({
+        name: DataField(name, datatype, nullable, default=default, extra=extra)
+        for name, datatype, nullable, default, extra in meta["header"]
+    })
+    keys = Keys(**meta["keys"])
+    return InterTable.from_columns(meta["name"], header, keys, columns, storage=storage or meta["storage"])
+
+def _encode(field: DataField, values: typing.Sequence[typing.Any]) -> tuple[str, dict[str, bytes]]:
+    # Finder den mest kompakte form, kolonnens værdier kan gemmes i
+    ptype = getattr(field, "_ptype", None)
+    encoding = {int: "int", float: "float", Decimal: "decimal", date: "date"}.get(ptype, "pickle")
+    blocks = {}
+    if isinstance(values, DictColumn):
+        return f"dictionary:{values.codes.typecode}", {"values": values.codes.tobytes(), "table": pickle.dumps(values.values, pickle.HIGHEST_PROTOCOL)}
+    if encoding != "pickle":
+        if None in values:
+            blocks["nulls"] = bytes(value is None for value in values)
+            placeholder = _PLACEHOLDERS[encoding]
+            values = [placeholder if value is None else value for value in values]
+        try:
+            if encoding == "decimal":
+                scale = field._scale()
+                values = [_scaled(value, scale) for value in values]
+            elif encoding == "date":
+                values = [value.toordinal() if type(value) is date else _invalid(value) for value in values]
+            blocks["values"] = array('d' if encoding == "float" else 'q', values).tobytes()
+        except (TypeError, ValueError, OverflowError, AttributeError):
+            # F.eks. hvis tabellen ikke er refreshet, så værdierne endnu ikke har kolonnens type
+            encoding = "pickle"
+            values = [None if null else value for value, null in zip(values, blocks.pop("nulls"))] if "nulls" in blocks else values
+    if encoding == "pickle":
+        blocks = {"values": pickle.dumps(list(values), pickle.HIGHEST_PROTOCOL)}
+    return encoding, blocks
+
+def _scaled(value: Decimal, scale: int) -> int:
+    # Decimal-værdien som et heltal med 'scale' decimaler; fejler, hvis der går decimaler tabt
+    scaled = value.scaleb(scale)
+    integer = int(scaled)
+    if integer != scaled:
+        raise ValueError
+    return integer
+
+def _invalid(value: typing.Any) -> typing.NoReturn:
+    raise TypeError
+
+def _decode(buffer: memoryview, column: dict[str, typing.Any]) -> array | list | DictColumn:
+    offset, size = column["values"]
+    block = buffer[offset:offset + size]
+    encoding = column["encoding"]
+    if encoding == "pickle":
+        return pickle.loads(block)
+    if encoding.startswith("dictionary:"):
+        codes = array(encoding.partition(':')[2])
+        codes.frombytes(block)
+        offset, size = column["table"]
+        return DictColumn.from_codes(codes, pickle.loads(buffer[offset:offset + size]))
+    values = array('d' if encoding == "float" else 'q')
+    values.frombytes(block)
+    if encoding == "decimal":
+        exponent = -column["scale"]
+        values = [Decimal(value).scaleb(exponent) for value in values]
+    elif encoding == "date":
+        values = list(map(date.fromordinal, values))
+    if "nulls" in column:
+        offset, size = column["nulls"]
+        values = [None if null else value for value, null in zip(values, buffer[offset:offset + size])]
+    return values
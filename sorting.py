@@ -0,0 +1,109 @@
+import heapq
+import pickle
+import tempfile
+import typing
+from itertools import islice
+from intertable import DataEntry, ColumnName
+
+# Det største antal rækker, der sorteres i hukommelsen ad gangen,
+# før de skrives til en midlertidig fil (kan ændres efter behov)
+SORT_RUN_SIZE = 1_000_000
+# Antal rækker, der pickles sammen, når en sorteret bid skrives til disk
+_BLOCK_SIZE = 1_000
+
+class Descending:
+    """
+    Vender sammenligningen af en værdi om, så den sorteres i nedadgående rækkefølge,
+    selv om andre kolonner i samme sorteringsnøgle sorteres opadgående.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: typing.Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: typing.Self) -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: typing.Self) -> bool:
+        return self.value == other.value
+
+def sort_key(columns: typing.Sequence[ColumnName], descending: typing.Sequence[bool]) -> typing.Callable[[DataEntry], tuple]:
+    """
+    Danner en sorteringsnøgle for hele rækker ud fra en eller flere kolonner.
+
+    NULL kommer først ved opadgående og sidst ved nedadgående rækkefølge (ligesom i MySQL).
+
+    :param columns: Kolonnerne, der sorteres efter, i prioriteret rækkefølge.
+        *Påkrævet*.
+    :type columns: Sequence[str]
+    :param descending: For hver kolonne, om den sorteres i nedadgående rækkefølge.
+        *Påkrævet*.
+    :type descending: Sequence[bool]
+
+    :rtype: Callable[[DataEntry], tuple]
+    """
+    parts = list(zip(columns, descending))
+
+    def key(entry: DataEntry) -> tuple:
+        values = []
+        for column, desc in parts:
+            value = entry.get(column)
+            # (False, None) kommer før alle andre værdier, så NULL aldrig sammenlignes med en værdi
+            value = (value is not None, value)
+            values.append(Descending(value) if desc else value)
+        return tuple(values)
+
+    return key
+
+def external_sort(rows: typing.Iterable[DataEntry], key: typing.Callable[[DataEntry], typing.Any], run_size: int | None = None) -> typing.Iterator[DataEntry]:
+    """
+    Sorterer rækker, der ikke nødvendigvis kan være i hukommelsen på én gang.
+
+    Rækkerne sorteres i bidder (runs) på højst ``run_size`` rækker, som hver skrives til en midlertidig fil.
+    Til sidst flettes filerne med :func:`heapq.merge`, så kun få rækker pr. fil er i hukommelsen ad gangen.
+    Er der færre rækker end ``run_size``, sorteres de i hukommelsen uden at skrive til disk.
+    Sorteringen er stabil.
+
+    :param rows: Rækkerne, der skal sorteres.
+        *Påkrævet*.
+    :type rows: Iterable[DataEntry]
+    :param key: Sorteringsnøglen for en række, f.eks. fra :func:`sort_key`.
+        *Påkrævet*.
+    :type key: Callable[[DataEntry], Any]
+    :param run_size: Det største antal rækker i hukommelsen ad gangen. Hvis `None`, bruges ``SORT_RUN_SIZE``.
+        *Upåkrævet*. Standardværdi: `None`
+    :type run_size: int | None
+
+    :return: Rækkerne i sorteret rækkefølge.
+    :rtype: Iterator[DataEntry]
+    """
+    run_size = run_size or SORT_RUN_SIZE
+    rows = iter(rows)
+    runs = []
+    try:
+        while run := list(islice(rows, run_size)):
+            run.sort(key=key)
+            # Alle rækker kunne være i én bid, så der er intet at flette
+            if not runs and len(run) < run_size:
+                yield from run
+                return
+            file = tempfile.TemporaryFile()
+            for start in range(0, len(run), _BLOCK_SIZE):
+                pickle.dump(run[start:start + _BLOCK_SIZE], file, pickle.HIGHEST_PROTOCOL)
+            file.seek(0)
+            runs.append(file)
+            del run
+        # heapq.merge er stabil på tværs af filerne, da de flettes i den rækkefølge, de blev skrevet
+        yield from heapq.merge(*(_read_run(file) for file in runs), key=key)
+    finally:
+        for file in runs:
+            file.close()
+
+def _read_run(file: typing.BinaryIO) -> typing.Iterator[DataEntry]:
+    # Læser en sorteret bid fra disk blok for blok
+    while True:
+        try:
+            block = pickle.load(file)
+        except EOFError:
+            return
+        yield from block
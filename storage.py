@@ -0,0 +1,573 @@
+import typing
+from array import array
+from collections.abc import MutableMapping
+from itertools import compress
+from operator import itemgetter
+from intertable import Header, DataField, DataEntry, ColumnName
+
+# Kolonner med disse Python-typer kan gemmes kompakt i et array,
+# så længe kolonnen ikke er nullable (array kan ikke indeholde None)
+TYPECODES = {int: 'q', float: 'd'}
+# Tekstkolonner gemmes som koder (se DictColumn), hvis højst denne andel af værdierne
+# i en stikprøve på op til DICTIONARY_SAMPLE værdier er forskellige
+DICTIONARY_RATIO = 0.5
+DICTIONARY_SAMPLE = 1_000
+# Kolonner med færre værdier end dette tjekkes ikke, da besparelsen er for lille
+DICTIONARY_MIN_ROWS = 64
+# Datatyper, hvis værdier altid er en lille, fast mængde
+DICTIONARY_TYPES = ("enum", "set")
+# Koderne gemmes i det mindste array, der kan rumme antallet af forskellige værdier
+CODE_TYPECODES = (('B', 1 << 8), ('H', 1 << 16), ('I', 1 << 32))
+
+def new_column(field: DataField | None, values: typing.Iterable[typing.Any] = ()) -> array | list:
+    """
+    Opretter en kolonne til en :class:`ColumnStore` ud fra kolonnens DataField.
+
+    Heltal og kommatal i kolonner, der ikke er nullable, gemmes i et typet array.
+    Alle andre kolonner, samt kolonner hvis værdier ikke passer i et array, gemmes i en liste.
+
+    :param field: Kolonnens definition. Hvis `None`, bruges en liste.
+        *Påkrævet*.
+    :type field: DataField | None
+    :param values: Værdierne, som kolonnen skal indeholde fra start.
+        *Upåkrævet*. Standardværdi: `()`
+    :type values: Iterable[Any]
+
+    :return: Kolonnen som et array eller en liste.
+    :rtype: array | list
+    """
+    typecode = None
+    if field is not None and not field.nullable:
+        typecode = TYPECODES.get(getattr(field, "_ptype", None))
+    if typecode is not None:
+        # Et nyt array med den rigtige type bruges direkte (f.eks. fra et snapshot)
+        if isinstance(values, array) and values.typecode == typecode:
+            return values
+        values = list(values)
+        try:
+            return array(typecode, values)
+        except (TypeError, OverflowError):
+            # F.eks. hvis værdierne endnu ikke er castet til kolonnens type
+            return values
+    if isinstance(values, DictColumn):
+        return values
+    values = list(values)
+    return dictionary_column(field, values) or values
+
+def dictionary_column(field: DataField | None, values: list) -> "DictColumn | None":
+    """
+    Koder en tekstkolonne som en :class:`DictColumn`, hvis den har få forskellige værdier.
+
+    Kolonner med en datatype som `enum` kodes altid. Andre kolonner kodes, hvis en stikprøve
+    spredt over kolonnen kun indeholder tekst og NULL, og højst ``DICTIONARY_RATIO`` af værdierne
+    i stikprøven er forskellige.
+
+    :param field: Kolonnens definition, hvis den kendes.
+        *Påkrævet*.
+    :type field: DataField | None
+    :param values: Kolonnens værdier.
+        *Påkrævet*.
+    :type values: list
+
+    :return: Den kodede kolonne, eller `None`, hvis kolonnen ikke egner sig til at blive kodet.
+    :rtype: DictColumn | None
+    """
+    fixed = field is not None and field.datatype.lower().startswith(DICTIONARY_TYPES)
+    if not values or (len(values) < DICTIONARY_MIN_ROWS and not fixed):
+        return None
+    sample = values[::max(1, len(values) // DICTIONARY_SAMPLE)]
+    if not all(value is None or type(value) is str for value in sample):
+        return None
+    if not fixed and len(set(sample)) > DICTIONARY_RATIO * len(sample):
+        return None
+    return DictColumn(values)
+
+class DictColumn:
+    """
+    En kolonne gemt som små heltalskoder i et array og en tabel med hver forskellig værdi én gang.
+
+    Bruges til tekstkolonner med få forskellige værdier (f.eks. stat, by eller butik),
+    så hver række kun fylder 1-4 bytes i stedet for en reference til sin egen tekststreng.
+    Kolonnen opfører sig som en liste af de afkodede værdier, mens operationer som opslag,
+    filtrering og gruppering kan arbejde direkte på ``codes`` og ``values``.
+
+    :param values: Kolonnens værdier. Skal kunne hashes.
+        *Upåkrævet*. Standardværdi: `()`
+    :type values: Iterable[Any]
+    """
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self, values: typing.Iterable[typing.Any] = ()) -> None:
+        # Værditabellen og koden for hver værdi i den
+        self.values: list[typing.Any] = []
+        self._lookup: dict[typing.Any, int] = {}
+        lookup = self._lookup
+        codes = [lookup.setdefault(value, len(lookup)) for value in values]
+        self.values = list(lookup)
+        self.codes: array = array(self._typecode(len(self.values)), codes)
+
+    @classmethod
+    def from_codes(cls, codes: array, values: list[typing.Any]) -> "DictColumn":
+        """
+        Opretter en kolonne direkte ud fra koder og en værditabel uden gentagelser.
+
+        :rtype: DictColumn
+        """
+        column = object.__new__(cls)
+        column.codes = codes
+        column.values = values
+        column._lookup = {value: code for code, value in enumerate(values)}
+        return column
+
+    @staticmethod
+    def _typecode(count: int) -> str:
+        return next(typecode for typecode, limit in CODE_TYPECODES if count <= limit)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __getitem__(self, loc: int | slice) -> typing.Any:
+        if isinstance(loc, slice):
+            return list(map(self.values.__getitem__, self.codes[loc]))
+        return self.values[self.codes[loc]]
+
+    def __setitem__(self, loc: int, value: typing.Any) -> None:
+        self.codes[loc] = self.code(value, add=True)
+
+    def __contains__(self, value: typing.Any) -> bool:
+        code = self._lookup.get(value)
+        return code is not None and code in self.codes
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self) -> tuple:
+        return (type(self).from_codes, (self.codes, self.values))
+
+    def code(self, value: typing.Any, add: bool = False) -> int | None:
+        """
+        Finder koden for en værdi.
+
+        :param value: Værdien.
+            *Påkrævet*.
+        :type value: Any
+        :param add: Bestemmer, om værdien føjes til værditabellen, hvis den ikke findes.
+            *Upåkrævet*. Standardværdi: `False`
+        :type add: bool
+
+        :return: Koden, eller `None`, hvis værdien ikke findes og ikke skal tilføjes.
+        :rtype: int | None
+        """
+        code = self._lookup.get(value)
+        if code is None and add:
+            code = len(self.values)
+            if code >= dict(CODE_TYPECODES)[self.codes.typecode]:
+                # Der er ikke plads til flere koder, så arrayet skiftes til et større
+                self.codes = array(self._typecode(code + 1), self.codes)
+            self._lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: typing.Any) -> None:
+        # Koden findes først, da arrayet kan blive udskiftet undervejs
+        code = self.code(value, add=True)
+        self.codes.append(code)
+
+    def pop(self, loc: int = -1) -> typing.Any:
+        return self.values[self.codes.pop(loc)]
+
+    def copy(self) -> "DictColumn":
+        return type(self).from_codes(array(self.codes.typecode, self.codes), list(self.values))
+
+    def select(self, codes: typing.Iterable[int]) -> "DictColumn":
+        """
+        Danner en ny kolonne med de angivne koder fra denne kolonne, f.eks. et udvalg af rækkerne.
+
+        :rtype: DictColumn
+        """
+        return type(self).from_codes(array(self.codes.typecode, codes), list(self.values))
+
+class RowView(MutableMapping):
+    """
+    En række i en :class:`ColumnStore` vist som en dict.
+
+    Rækken dannes først, når den efterspørges, og ændringer skrives direkte tilbage til kolonnerne.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, column: ColumnName) -> typing.Any:
+        return self._store._columns[column][self._row]
+
+    def __setitem__(self, column: ColumnName, value: typing.Any) -> None:
+        self._store.set_value(self._row, column, value)
+
+    def __delitem__(self, column: ColumnName) -> None:
+        raise TypeError("En enkelt værdi kan ikke fjernes fra en række i kolonneformat. Fjern hele kolonnen i stedet.")
+
+    def __iter__(self) -> typing.Iterator[ColumnName]:
+        return iter(self._store._columns)
+
+    def __len__(self) -> int:
+        return len(self._store._columns)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class ColumnStore:
+    """
+    Gemmer en tabels data kolonnevis i stedet for som en liste af dicts.
+
+    Understøtter de samme operationer som InterTable bruger på en DataList
+    (længde, iteration, indeksering, ``append``, ``extend`` og ``pop``),
+    men rækker dannes først som :class:`RowView`, når de efterspørges.
+
+    :param header: Headeren, som kolonnerne oprettes ud fra.
+        *Påkrævet*.
+    :type header: Header
+    :param entries: Rækker, der indsættes fra start.
+        *Upåkrævet*. Standardværdi: `()`
+    :type entries: Iterable[DataEntry]
+    """
+    storage = "columns"
+
+    def __init__(self, header: Header, entries: typing.Iterable[DataEntry] = ()) -> None:
+        self._columns: dict[ColumnName, array | list] = {name: new_column(header[name]) for name in header}
+        self._length: int = 0
+        # Kolonner, der deles med en kopi af lageret, og som skal kopieres, før de ændres
+        self._shared: set[ColumnName] = set()
+        self.extend(entries)
+
+    @classmethod
+    def from_columns(cls, header: Header, columns: dict[ColumnName, typing.Iterable[typing.Any]]) -> "ColumnStore":
+        """
+        Opretter et lager direkte ud fra kolonnernes værdier uden at danne rækker.
+
+        :param header: Headeren, som kolonnerne oprettes ud fra.
+            *Påkrævet*.
+        :type header: Header
+        :param columns: En dict fra kolonnenavn til kolonnens værdier. Alle kolonner skal være lige lange.
+            *Påkrævet*.
+        :type columns: dict[str, Iterable[Any]]
+
+        :rtype: ColumnStore
+        """
+        store = cls(header)
+        store._columns = {name: new_column(header.get(name), values) for name, values in columns.items()}
+        lengths = {len(column) for column in store._columns.values()}
+        if len(lengths) > 1:
+            raise IndexError("Kolonnerne har forskellige længder.")
+        store._length = lengths.pop() if lengths else 0
+        return store
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> typing.Iterator[RowView]:
+        return (RowView(self, row) for row in range(self._length))
+
+    def __getitem__(self, loc: int | slice) -> RowView | list[RowView]:
+        if isinstance(loc, slice):
+            return [RowView(self, row) for row in range(self._length)[loc]]
+        if loc < 0:
+            loc += self._length
+        if loc < 0 or loc >= self._length:
+            raise IndexError(f"Rækkeindekset (i={loc}) er uden for rækkevidde.")
+        return RowView(self, loc)
+
+    def __repr__(self) -> str:
+        return repr([self.row(row) for row in range(self._length)])
+
+    @property
+    def columns(self) -> tuple[ColumnName, ...]:
+        return tuple(self._columns)
+
+    def copy(self) -> "ColumnStore":
+        """
+        Danner en kopi af lageret, der deler kolonnerne med dette,
+        indtil en kolonne ændres i et af dem.
+
+        :rtype: ColumnStore
+        """
+        store = object.__new__(type(self))
+        store._columns = dict(self._columns)
+        store._length = self._length
+        store._shared = set(self._columns)
+        self._shared.update(self._columns)
+        return store
+
+    def _own(self, name: ColumnName) -> None:
+        # Kopierer en delt kolonne, inden den ændres
+        if name in self._shared:
+            column = self._columns[name]
+            self._columns[name] = array(column.typecode, column) if isinstance(column, array) else column.copy()
+            self._shared.discard(name)
+
+    def row(self, row: int) -> DataEntry:
+        # Danner en almindelig dict ud fra en række
+        return {name: column[row] for name, column in self._columns.items()}
+
+    def append(self, entry: DataEntry) -> None:
+        for name in list(self._shared):
+            self._own(name)
+        for name, column in self._columns.items():
+            value = entry.get(name)
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                # Værdien passer ikke i arrayet, så kolonnen gemmes som liste i stedet
+                column = self._columns[name] = list(column)
+                column.append(value)
+        self._length += 1
+
+    def extend(self, entries: typing.Iterable[DataEntry]) -> None:
+        for entry in entries:
+            self.append(entry)
+        # Tekstkolonner med få forskellige værdier kodes, når der er værdier nok til at afgøre det
+        for name, column in self._columns.items():
+            if type(column) is list and (encoded := dictionary_column(None, column)) is not None:
+                self._columns[name] = encoded
+                self._shared.discard(name)
+
+    def pop(self, row: int = -1) -> DataEntry:
+        if not self._length:
+            raise IndexError("pop fra en tom tabel.")
+        for name in list(self._shared):
+            self._own(name)
+        entry = {name: column.pop(row) for name, column in self._columns.items()}
+        self._length -= 1
+        return entry
+
+    def column(self, name: ColumnName) -> array | list:
+        # Kolonner, der endnu ikke findes i lageret, er tomme (NULL)
+        if name not in self._columns:
+            return [None] * self._length
+        return self._columns[name]
+
+    def set_column(self, name: ColumnName, values: typing.Iterable[typing.Any], field: DataField | None = None, *, first: bool = False) -> None:
+        column = new_column(field, values)
+        if len(column) != self._length:
+            raise IndexError(f"Kolonnen har en anden længde end tabellen ({len(column)} != {self._length}).")
+        self._shared.discard(name)
+        if first:
+            self._columns.pop(name, None)
+            self._columns = {name: column, **self._columns}
+        else:
+            self._columns[name] = column
+
+    def set_value(self, row: int, name: ColumnName, value: typing.Any) -> None:
+        if name not in self._columns:
+            self._columns[name] = [None] * self._length
+        self._own(name)
+        column = self._columns[name]
+        try:
+            column[row] = value
+        except (TypeError, OverflowError):
+            column = self._columns[name] = list(column)
+            column[row] = value
+
+    def remove_column(self, name: ColumnName) -> None:
+        self._columns.pop(name, None)
+        self._shared.discard(name)
+
+    def compress(self, keep: typing.Sequence[int]) -> None:
+        # Beholder kun rækkerne, hvor keep er sand, i samme rækkefølge
+        for name, column in self._columns.items():
+            if isinstance(column, DictColumn):
+                self._columns[name] = column.select(compress(column.codes, keep))
+                continue
+            kept = list(compress(column, keep))
+            self._columns[name] = array(column.typecode, kept) if isinstance(column, array) else kept
+        self._length = sum(keep)
+        self._shared.clear()
+
+    def keep(self, rows: typing.Sequence[int]) -> None:
+        # Beholder kun de angivne rækker i den angivne rækkefølge
+        for name, column in self._columns.items():
+            if isinstance(column, DictColumn):
+                codes = column.codes
+                self._columns[name] = column.select([codes[row] for row in rows])
+                continue
+            kept = [column[row] for row in rows]
+            self._columns[name] = array(column.typecode, kept) if isinstance(column, array) else kept
+        self._length = len(rows)
+        self._shared.clear()
+
+class TupleRow(MutableMapping):
+    """
+    En række i en :class:`TupleStore` vist som en dict.
+
+    Værdierne slås op i rækkens tuple ud fra kolonnens plads i lageret,
+    og ændringer skrives tilbage ved at erstatte tuplen.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "TupleStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, column: ColumnName) -> typing.Any:
+        return self._store._rows[self._row][self._store._positions[column]]
+
+    def __setitem__(self, column: ColumnName, value: typing.Any) -> None:
+        self._store.set_value(self._row, column, value)
+
+    def __delitem__(self, column: ColumnName) -> None:
+        raise TypeError("En enkelt værdi kan ikke fjernes fra en række i tupelformat. Fjern hele kolonnen i stedet.")
+
+    def __iter__(self) -> typing.Iterator[ColumnName]:
+        return iter(self._store._positions)
+
+    def __len__(self) -> int:
+        return len(self._store._positions)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class TupleStore:
+    """
+    Gemmer en tabels rækker som tuples i stedet for dicts.
+
+    Kolonnenavnene gemmes kun én gang for hele lageret sammen med hver kolonnes plads i tuplerne,
+    så hver række ikke gentager dem. Understøtter de samme operationer som :class:`ColumnStore`,
+    og rækker vises som :class:`TupleRow`, når de efterspørges.
+    Da tuples ikke kan ændres, kan en kopi af lageret dele rækkerne med det.
+
+    :param header: Headeren, hvis kolonnerækkefølge tuplerne følger.
+        *Påkrævet*.
+    :type header: Header
+    :param entries: Rækker, der indsættes fra start.
+        *Upåkrævet*. Standardværdi: `()`
+    :type entries: Iterable[DataEntry]
+    """
+    storage = "tuples"
+
+    def __init__(self, header: Header, entries: typing.Iterable[DataEntry] = ()) -> None:
+        self._positions: dict[ColumnName, int] = {name: position for position, name in enumerate(header)}
+        self._rows: list[tuple] = []
+        self.extend(entries)
+
+    @classmethod
+    def from_columns(cls, header: Header, columns: dict[ColumnName, typing.Iterable[typing.Any]]) -> "TupleStore":
+        """
+        Opretter et lager ud fra kolonnernes værdier. Se :meth:`ColumnStore.from_columns`.
+
+        :rtype: TupleStore
+        """
+        store = cls(header)
+        store._positions = {name: position for position, name in enumerate(columns)}
+        columns = [list(values) for values in columns.values()]
+        if len({len(values) for values in columns}) > 1:
+            raise IndexError("Kolonnerne har forskellige længder.")
+        store._rows = list(zip(*columns))
+        return store
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> typing.Iterator[TupleRow]:
+        return (TupleRow(self, row) for row in range(len(self._rows)))
+
+    def __getitem__(self, loc: int | slice) -> TupleRow | list[TupleRow]:
+        if isinstance(loc, slice):
+            return [TupleRow(self, row) for row in range(len(self._rows))[loc]]
+        if loc < 0:
+            loc += len(self._rows)
+        if loc < 0 or loc >= len(self._rows):
+            raise IndexError(f"Rækkeindekset (i={loc}) er uden for rækkevidde.")
+        return TupleRow(self, loc)
+
+    def __repr__(self) -> str:
+        return repr([self.row(row) for row in range(len(self._rows))])
+
+    @property
+    def columns(self) -> tuple[ColumnName, ...]:
+        return tuple(self._positions)
+
+    def copy(self) -> "TupleStore":
+        # Rækkerne kan ikke ændres, så kun listen over dem kopieres
+        store = object.__new__(type(self))
+        store._positions = dict(self._positions)
+        store._rows = list(self._rows)
+        return store
+
+    def row(self, row: int) -> DataEntry:
+        return dict(zip(self._positions, self._rows[row]))
+
+    def append(self, entry: DataEntry) -> None:
+        self._rows.append(tuple(map(entry.get, self._positions)))
+
+    def extend(self, entries: typing.Iterable[DataEntry]) -> None:
+        positions = self._positions
+        self._rows.extend(tuple(map(entry.get, positions)) for entry in entries)
+
+    def pop(self, row: int = -1) -> DataEntry:
+        if not self._rows:
+            raise IndexError("pop fra en tom tabel.")
+        return dict(zip(self._positions, self._rows.pop(row)))
+
+    def column(self, name: ColumnName) -> list:
+        # Kolonner, der endnu ikke findes i lageret, er tomme (NULL)
+        if name not in self._positions:
+            return [None] * len(self._rows)
+        return list(map(itemgetter(self._positions[name]), self._rows))
+
+    def set_column(self, name: ColumnName, values: typing.Iterable[typing.Any], field: DataField | None = None, *, first: bool = False) -> None:
+        values = list(values)
+        if len(values) != len(self._rows):
+            raise IndexError(f"Kolonnen har en anden længde end tabellen ({len(values)} != {len(self._rows)}).")
+        if first:
+            self.remove_column(name)
+            self._positions = {name: 0, **{column: position + 1 for column, position in self._positions.items()}}
+            self._rows = [(value, *row) for value, row in zip(values, self._rows)]
+        elif name in self._positions:
+            position = self._positions[name]
+            self._rows = [(*row[:position], value, *row[position + 1:]) for value, row in zip(values, self._rows)]
+        else:
+            self._positions[name] = len(self._positions)
+            self._rows = [(*row, value) for value, row in zip(values, self._rows)]
+
+    def set_value(self, row: int, name: ColumnName, value: typing.Any) -> None:
+        if name not in self._positions:
+            self.set_column(name, [None] * len(self._rows))
+        position = self._positions[name]
+        old = self._rows[row]
+        self._rows[row] = (*old[:position], value, *old[position + 1:])
+
+    def remove_column(self, name: ColumnName) -> None:
+        if name not in self._positions:
+            return
+        removed = self._positions.pop(name)
+        self._positions = {column: position - (position > removed) for column, position in self._positions.items()}
+        self._rows = [row[:removed] + row[removed + 1:] for row in self._rows]
+
+    def compress(self, keep: typing.Sequence[int]) -> None:
+        self._rows = list(compress(self._rows, keep))
+
+    def keep(self, rows: typing.Sequence[int]) -> None:
+        old = self._rows
+        self._rows = [old[row] for row in rows]
+
+def new_store(storage: str, header: Header, entries: typing.Iterable[DataEntry] = ()) -> ColumnStore | TupleStore:
+    """
+    Opretter et lager til en af lagringsformerne, der ikke er en liste af dicts.
+
+    :param storage: Lagringsformen, enten `"columns"` eller `"tuples"`.
+        *Påkrævet*.
+    :type storage: str
+    :param header: Headeren, som lageret oprettes ud fra.
+        *Påkrævet*.
+    :type header: Header
+    :param entries: Rækker, der indsættes fra start.
+        *Upåkrævet*. Standardværdi: `()`
+    :type entries: Iterable[DataEntry]
+
+    :rtype: ColumnStore | TupleStore
+    """
+    return {"columns": ColumnStore, "tuples": TupleStore}[storage](header, entries)
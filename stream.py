@@ -0,0 +1,290 @@
+import typing
+from copy import deepcopy
+from pathlib import Path
+from itertools import islice
+from intertable import *
+from sorting import external_sort, sort_key
+
+class TableStream:
+    """
+    En tabel, hvis data hentes, transformeres og indlæses i bidder (chunks) i stedet for på én gang.
+
+    Transformationer som en ny header, ``@``, ``<<``, ``&``, ``*``, ``remove_column`` og ``change_type``
+    gemmes, når de angives, og udføres først på hver bid, når strømmen gennemløbes.
+    Hver bid leveres som en valideret InterTable, så hukommelsesforbruget afhænger af
+    størrelsen på bidderne i stedet for størrelsen på hele tabellen.
+    Kun nøgleværdierne for primary og unique keys gemmes på tværs af bidderne,
+    så dubletter også opdages mellem dem.
+
+    En strøm kan kun gennemløbes én gang.
+
+    :param name: Navnet på tabellen.
+        *Påkrævet*.
+    :type name: str
+    :param header: Headeren, som kildens rækker valideres efter, inden transformationerne udføres.
+        *Påkrævet*.
+    :type header: Header
+    :param keys: Tabellens nøgler. Sættes på hver bid efter transformationerne.
+        *Upåkrævet*. Standardværdi: `None`
+    :type keys: Keys
+    :param chunks: Kildens rækker i bidder.
+        *Upåkrævet*. Standardværdi: `()`
+    :type chunks: Iterable[DataList]
+    :param storage: Lagringsformen for hver bid, `"rows"`, `"columns"` eller `"tuples"`.
+        *Upåkrævet*. Standardværdi: `"rows"`
+    :type storage: str
+    """
+    def __init__(self,
+        name: TableName,
+        header: Header,
+        keys: Keys | None = None,
+        chunks: typing.Iterable[DataList] = (),
+        *,
+        storage: str = "rows"
+    ) -> None:
+        self.name: TableName = name
+        self.keys: Keys = keys if keys is not None else Keys()
+        self._source_header: Header = header
+        self._chunks: typing.Iterable[DataList] = chunks
+        self._storage: str = storage
+        self._operations: list[typing.Callable[[InterTable], typing.Any]] = []
+        # Antal rækker leveret indtil videre, så autogenererede id'er fortsætter på tværs af bidder
+        self._offset: int = 0
+        # Rækker fra alle bidder, der er frasorteret ved et opslag med missing="reject"
+        self.rejected: DataList = []
+        # Nøgleværdier set i tidligere bidder
+        self._seen: dict[tuple[ColumnName, ...], set[typing.Any]] = {}
+        # Kolonner, retninger og bidstørrelse, hvis strømmen skal sorteres (se sort())
+        self._order: tuple[tuple[ColumnName, ...], list[bool], int | None] | None = None
+
+    def __repr__(self) -> str:
+        return f"TableStream(name={repr(self.name)}, header={repr(self.header)}, keys={repr(self.keys)})"
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, tp, val, tb) -> None:
+        # Svarer til refresh() ved slutningen af en with-blok for en InterTable
+        self._operations.append(lambda table: table.refresh())
+
+    def __iter__(self) -> typing.Iterator[InterTable]:
+        chunks = (self._process(rows) for rows in self._chunks if rows)
+        if self._order is None:
+            yield from chunks
+        else:
+            yield from self._sorted(chunks)
+
+    @property
+    def header(self) -> Header:
+        # Den endelige header findes ved at udføre transformationerne på en tom bid
+        return self._transform(self._new_table([])).header
+
+    @header.setter
+    def header(self, header: Header) -> None:
+        self._operations.append(lambda table: setattr(table, "header", deepcopy(header)))
+
+    def __matmul__(self, other: tuple[DataField, str, dict[typing.Any, typing.Any] | InterTable, *tuple[ColumnName, ...]]) -> typing.Self:
+        self._operations.append(lambda table: table @ other)
+        return self
+
+    def lookup(self, column: DataField, reference: ColumnName, source: dict[typing.Any, typing.Any] | InterTable, key: ColumnName | None = None, value: ColumnName | None = None, *, missing: str = "fail") -> None:
+        self._operations.append(lambda table: table.lookup(column, reference, source, key, value, missing=missing))
+
+    def __and__(self, other: InterTable | tuple[InterTable, ColumnName | list[ColumnName]]) -> typing.Self:
+        self._operations.append(lambda table: table & other)
+        return self
+
+    def join(self,
+        other: InterTable,
+        on: ColumnName | list[ColumnName],
+        how: str = "inner",
+        *,
+        right_on: ColumnName | list[ColumnName] | None = None
+    ) -> typing.Self:
+        """
+        Joiner hver bid med en tabel i hukommelsen. Se :meth:`InterTable.join`.
+
+        Indekset over den anden tabels nøgle bygges kun én gang,
+        så f.eks. en faktatabel kan joines med flere dimensionstabeller i ét gennemløb.
+        """
+        self._operations.append(lambda table: table.join(other, on, how, right_on=right_on))
+        return self
+
+    def __mul__(self, other: tuple[DataField, typing.Callable[..., typing.Any], *tuple[ColumnName, ...]]) -> typing.Self:
+        self._operations.append(lambda table: table * other)
+        return self
+
+    def add_column(self, column: DataField, function: typing.Callable[..., typing.Any], *columns: ColumnName) -> None:
+        self._operations.append(lambda table: table.add_column(column, function, *columns))
+
+    def __lshift__(self, other: DataField) -> typing.Self:
+        self.auto_id(other, start=1)
+        return self
+
+    def auto_id(self, column: DataField, start: int = 1) -> None:
+        # Id'erne fortsætter fra antallet af rækker i de foregående bidder
+        self._operations.append(lambda table: table.auto_id(column, start=start + self._offset))
+
+    def remove_column(self, *columns: str) -> None:
+        self._operations.append(lambda table: table.remove_column(*columns))
+
+    def change_type(self, column: ColumnName, new_type: str) -> None:
+        self._operations.append(lambda table: table.change_type(column, new_type))
+
+    def sort(self, *columns: ColumnName, direction: str | list[str] = 'a', run_size: int | None = None) -> typing.Self:
+        """
+        Sorterer hele strømmen efter en eller flere kolonner med en ekstern flettesortering.
+
+        Rækkerne sorteres i bidder på højst ``run_size`` rækker, der skrives til midlertidige filer
+        og flettes, når strømmen gennemløbes. Se :func:`sorting.external_sort`.
+        Bidderne, der leveres, har samme størrelse som kildens bidder.
+
+        :param columns: Kolonnerne, der sorteres efter, i prioriteret rækkefølge.
+            *Påkrævet*.
+        :type columns: str
+        :param direction: Retningen, enten for alle kolonner eller én pr. kolonne. Se :meth:`InterTable.sort`.
+            *Upåkrævet*. Standardværdi: `'a'`
+        :type direction: str | list[str]
+        :param run_size: Det største antal rækker, der sorteres i hukommelsen ad gangen.
+            Hvis `None`, bruges ``sorting.SORT_RUN_SIZE``.
+            *Upåkrævet*. Standardværdi: `None`
+        :type run_size: int | None
+        """
+        self._order = (columns, InterTable._descending(direction, len(columns)), run_size)
+        return self
+
+    def map(self, function: typing.Callable[[InterTable], typing.Any]) -> typing.Self:
+        """
+        Tilføjer en vilkårlig transformation, der udføres på hver bid.
+
+        :param function: En funktion, der tager en bid som InterTable og ændrer den på stedet.
+            *Påkrævet*.
+        :type function: Callable[[InterTable], Any]
+        """
+        self._operations.append(function)
+        return self
+
+    def _sorted(self, chunks: typing.Iterator[InterTable]) -> typing.Iterator[InterTable]:
+        # Rækkerne fra alle bidder sorteres samlet og deles derefter op i bidder igen
+        columns, descending, run_size = self._order
+        sizes = []
+
+        def rows() -> typing.Iterator[DataEntry]:
+            for chunk in chunks:
+                sizes.append(len(chunk))
+                for entry in chunk:
+                    yield dict(entry)
+
+        header = self.header
+        block = []
+        for entry in external_sort(rows(), sort_key(columns, descending), run_size):
+            block.append(entry)
+            if len(block) >= sizes[0]:
+                yield self._from_rows(header, block)
+                block = []
+        if block:
+            yield self._from_rows(header, block)
+
+    def _from_rows(self, header: Header, rows: DataList) -> InterTable:
+        # Rækkerne er allerede transformeret og valideret, så de indsættes direkte
+        table = InterTable(self.name, deepcopy(header), deepcopy(self.keys), storage=self._storage)
+        table._fill({column: [entry.get(column) for entry in rows] for column in header})
+        return table
+
+    def _new_table(self, rows: DataList) -> InterTable:
+        return InterTable(self.name, deepcopy(self._source_header), Keys(), rows, storage=self._storage)
+
+    def _transform(self, table: InterTable) -> InterTable:
+        for operation in self._operations:
+            # Operationer som join returnerer en ny tabel i stedet for at ændre den eksisterende
+            result = operation(table)
+            if isinstance(result, InterTable):
+                table = result
+        table.keys = deepcopy(self.keys)
+        table.refresh()
+        return table
+
+    def _process(self, rows: DataList) -> InterTable:
+        table = self._transform(self._new_table(rows))
+        self.rejected.extend(table.rejected)
+        self._check_unique(table)
+        self._offset += len(table)
+        return table
+
+    def _check_unique(self, table: InterTable) -> None:
+        # Dubletter inden for bidden opdages, når indekset bygges,
+        # og dubletter mellem bidderne ved at sammenligne med tidligere nøgleværdier
+        for columns in table._unique_columns():
+            index = table.index(*columns)
+            seen = self._seen.setdefault(columns, set())
+            if not seen.isdisjoint(index):
+                key = next(key for key in index if key in seen)
+                raise ValueError(table._duplicate_message(columns, table.data[index[key]]))
+            seen.update(index)
+
+    def write_csv(self, file: str | Path | typing.TextIO, delimiter: str = ',') -> None:
+        """
+        Gennemløber strømmen og skriver hver bid til en *.csv*-fil. Se :meth:`InterTable.write_csv`.
+
+        :param file: Stien til filen eller en åben tekststrøm (åbnet med ``newline=''``).
+            *Påkrævet*.
+        :type file: str | Path | TextIO
+        :param delimiter: Skilletegnet mellem værdierne.
+            *Upåkrævet*. Standardværdi: `','`
+        :type delimiter: str
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, 'w', encoding="utf-8", newline='') as opened:
+                return self.write_csv(opened, delimiter)
+        header = True
+        for chunk in self:
+            chunk.write_csv(file, delimiter, header=header)
+            header = False
+        # En tom strøm får stadig en header
+        if header:
+            self._transform(self._new_table([])).write_csv(file, delimiter)
+
+    def write_ndjson(self, file: str | Path | typing.TextIO) -> None:
+        """
+        Gennemløber strømmen og skriver hver bid som NDJSON. Se :meth:`InterTable.write_ndjson`.
+
+        :param file: Stien til filen eller en åben tekststrøm.
+            *Påkrævet*.
+        :type file: str | Path | TextIO
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, 'w', encoding="utf-8") as opened:
+                return self.write_ndjson(opened)
+        for chunk in self:
+            chunk.write_ndjson(file)
+
+    def collect(self) -> InterTable:
+        """
+        Gennemløber strømmen og samler alle bidder i én InterTable.
+
+        :rtype: InterTable
+        """
+        table = None
+        for chunk in self:
+            if table is None:
+                table = chunk
+            else:
+                table += chunk
+        if table is None:
+            table = self._transform(self._new_table([]))
+        return table
+
+def chunked(rows: typing.Iterable[typing.Any], chunk_size: int) -> typing.Iterator[list[typing.Any]]:
+    """
+    Deler en række elementer op i lister med højst ``chunk_size`` elementer.
+
+    :param rows: Elementerne, der skal deles op.
+        *Påkrævet*.
+    :type rows: Iterable[Any]
+    :param chunk_size: Det største antal elementer i hver liste.
+        *Påkrævet*.
+    :type chunk_size: int
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk